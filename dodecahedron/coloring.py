@@ -1,9 +1,9 @@
-import time
-import ast
-from math import factorial
-from dodecahedron.group_generation import SYMMETRY_CACHE
-import math
-from collections import defaultdict
+from polya import engine
+from polya.group_tables import build_permutation
+from polya.registry import get_descriptor
+
+# 正十二面体顶点染色：n、群和输出目录都由注册表中的描述符给出
+DESCRIPTOR = get_descriptor('dodecahedron', 'vertex')
 
 
 def count_fixed_by_permutation(colors, color_counts, sizes):
@@ -14,122 +14,60 @@ def count_fixed_by_permutation(colors, color_counts, sizes):
     :param sizes: 轮换大小列表
     :return: 整数，表示固定染色方案数
     """
-    # 按 colors 顺序提取计数
-    counts_list = [color_counts[c] for c in colors]
-    sorted_sizes = sorted(sizes, reverse=True)
-    memo = {}
-
-    def dp(i, remaining):
-        if i == len(sorted_sizes):
-            return 1 if all(r == 0 for r in remaining) else 0
-
-        key = (i, tuple(remaining))
-        if key in memo:
-            return memo[key]
-
-        total = 0
-        s = sorted_sizes[i]
-        for c_idx in range(len(colors)):
-            if remaining[c_idx] >= s:
-                new_remaining = list(remaining)
-                new_remaining[c_idx] -= s
-                total += dp(i + 1, new_remaining)
-        memo[key] = total
-        return total
-
-    return dp(0, counts_list)
+    return engine.count_fixed_by_permutation(colors, color_counts, sizes)
 
 
 def count_colorings(colors, perm_group, color_counts):
     """
     使用Burnside引理计算在群作用下不等价的染色方案数。
+    群先按轮换型压缩，同一轮换型只计算一次固定染色数。
     :param colors: 颜色列表
     :param perm_group: 字典，表示群（包含所有置换的轮换分解）
     :param color_counts: dict，颜色->该颜色应使用的次数
     :return: 浮点数，表示不等价染色方案数
     """
-    total_vertices = 20
-    group_size = len(perm_group)
-
-    if group_size == 0:
+    if len(perm_group) == 0:
         raise ValueError("The permutation group is empty, cannot divide by zero.")
+    return float(engine.count_colorings(DESCRIPTOR, colors, color_counts, perm_group))
 
-    total_fixed = 0
-
-    for cycle_decomp in perm_group.values():
-        covered = set()
-        for cycle in cycle_decomp:
-            covered |= set(cycle)
-        uncovered = set(range(total_vertices)) - covered
-        all_cycles = cycle_decomp + [(v,) for v in uncovered]
-        sizes = [len(cycle) for cycle in all_cycles]
-        fixed = count_fixed_by_permutation(colors, color_counts, sizes)
-        total_fixed += fixed
-
-    return total_fixed / group_size
 
-
-def build_permutation(cycle_decomp, n=20):
+def generate_all_valid_colorings(colors, color_counts, n=DESCRIPTOR.n, perm_group=None):
     """
-    从轮换分解构建置换函数及其逆函数。
-    :param cycle_decomp: 轮换分解列表
-    :param n: 顶点数
-    :return: (置换函数p, 逆置换函数pinv)
-    """
-    p = list(range(n))
-    for cycle in cycle_decomp:
-        k = len(cycle)
-        if k == 1:
-            continue
-        for idx in range(k):
-            i = cycle[idx]
-            j = cycle[(idx + 1) % k]
-            p[i] = j
-    pinv = [0] * n
-    for i in range(n):
-        pinv[p[i]] = i
-    return p, pinv
-
-
-def generate_all_valid_colorings(colors, color_counts, n=20):
-    """
-    生成所有满足颜色计数约束的染色方案。
+    生成所有满足颜色计数约束的染色方案，见 polya.engine.generate_all_valid_colorings。
     :param colors: 颜色列表
     :param color_counts: dict，颜色->该颜色应使用的次数
     :param n: 顶点数
+    :param perm_group: 字典，表示群；None 表示不考虑对称性
     :return: 列表，每个元素是一个染色方案（元组）
     """
-    colors_list = list(colors)
-    counts_req = [color_counts[c] for c in colors_list]  # 改为按颜色名取值
-    counts_curr = [0] * len(colors_list)
-    results = []
-    current_coloring = [None] * n
+    return engine.generate_all_valid_colorings(colors, color_counts, n, perm_group)
 
-    def backtrack(i):
-        if i == n:
-            if all(c_curr == c_req for c_curr, c_req in zip(counts_curr, counts_req)):
-                results.append(tuple(current_coloring))
-            return
 
-        for c_idx, c in enumerate(colors_list):
-            if counts_curr[c_idx] < counts_req[c_idx]:
-                current_coloring[i] = c
-                counts_curr[c_idx] += 1
-                backtrack(i + 1)
-                counts_curr[c_idx] -= 1
+is_representative = engine.is_representative
 
-    backtrack(0)
-    return results
+
+def filter_representatives(colors, perm_group, colorings):
+    """
+    批量筛选字典序最小代表，是 is_representative 的向量化版本。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群
+    :param colorings: 可迭代对象，候选染色方案
+    :return: 列表，其中的代表元（元组），保持输入顺序
+    """
+    return engine.filter_representatives(DESCRIPTOR, colors, colorings, perm_group)
 
 
-def is_representative(coloring, group_perms):
+def iter_representatives(colors, perm_group, color_counts, max_results=None, method='orderly'):
     """
-    检查染色方案是否是其轨道的字典序最小代表。
-    :param coloring: 染色方案（元组）
-    :param group_perms: 列表，每个元素是(_, 逆置换函数)
-    :return: 布尔值
+    逐个产出不等价染色方案的代表元（生成器），不在内存中保存全部结果。
+    :param colors: 颜色列表
+    :param perm_group: 字典，表示群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param max_results: 最大输出数量，None 表示不限制
+    :param method: 'orderly'（有序生成）、'sweep'（编号 + 访问位图扫描）或 'parallel'（多进程有序生成）
+    :return: 生成器，每次产出一个不等价染色方案（元组）
     """
-    return all(tuple(coloring[pinv[i]] for i in range(len(coloring))) >= coloring for _, pinv in group_perms)
+    return engine.iter_representatives(DESCRIPTOR, colors, color_counts, max_results, method, perm_group)
 
 
 def get_all_colorings(colors, perm_group, color_counts, max_results=5000):
@@ -142,24 +80,7 @@ def get_all_colorings(colors, perm_group, color_counts, max_results=5000):
     :param max_results: 最大输出数量
     :return: 列表，每个元素是一个不等价染色方案（元组）
     """
-    total_vertices = 20
-    all_colorings = generate_all_valid_colorings(colors, color_counts, total_vertices)
-    group_perms = []
-    for cycle_decomp in perm_group.values():
-        _, pinv = build_permutation(cycle_decomp, total_vertices)
-        group_perms.append((None, pinv))  # 只需逆置换
-
-    representatives = []
-    for coloring in all_colorings:
-        if is_representative(coloring, group_perms):
-            representatives.append(coloring)
-            # 新增：如果超过 max_results，就提前停止
-            if len(representatives) >= max_results:
-                print(f"超过 {max_results} 个方案，仅保留前 {max_results} 个。")
-                break
-
-    return representatives
-
+    return engine.get_all_colorings(DESCRIPTOR, colors, color_counts, max_results, perm_group)
 
 
 def save_colorings_to_file(colorings, filename, element_type="vertex"):
@@ -169,19 +90,30 @@ def save_colorings_to_file(colorings, filename, element_type="vertex"):
     :param filename: 文件名
     :param element_type: 元素类型（如'vertex'）
     """
-    file_path = f"dodecahedron/{filename}"  # 保存路径指向 dodecahedron 文件夹
-    with open(file_path, 'w') as f:
-        f.write(f"{element_type.capitalize()} colorings with {len(colorings)} classes\n")
-        for idx, coloring in enumerate(colorings, 1):
-            coloring_str = ' '.join(coloring)
-            f.write(f"Class {idx}: {coloring_str}\n")
-    print(f"Colorings saved to {file_path}")
+    engine.save_colorings_to_file(DESCRIPTOR, colorings, filename, element_type)
+
+
+def save_representatives_to_file(colors, perm_group, color_counts, filename, element_type="vertex",
+                                 max_results=None, preview=0):
+    """
+    边枚举边写文件：代表元由后台线程分块写盘，内存占用与方案数无关。
+    :param colors: 颜色列表
+    :param perm_group: 字典，表示群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param filename: 文件名
+    :param element_type: 元素类型（如'vertex'）
+    :param max_results: 最大输出数量，None 表示全部写出
+    :param preview: 同时返回写出的前 preview 个方案
+    :return: 写入的方案数；preview 大于 0 时为 (写入的方案数, 前 preview 个方案的列表)
+    """
+    return engine.save_representatives_to_file(DESCRIPTOR, colors, color_counts, filename, max_results,
+                                               perm_group, element_type, preview=preview)
 
 
 # 使用示例
 if __name__ == "__main__":
     colors = ['红', '蓝', '绿']
     color_counts = {'红': 10, '蓝': 6, '绿': 4}
-    count = count_colorings(colors, SYMMETRY_CACHE, color_counts)
+    count = count_colorings(colors, DESCRIPTOR.group, color_counts)
     print(f"Number of inequivalent colorings: {count}")
-    all_colorings = get_all_colorings(colors, SYMMETRY_CACHE, color_counts)
+    all_colorings = get_all_colorings(colors, DESCRIPTOR.group, color_counts)
@@ -1,36 +1,28 @@
 # dodecahedron/graph_utils.py
-import networkx as nx
-import numpy as np
-from .geometry import VERTEX_ADJACENCY, FACE_ADJACENCY
+"""
+正十二面体染色的等价判断。
+
+等价指在群作用下互相映射（默认旋转群，与计数和枚举一致；symmetry='full' 时再加上反射，
+即原先按带颜色图同构判断所用的完整自同构群）。每个染色先规范化为轨道中字典序最小的像，
+两两比较只需比较规范形，批量分类只需按规范形分桶，不再逐对做图同构。
+元素编号与 polya.registry 中的描述符一致（面按 dodeca_sage.json 的编号）。
+"""
+from polya import engine
+from polya.registry import get_descriptor
 
 
 def build_graph(element_type='vertex'):
     """
-    构建多面体图表示
+    构建多面体图表示（仅用于可视化或调试，等价判断不再依赖图同构）
     :param element_type: 'vertex' 或 'face'
-    :return: 图对象
+    :return: networkx 图对象
     """
-    G = nx.Graph()
-
-    if element_type == 'vertex':
-        # 顶点图
-        num_elements = len(VERTEX_ADJACENCY)
-        for i in range(num_elements):
-            G.add_node(i)
-        for i, neighbors in enumerate(VERTEX_ADJACENCY):
-            for j in neighbors:
-                if i < j:  # 避免重复添加边
-                    G.add_edge(i, j)
-    else:
-        # 面图
-        num_elements = len(FACE_ADJACENCY)
-        for i in range(num_elements):
-            G.add_node(i)
-        for i, neighbors in enumerate(FACE_ADJACENCY):
-            for j in neighbors:
-                if i < j:  # 避免重复添加边
-                    G.add_edge(i, j)
+    import networkx as nx
 
+    descriptor = get_descriptor('dodecahedron', element_type)
+    G = nx.Graph()
+    G.add_nodes_from(range(descriptor.n))
+    G.add_edges_from(descriptor.adjacency)
     return G
 
 
@@ -50,16 +42,28 @@ def coloring_to_labeled_graph(coloring, element_type='vertex'):
     return G
 
 
-def are_equivalent(coloring1, coloring2, element_type='vertex'):
+def are_equivalent(coloring1, coloring2, element_type='vertex', symmetry='rotation'):
     """
-    判断两个染色方案是否等价（图同构）
+    判断两个染色方案是否等价（比较规范形，同一染色的规范形有缓存）
     :param coloring1: 第一个染色方案
     :param coloring2: 第二个染色方案
     :param element_type: 'vertex' 或 'face'
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
     :return: 是否等价
     """
-    G1 = coloring_to_labeled_graph(coloring1, element_type)
-    G2 = coloring_to_labeled_graph(coloring2, element_type)
+    return engine.are_equivalent(get_descriptor('dodecahedron', element_type), coloring1, coloring2,
+                                 symmetry=symmetry)
 
-    # 使用节点颜色作为同构匹配的标签
-    return nx.is_isomorphic(G1, G2, node_match=lambda n1, n2: n1['color'] == n2['color'])
\ No newline at end of file
+
+def equivalence_classes(colorings, element_type='vertex', colors=None, symmetry='rotation'):
+    """
+    把一批染色方案划分为等价类（一遍扫描，按规范形分桶）
+    :param colorings: 可迭代对象，每个元素是染色方案
+    :param element_type: 'vertex' 或 'face'
+    :param colors: 颜色列表（其顺序决定规范形的字典序），None 表示按颜色首次出现的顺序
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 列表，每个元素是一个等价类中各染色在输入中的下标列表
+    """
+    classes = engine.equivalence_classes(get_descriptor('dodecahedron', element_type), colorings, colors,
+                                         symmetry=symmetry)
+    return list(classes.values())
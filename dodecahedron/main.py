@@ -4,7 +4,7 @@ import sys
 import time
 from datetime import datetime
 
-from dodecahedron.coloring import count_colorings, get_all_colorings, save_colorings_to_file
+from dodecahedron.coloring import count_colorings, save_representatives_to_file
 from dodecahedron.group_generation import generate_dodecahedron_rotations
 from dodecahedron.utils import create_color_mapping, BASIC_COLORS
 from dodecahedron.visualization import visualize_vertex_coloring
@@ -80,19 +80,17 @@ def main():
     # 枚举所有具体方案
     print(f"\n开始枚举所有不等价方案...")
     start_time = time.time()
-    all_reps = get_all_colorings(color_names, perm_group, color_counts)
+    if total:
+        # 边枚举边保存所有方案到文件（不受 5000 个的上限限制），前5个方案取自同一次枚举
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{element_type}_colorings_{timestamp}.txt"
+        _, preview = save_representatives_to_file(color_names, perm_group, color_counts, filename, preview=5)
 
-    # 显示前5个方案
-    if all_reps:
+        # 显示前5个方案
         print("\n前5个代表方案:")
-        for i, coloring in enumerate(all_reps[:5]):
+        for i, coloring in enumerate(preview):
             print(f"方案{i + 1}: {'-'.join(coloring[:min(8, len(coloring))])}{'...' if len(coloring) > 8 else ''}")
 
-        # 保存所有方案到文件
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{element_type}_colorings_{timestamp}.txt"
-        save_colorings_to_file(all_reps, filename)
-
         # 询问用户是否可视化指定方案
         # print("\n是否可视化指定方案? (y/n)")
         # if input().strip().lower() == 'y':
@@ -165,18 +163,16 @@ if __name__ == "__main__":
         # 枚举所有具体方案
         print(f"\n开始枚举所有不等价方案...")
         start_time = time.time()
-        all_reps = get_all_colorings(color_names, perm_group, color_counts)
+        if total:
+            # 边枚举边保存所有方案到文件（不受 5000 个的上限限制），前5个方案取自同一次枚举
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{element_type}_colorings_{timestamp}.txt"
+            _, preview = save_representatives_to_file(color_names, perm_group, color_counts, filename, preview=5)
 
-        # 显示前5个方案
-        if all_reps:
+            # 显示前5个方案
             print("\n前5个代表方案:")
-            for i, coloring in enumerate(all_reps[:5]):
+            for i, coloring in enumerate(preview):
                 print(f"方案{i + 1}: {'-'.join(coloring[:min(8, len(coloring))])}{'...' if len(coloring) > 8 else ''}")
 
-            # 保存所有方案到文件
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{element_type}_colorings_{timestamp}.txt"
-            save_colorings_to_file(all_reps, filename)
-
         else:
             print("\n未生成具体方案列表")
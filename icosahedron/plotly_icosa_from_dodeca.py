@@ -11,6 +11,7 @@ import colorsys, matplotlib.colors as mc
 import sys, os, re, glob
 from datetime import datetime
 from dodecahedron.utils import BASIC_COLORS
+from polya.store import STORE_SUFFIX, open_store
 
 # -------------------------------------------------
 # 1. 二十面体几何
@@ -52,24 +53,31 @@ def load_colorings_from_txt(txt_path):
             line = line.strip()
             if line.startswith("Class"):  # 改为根据 Class 解析
                 try:
-                    # 获取颜色字符串，去除 "Class xxx: " 这一部分
-                    colors_str = line.split(":", 1)[1].strip()
+                    # 获取颜色字符串，去除 "Class xxx: " 这一部分以及 " | " 之后的附注
+                    colors_str = line.split(":", 1)[1].split("|", 1)[0].strip()
                     colorings.append(colors_str.split())
                 except Exception:
                     continue
     return colorings
 
 
+def load_colorings(path):
+    """二进制代表元文件直接映射，按编号读取单个方案；文本文件整体解析。"""
+    if path.endswith(STORE_SUFFIX):
+        return open_store(path)
+    return load_colorings_from_txt(path)
+
+
 # -------------------------------------------------
 # 4) 主程序：选文件 → 选方案 → 绘图
 # -------------------------------------------------
 def main():
     folder = os.path.join(os.path.dirname(__file__), "..", "dodecahedron")
-    pattern = os.path.join(folder, "vertex_colorings_*.txt")
-    files = sorted(glob.glob(pattern))
+    files = sorted(glob.glob(os.path.join(folder, "vertex_colorings_*.txt"))
+                   + glob.glob(os.path.join(folder, f"vertex_colorings_*{STORE_SUFFIX}")))
 
     if not files:
-        print(f"在 {folder}/ 目录下没有找到 vertex_colorings_*.txt")
+        print(f"在 {folder}/ 目录下没有找到 vertex_colorings_*.txt 或 *{STORE_SUFFIX}")
         sys.exit(1)
 
     print("找到以下顶点染色文件：")
@@ -82,7 +90,7 @@ def main():
     except (ValueError, IndexError):
         print("输入错误"); sys.exit(1)
 
-    colorings = load_colorings_from_txt(txt_path)
+    colorings = load_colorings(txt_path)
     if not colorings:
         print("该文件没有可解析的方案")
         sys.exit(1)
@@ -0,0 +1,193 @@
+# polya/artifacts.py
+"""
+预编译的二进制群文件。
+
+一个群保存为同一前缀下的三个文件：
+- <前缀>.perms.npy     |G|×n 置换矩阵（n <= 256 时为 uint8），第 g 行为第 g 个元素；
+- <前缀>.inverses.npy  对应的逆置换矩阵；
+- <前缀>.json          元数据：n、群阶、内容哈希、各元素的轮换型。
+
+加载时用 numpy.load(mmap_mode='r') 映射矩阵，不解析文本；
+fork 出来的子进程共享同一份物理页。加载结果是以映射矩阵为底层存储的 FrozenGroup，
+置换矩阵直接由它提供，轮换型分类登记到 polya.burnside 的缓存中，之后的枚举和计数不再重新编译群。
+
+重新生成内置群文件：python -m polya.artifacts
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from polya.burnside import cycle_type, prime_cycle_type_classes
+from polya.group_tables import FrozenGroup, build_permutation, permutation_matrices
+
+# 内置群文件所在目录
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# 文件格式版本
+FORMAT_VERSION = 1
+
+
+def artifact_prefix(name, element_type):
+    """
+    :param name: 多面体名
+    :param element_type: 元素类型
+    :return: 内置群文件的路径前缀
+    """
+    return os.path.join(ARTIFACT_DIR, f"{name}_{element_type}")
+
+
+def artifact_exists(prefix):
+    return all(os.path.exists(prefix + suffix) for suffix in ('.perms.npy', '.inverses.npy', '.json'))
+
+
+def _matrix_dtype(n):
+    if n <= 256:
+        return np.uint8
+    if n <= 65536:
+        return np.uint16
+    return np.uint32
+
+
+def content_hash(perms):
+    """
+    :param perms: |G|×n 置换矩阵
+    :return: 十六进制 SHA-256，覆盖矩阵形状、类型和内容
+    """
+    perms = np.ascontiguousarray(perms)
+    digest = hashlib.sha256()
+    digest.update(f"{perms.shape}{perms.dtype.str}".encode())
+    digest.update(perms.tobytes())
+    return digest.hexdigest()
+
+
+def group_hash(perm_group, n):
+    """
+    :param perm_group: 字典，表示群
+    :param n: 元素个数
+    :return: 群置换矩阵的内容哈希，与群文件元数据中的 sha256 一致
+    """
+    perms, _ = permutation_matrices(perm_group, n)
+    return content_hash(np.asarray(perms).astype(_matrix_dtype(n)))
+
+
+def save_group_artifact(perm_group, n, prefix):
+    """
+    把轮换分解形式的群写成二进制群文件。
+    :param perm_group: 字典，表示群
+    :param n: 元素个数
+    :param prefix: 输出路径前缀
+    :return: 内容哈希
+    """
+    dtype = _matrix_dtype(n)
+    perms = np.array([build_permutation(cycle_decomp, n)[0] for cycle_decomp in perm_group.values()],
+                     dtype=dtype).reshape(-1, n)
+    inverses = np.argsort(perms, axis=1).astype(dtype)
+
+    # 轮换型只存一份，各元素记录其在列表中的下标
+    ctypes = []
+    ctype_index = []
+    for cycle_decomp in perm_group.values():
+        ctype = cycle_type(cycle_decomp, n)
+        if ctype not in ctypes:
+            ctypes.append(ctype)
+        ctype_index.append(ctypes.index(ctype))
+
+    digest = content_hash(perms)
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.save(prefix + '.perms.npy', perms)
+    np.save(prefix + '.inverses.npy', inverses)
+    meta = {
+        'format': FORMAT_VERSION,
+        'n': n,
+        'order': len(perms),
+        'sha256': digest,
+        'cycle_types': [[list(pair) for pair in ctype] for ctype in ctypes],
+        'cycle_type_index': ctype_index,
+    }
+    with open(prefix + '.json', 'w') as f:
+        json.dump(meta, f)
+    return digest
+
+
+class GroupArtifact:
+    """内存映射的二进制群文件。"""
+
+    def __init__(self, prefix, verify=False):
+        """
+        :param prefix: 群文件路径前缀
+        :param verify: 是否重新计算内容哈希并检查逆置换
+        """
+        with open(prefix + '.json', 'r') as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"不支持的群文件版本: {meta.get('format')}")
+        self.prefix = prefix
+        self.n = meta['n']
+        self.order = meta['order']
+        self.sha256 = meta['sha256']
+        self.cycle_types = [tuple(tuple(pair) for pair in ctype) for ctype in meta['cycle_types']]
+        self.cycle_type_index = meta['cycle_type_index']
+        self.perms = np.load(prefix + '.perms.npy', mmap_mode='r')
+        self.inverses = np.load(prefix + '.inverses.npy', mmap_mode='r')
+        if self.perms.shape != (self.order, self.n) or self.inverses.shape != self.perms.shape:
+            raise ValueError(f"群文件 {prefix} 的矩阵形状与元数据不一致")
+        if verify:
+            self.verify()
+
+    def verify(self):
+        """检查内容哈希和逆置换，不一致时抛出 ValueError。"""
+        if content_hash(self.perms) != self.sha256:
+            raise ValueError(f"群文件 {self.prefix} 的内容哈希不匹配")
+        rows = np.arange(self.order)[:, None]
+        if not (self.perms[rows, self.inverses] == np.arange(self.n)).all():
+            raise ValueError(f"群文件 {self.prefix} 的逆置换有误")
+
+    def cycle_type_classes(self):
+        """:return: ((轮换型, 个数), ...)，与 polya.burnside.cycle_type_classes 格式相同"""
+        counts = np.bincount(self.cycle_type_index, minlength=len(self.cycle_types))
+        return tuple(sorted((ctype, int(c)) for ctype, c in zip(self.cycle_types, counts)))
+
+    def to_perm_group(self):
+        """
+        以内存映射的矩阵为底层存储的只读群，并把轮换型分类登记到缓存中。
+        不复制矩阵，也不预先展开轮换分解或逆置换元组，用到时才按需构造。
+        :return: FrozenGroup，序号 -> 轮换分解列表
+        """
+        perm_group = FrozenGroup(self.perms, self.inverses)
+        prime_cycle_type_classes(perm_group, self.n, self.cycle_type_classes())
+        return perm_group
+
+
+def load_group_artifact(prefix, verify=False):
+    """
+    :param prefix: 群文件路径前缀
+    :param verify: 是否校验内容哈希
+    :return: GroupArtifact
+    """
+    return GroupArtifact(prefix, verify)
+
+
+def build_builtin_artifacts():
+    """重新生成全部内置群文件：有文本群文件的由文本生成，其余正多面体由顶点坐标生成。"""
+    from polya.platonic import platonic_solids, platonic_vertices, rotation_group_from_vertices
+    from polya.registry import TEXT_GROUP_SOURCES, load_cycle_group
+
+    sources = {key: (lambda path=path, n=n: load_cycle_group(path, n), n)
+               for key, (path, n) in TEXT_GROUP_SOURCES.items()}
+    for name in platonic_solids():
+        if (name, 'vertex') not in sources:
+            vertices = platonic_vertices(name)
+            sources[(name, 'vertex')] = (lambda v=vertices: rotation_group_from_vertices(v), len(vertices))
+
+    for (name, element_type), (loader, n) in sources.items():
+        prefix = artifact_prefix(name, element_type)
+        digest = save_group_artifact(loader(), n, prefix)
+        print(f"{name}/{element_type}: {prefix} ({digest[:12]})")
+
+
+if __name__ == "__main__":
+    build_builtin_artifacts()
@@ -0,0 +1,193 @@
+# polya/burnside.py
+"""
+按轮换型压缩的 Burnside 计数引擎。
+
+正多面体的旋转群虽然有 60 个元素，但只有少数几种轮换型。
+同一轮换型的置换固定的染色数完全相同，因此：
+1. 每个群只需压缩一次，得到 [(轮换型, 出现次数), ...]；
+2. 固定染色数只依赖 (轮换型, 排序后的颜色计数)，放进进程级 LRU 缓存，
+   {9,6,5} 与 {5,9,6} 这类颜色排列不同的查询会命中同一条缓存。
+"""
+from collections import Counter
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from polya.group_tables import GroupCache
+from polya.rank import multiset_count
+
+# 固定染色数缓存的容量
+FIXED_COUNT_CACHE_SIZE = 65536
+
+# (群, n) -> 轮换型分类，LRU，见 polya.group_tables.GroupCache
+_CLASS_CACHE = GroupCache()
+
+
+def cycle_type(cycle_decomp, n):
+    """
+    计算置换的轮换型。
+    :param cycle_decomp: 轮换分解列表（可以省略不动点）
+    :param n: 顶点数
+    :return: 元组，((轮换长度, 个数), ...)，按轮换长度从大到小排列
+    """
+    sizes = [len(cycle) for cycle in cycle_decomp]
+    missing = n - sum(sizes)
+    if missing < 0:
+        raise ValueError(f"轮换分解覆盖的顶点数超过 {n}")
+    sizes.extend([1] * missing)
+    return sizes_to_cycle_type(sizes)
+
+
+def sizes_to_cycle_type(sizes):
+    """
+    把轮换长度列表转换为轮换型。
+    :param sizes: 轮换长度列表（需包含不动点）
+    :return: 元组，((轮换长度, 个数), ...)
+    """
+    return tuple(sorted(Counter(sizes).items(), reverse=True))
+
+
+def cycle_type_classes(perm_group, n):
+    """
+    把置换群压缩为 (轮换型, 个数) 的分类，每个群只计算一次。
+    :param perm_group: 字典，表示群（包含所有置换的轮换分解）
+    :param n: 顶点数
+    :return: 元组，((轮换型, 个数), ...)
+    """
+    cached = _CLASS_CACHE.get(perm_group, n)
+    if cached is not None:
+        return cached
+
+    counter = Counter(cycle_type(cycle_decomp, n) for cycle_decomp in perm_group.values())
+    classes = tuple(sorted(counter.items()))
+    _CLASS_CACHE.put(perm_group, classes, n)
+    return classes
+
+
+def prime_cycle_type_classes(perm_group, n, classes):
+    """
+    直接登记预先算好的轮换型分类（如从群文件中读出），跳过逐个元素的分解。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param classes: ((轮换型, 个数), ...)
+    """
+    _CLASS_CACHE.put(perm_group, tuple(sorted(classes)), n)
+
+
+def _take_vectors(sizes, mults, part):
+    """
+    枚举一种颜色从各长度的轮换中各取几个，使其恰好占用 part 个元素。
+    :param sizes: 轮换长度列表
+    :param mults: 各长度的轮换个数
+    :param part: 该颜色的使用次数
+    :return: 列表，每个元素为各长度取用个数的元组
+    """
+    vectors = []
+    stack = [((), part)]
+    while stack:
+        taken, left = stack.pop()
+        idx = len(taken)
+        if idx == len(sizes):
+            if left == 0:
+                vectors.append(taken)
+            continue
+        for j in range(min(mults[idx], left // sizes[idx]) + 1):
+            stack.append((taken + (j,), left - j * sizes[idx]))
+    return vectors
+
+
+def _fixed_count_kernel(ctype, counts):
+    """
+    计算给定轮换型下颜色计数为 counts 的固定染色数。
+    每个轮换必须整体染成同一种颜色。
+
+    自底向上逐个颜色做动态规划，状态是各长度「尚未分配的轮换个数」，
+    存放在形状为 (m_1+1, ..., m_t+1) 的稠密 NumPy 数组中。
+    状态数只与轮换型有关，与颜色数无关，因此颜色再多也不会爆炸，也没有递归深度问题。
+    :param ctype: 轮换型
+    :param counts: 颜色计数元组
+    :return: 整数
+    """
+    sizes = [size for size, _ in ctype]
+    mults = [mult for _, mult in ctype]
+    if sum(counts) != sum(size * mult for size, mult in ctype) or min(counts, default=0) < 0:
+        return 0
+
+    # 结果不超过多重组合数，超过 int64 范围时改用 Python 整数精确累加
+    dtype = np.int64 if multiset_count(counts) < 2 ** 62 else object
+
+    # binoms[axis][j] 为 C(r, j)，r = j..m
+    binoms = [[np.array([comb(r, j) for r in range(j, m + 1)], dtype=dtype) for j in range(m + 1)]
+              for m in mults]
+    axes = len(mults)
+
+    table = np.zeros(tuple(m + 1 for m in mults), dtype=dtype)
+    table[tuple(mults)] = 1
+    for part in counts:
+        if part == 0:
+            continue
+        new_table = np.zeros_like(table)
+        for taken in _take_vectors(sizes, mults, part):
+            src = tuple(slice(j, m + 1) for j, m in zip(taken, mults))
+            dst = tuple(slice(0, m + 1 - j) for j, m in zip(taken, mults))
+            weight = table[src]
+            for axis, (j, m) in enumerate(zip(taken, mults)):
+                if j:
+                    shape = [1] * axes
+                    shape[axis] = m + 1 - j
+                    weight = weight * binoms[axis][j].reshape(shape)
+            new_table[dst] += weight
+        table = new_table
+    return int(table[(0,) * axes])
+
+
+@lru_cache(maxsize=FIXED_COUNT_CACHE_SIZE)
+def _cached_fixed_count(ctype, sorted_counts):
+    return _fixed_count_kernel(ctype, sorted_counts)
+
+
+def fixed_count(ctype, counts):
+    """
+    带缓存的固定染色数。颜色的顺序不影响结果，因此先排序再查缓存。
+    :param ctype: 轮换型
+    :param counts: 各颜色的使用次数（任意顺序）
+    :return: 整数
+    """
+    return _cached_fixed_count(ctype, tuple(sorted(counts, reverse=True)))
+
+
+def total_fixed_count(perm_group, counts, n):
+    """
+    Burnside 引理的分子：群中所有元素固定的染色数之和。
+    :param perm_group: 字典，表示群
+    :param counts: 各颜色的使用次数
+    :param n: 顶点数
+    :return: 整数
+    """
+    sorted_counts = tuple(sorted(counts, reverse=True))
+    return sum(mult * _cached_fixed_count(ctype, sorted_counts)
+               for ctype, mult in cycle_type_classes(perm_group, n))
+
+
+def count_orbits(perm_group, counts, n):
+    """
+    精确计算不等价染色方案数（整数）。
+    :param perm_group: 字典，表示群
+    :param counts: 各颜色的使用次数
+    :param n: 顶点数
+    :return: 整数
+    """
+    group_size = len(perm_group)
+    if group_size == 0:
+        raise ValueError("The permutation group is empty, cannot divide by zero.")
+    total, rest = divmod(total_fixed_count(perm_group, counts, n), group_size)
+    if rest:
+        raise ValueError("固定染色数之和不能被群阶整除，输入的置换集合不是群")
+    return total
+
+
+def clear_caches():
+    """清空群分类缓存和固定染色数缓存。"""
+    _CLASS_CACHE.clear()
+    _cached_fixed_count.cache_clear()
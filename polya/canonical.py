@@ -0,0 +1,319 @@
+# polya/canonical.py
+"""
+批量的字典序最小代表（lex-leader）检测。
+
+染色编码为小整数 NumPy 数组（每行一个染色，取值为颜色在 colors 中的下标），
+群编译为 |G|×n 的置换矩阵。把染色看作 k 进制整数后，一批染色在所有群元素下的像
+的键可以由一次矩阵乘法得到，字典序比较变成整数比较。k^n 放不进 int64 时（如棱、有向棱
+染色的颜色较多时），把位置按字典序切成若干段，每段压缩为一个 float64 能精确表示的整数，
+一个染色即若干个字的元组（见 packed_image_keys），仍是一次矩阵乘法得到全部像的键，
+字典序比较变成逐字的整数比较。
+
+同样的矩阵乘法也给出每个染色的规范形（轨道中字典序最小的像），见 canonical_codes；
+按规范形分桶即得到等价类，见 equivalence_classes。
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from polya.group_tables import permutation_matrices
+
+# 多字压缩时每块最多计算的像的字数（float64 个数），限制中间数组的大小
+PACKED_BLOCK = 1 << 22
+
+
+def encode_colorings(colorings, colors):
+    """
+    把颜色名形式的染色方案编码为整数数组。
+    :param colorings: 可迭代对象，每个元素是颜色名序列
+    :param colors: 颜色列表，颜色 colors[i] 编码为 i
+    :return: 形状为 (方案数, n) 的 uint8 数组
+    """
+    if len(colors) > 256:
+        raise ValueError("颜色种类过多，无法用 uint8 编码")
+    index = {c: i for i, c in enumerate(colors)}
+    return np.array([[index[c] for c in coloring] for coloring in colorings], dtype=np.uint8)
+
+
+def decode_colorings(codes, colors):
+    """
+    把整数数组解码为颜色名元组。
+    :param codes: 形状为 (方案数, n) 的整数数组
+    :param colors: 颜色列表
+    :return: 列表，每个元素是颜色名元组
+    """
+    return [tuple(colors[c] for c in row) for row in np.asarray(codes).tolist()]
+
+
+def lex_weights(n, k):
+    """
+    k 进制各位的权重，第 0 位权重最大，使整数大小与字典序一致。
+    :param n: 元素个数
+    :param k: 颜色种类数
+    :return: 长度为 n 的 int64 数组
+    """
+    return k ** np.arange(n - 1, -1, -1, dtype=np.int64)
+
+
+def image_keys(codes, perms, k):
+    """
+    把染色看作 k 进制数，求一批染色在全部群元素下的像的键。
+    像 y[perms[g, i]] = x[i] 的键为 sum_i x[i] * w[perms[g, i]]，
+    因此所有像的键就是一次矩阵乘法 codes @ weights[perms].T，无需显式构造像。
+    :param codes: 形状为 (B, n) 的整数数组
+    :param perms: 形状为 (|G|, n) 的置换矩阵，perms[g, i] 为 g 把位置 i 送到的位置
+    :param k: 颜色种类数
+    :return: (原染色的键, 形状为 (B, |G|) 的像的键)；k^n 放不进 int64 时返回 None
+    """
+    n = codes.shape[1]
+    if k ** n >= 2 ** 63:
+        return None
+    weights = lex_weights(n, k)
+    image_weights = weights[perms].T  # (n, |G|)
+    if k ** n < 2 ** 53:
+        # float64 在 2^53 以内是精确的，可以走 BLAS
+        codes = codes.astype(np.float64)
+        return codes @ weights.astype(np.float64), codes @ image_weights.astype(np.float64)
+    codes = codes.astype(np.int64)
+    return codes @ weights, codes @ image_weights
+
+
+def word_weights(n, k):
+    """
+    多字压缩的权重：按字典序把 n 个位置切成若干段，每段 d 位 k 进制数（k^d <= 2^53，
+    float64 可精确表示），段内第一位权重最大，逐字比较即为字典序比较。
+    :param n: 元素个数
+    :param k: 颜色种类数
+    :return: 形状为 (n, 字数) 的 float64 数组，第 p 行只在位置 p 所在的字上非零
+    """
+    d = 1
+    while d < n and k ** (d + 1) <= 2 ** 53:
+        d += 1
+    positions = np.arange(n)
+    weights = np.zeros((n, -(-n // d)))
+    weights[positions, positions // d] = float(k) ** (d - 1 - positions % d)
+    return weights
+
+
+def packed_image_keys(codes, perms, k):
+    """
+    多字压缩版的 image_keys，对任意 k^n 都适用。
+    :param codes: 形状为 (B, n) 的整数数组
+    :param perms: 形状为 (|G|, n) 的置换矩阵
+    :param k: 颜色种类数
+    :return: (原染色的字，形状为 (B, 字数)；像的字，形状为 (B, |G|, 字数))
+    """
+    n = codes.shape[1]
+    weights = word_weights(n, k)
+    image_weights = weights[np.asarray(perms)]  # (|G|, n, 字数)
+    codes = codes.astype(np.float64)
+    images = codes @ image_weights.transpose(1, 0, 2).reshape(n, -1)
+    return codes @ weights, images.reshape(len(codes), len(image_weights), weights.shape[1])
+
+
+def _packed_blocks(codes, perms, k):
+    """按块产出 (起始行, 原染色的字, 像的字)，每块的像的字不超过 PACKED_BLOCK 个。"""
+    n = codes.shape[1]
+    rows = max(1, PACKED_BLOCK // (len(perms) * word_weights(n, k).shape[1]))
+    for start in range(0, len(codes), rows):
+        yield (start,) + packed_image_keys(codes[start:start + rows], perms, k)
+
+
+def lex_compare(a, b):
+    """
+    逐行比较字典序（最后一维为染色，其余维按广播规则对齐）。
+    :param a: 颜色下标数组
+    :param b: 颜色下标数组
+    :return: 整数数组，a 小于、等于、大于 b 时分别为 -1、0、1
+    """
+    diff = np.asarray(a).astype(np.int16) - np.asarray(b).astype(np.int16)
+    first = (diff != 0).argmax(axis=-1)
+    return np.sign(np.take_along_axis(diff, first[..., None], axis=-1)[..., 0])
+
+
+def representative_mask(codes, perms, k=None):
+    """
+    批量判断染色是否为其轨道的字典序最小代表。
+    :param codes: 形状为 (B, n) 的整数数组
+    :param perms: 形状为 (|G|, n) 的置换矩阵，perms[g, i] 为 g 把位置 i 送到的位置
+    :param k: 颜色种类数，None 表示按 codes 中的最大值推断
+    :return: 长度为 B 的布尔数组
+    """
+    codes = np.asarray(codes)
+    if codes.ndim != 2:
+        raise ValueError("codes 必须是二维数组")
+    if len(codes) == 0:
+        return np.zeros(0, dtype=bool)
+    if k is None:
+        k = int(codes.max()) + 1
+
+    keys = image_keys(codes, perms, k)
+    if keys is not None:
+        # 字典序比较退化为整数比较
+        return (keys[1] >= keys[0][:, None]).all(axis=1)
+
+    # 否则逐字比较多字压缩的键：第一个不相等的字决定大小
+    mask = np.empty(len(codes), dtype=bool)
+    for start, words, images in _packed_blocks(codes, perms, k):
+        diff = np.sign(images - words[:, None, :])
+        first = (diff != 0).argmax(axis=2)
+        mask[start:start + len(words)] = (np.take_along_axis(diff, first[..., None], axis=2) >= 0).all(axis=(1, 2))
+    return mask
+
+
+def filter_representatives(colorings, colors, perm_group, n, chunk_size=8192):
+    """
+    从候选染色中筛出字典序最小代表，每次批量检测 chunk_size 个。
+    :param colorings: 可迭代对象，每个元素是颜色名序列
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param chunk_size: 每批检测的候选数
+    :return: 生成器，按输入顺序产出代表元（颜色名元组）
+    """
+    perms, _ = permutation_matrices(perm_group, n)
+    k = len(colors)
+    chunk = []
+
+    def flush():
+        codes = encode_colorings(chunk, colors)
+        mask = representative_mask(codes, perms, k)
+        return decode_colorings(codes[mask], colors)
+
+    for coloring in colorings:
+        chunk.append(coloring)
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            chunk = []
+    if chunk:
+        yield from flush()
+
+
+# Canonicalizer 单个染色的 LRU 缓存容量
+CANONICAL_CACHE_SIZE = 65536
+
+
+def canonical_codes(codes, perms, k=None, inverses=None):
+    """
+    批量求每个染色所在轨道的字典序最小代表。
+    :param codes: 形状为 (B, n) 的整数数组
+    :param perms: 形状为 (|G|, n) 的置换矩阵
+    :param k: 颜色种类数，None 表示按 codes 中的最大值推断
+    :param inverses: 对应的逆置换矩阵，None 表示由 perms 计算
+    :return: 形状为 (B, n) 的数组，与 codes 同类型
+    """
+    codes = np.asarray(codes)
+    if codes.ndim != 2:
+        raise ValueError("codes 必须是二维数组")
+    if len(codes) == 0:
+        return codes.copy()
+    if k is None:
+        k = int(codes.max()) + 1
+    if inverses is None:
+        inverses = np.argsort(perms, axis=1)
+
+    keys = image_keys(codes, perms, k)
+    if keys is not None:
+        # 所有像的键由一次矩阵乘法得到，取键最小的像
+        best = keys[1].argmin(axis=1)
+        return np.take_along_axis(codes, np.asarray(inverses)[best], axis=1)
+
+    # 键放不进 int64 时用多字压缩的键：逐字筛掉不是最小的像，剩下的第一个即字典序最小
+    best = np.empty(len(codes), dtype=np.intp)
+    for start, _, images in _packed_blocks(codes, perms, k):
+        candidates = np.ones(images.shape[:2], dtype=bool)
+        for word in range(images.shape[2]):
+            column = np.where(candidates, images[:, :, word], np.inf)
+            candidates &= column == column.min(axis=1, keepdims=True)
+        best[start:start + len(images)] = candidates.argmax(axis=1)
+    return np.take_along_axis(codes, np.asarray(inverses)[best], axis=1)
+
+
+class Canonicalizer:
+    """固定群与颜色顺序的规范形计算器：单个染色带 LRU 缓存，批量走矩阵运算。"""
+
+    def __init__(self, colors, perm_group, n, cache_size=CANONICAL_CACHE_SIZE):
+        """
+        :param colors: 颜色列表（其顺序决定字典序）
+        :param perm_group: 字典，表示群
+        :param n: 元素个数
+        :param cache_size: 单个染色规范形的缓存容量
+        """
+        self.colors = list(colors)
+        self.n = n
+        self.perms, self.inverses = permutation_matrices(perm_group, n)
+        self.canonicalize = lru_cache(maxsize=cache_size)(self._canonicalize)
+
+    def _canonicalize(self, coloring):
+        codes = encode_colorings([coloring], self.colors)
+        return decode_colorings(canonical_codes(codes, self.perms, len(self.colors), self.inverses), self.colors)[0]
+
+    def canonicalize_many(self, codes):
+        """
+        :param codes: 形状为 (B, n) 的颜色下标数组（见 encode_colorings）
+        :return: 形状为 (B, n) 的数组，各行为所在轨道的字典序最小代表
+        """
+        return canonical_codes(codes, self.perms, len(self.colors), self.inverses)
+
+    def are_equivalent(self, coloring1, coloring2):
+        """
+        :param coloring1: 颜色名序列
+        :param coloring2: 颜色名序列
+        :return: 布尔值，两者是否在同一轨道中（比较规范形，结果带缓存）
+        """
+        if len(coloring1) != self.n or len(coloring2) != self.n:
+            raise ValueError(f"染色长度必须为 {self.n}")
+        if sorted(map(self.colors.index, coloring1)) != sorted(map(self.colors.index, coloring2)):
+            return False
+        return self.canonicalize(tuple(coloring1)) == self.canonicalize(tuple(coloring2))
+
+
+# equivalence_classes 每批规范化的染色数
+EQUIVALENCE_CHUNK = 1 << 16
+
+
+def equivalence_classes(colorings, perm_group, n, colors=None, chunk_size=EQUIVALENCE_CHUNK):
+    """
+    一遍扫描，按规范形把染色分桶，得到等价类。每个染色只做一次 O(|G|·n) 的规范化，
+    之后的比较都是字典查找，不需要两两判断。
+    :param colorings: 可迭代对象，每个元素是颜色名序列
+    :param perm_group: 字典，表示群
+    :param n: 元素个数
+    :param colors: 颜色列表（其顺序决定规范形的字典序），None 表示按颜色首次出现的顺序
+    :param chunk_size: 每批规范化的染色数
+    :return: 字典，规范形（颜色名元组）-> 输入中属于该轨道的下标列表；按各类首次出现的顺序排列
+    """
+    perms, inverses = permutation_matrices(perm_group, n)
+    colors = [] if colors is None else list(colors)
+    index = {c: i for i, c in enumerate(colors)}
+    grow = not colors
+    buckets = {}
+    chunk = []
+    start = 0
+
+    def flush():
+        if len(index) > 256:
+            raise ValueError("颜色种类过多，无法用 uint8 编码")
+        codes = np.array(chunk, dtype=np.uint8)
+        # 颜色下标一经分配就不再改变，字典序最小的像与 k 取多大无关，各批的规范形可以直接比较
+        canonical = canonical_codes(codes, perms, len(index), inverses)
+        data = canonical.tobytes()
+        for offset, i in enumerate(range(0, len(data), n)):
+            buckets.setdefault(data[i:i + n], []).append(start + offset)
+
+    for coloring in colorings:
+        if len(coloring) != n:
+            raise ValueError(f"染色长度必须为 {n}: {coloring!r}")
+        if grow:
+            for c in coloring:
+                if c not in index:
+                    index[c] = len(colors)
+                    colors.append(c)
+        chunk.append([index[c] for c in coloring])
+        if len(chunk) >= chunk_size:
+            flush()
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        flush()
+    return {tuple(colors[c] for c in key): members for key, members in buckets.items()}
@@ -0,0 +1,98 @@
+# polya/chirality.py
+"""
+一次枚举同时得到旋转群与完整对称群下的结果，并区分手性与非手性轨道。
+
+设 R 为旋转群，m 为任一镜面反射，完整对称群为 R ∪ mR。对旋转群下的每个
+字典序最小代表 x，计算其镜像轨道的最小代表 x' = min{(m r)·x : r ∈ R}：
+- x' == x：镜像与自身旋转等价，轨道非手性；
+- x' != x：x 与 x' 是一对手性轨道。
+完整对称群的轨道是 R 轨道与其镜像的并，其最小代表正是满足 x <= x' 的那些 x，
+因此只需在旋转群代表上多做一次反射陪集上的最小化，不必再跑第二遍枚举。
+只要轨道数时不必枚举：chirality_report 由两次 Burnside 计数得到，代表以生成器给出。
+"""
+from itertools import islice
+
+import numpy as np
+
+from polya.burnside import count_orbits
+from polya.canonical import canonical_codes
+from polya.enumeration import counts_in_order, iter_orderly_indices
+from polya.group_tables import inverse_permutations, permutation_matrices
+
+# 每批计算镜像最小代表的代表数
+CHIRALITY_CHUNK = 4096
+
+
+def iter_chirality(colors, rotation_group, full_group, color_counts, n, max_results=None):
+    """
+    逐个产出旋转群代表及其镜像轨道的代表。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param rotation_group: 旋转群字典
+    :param full_group: 完整对称群字典，前 |旋转群| 个元素为旋转（见 polya.group_tables.extend_group）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 元素个数
+    :param max_results: 最多处理的旋转群代表数，None 表示不限制
+    :return: 生成器，产出 (代表, 镜像代表, 是否为完整对称群代表)；代表与镜像代表相同表示非手性，
+             第三项为 True 的代表恰好构成完整对称群下的全部字典序最小代表
+    """
+    order = len(rotation_group)
+    if len(full_group) != 2 * order:
+        raise ValueError("完整对称群的阶应为旋转群的两倍")
+    counts = counts_in_order(colors, color_counts)
+    perms, inverses = permutation_matrices(full_group, n)
+    coset_perms = np.asarray(perms[order:], dtype=np.intp)
+    coset_inverses = np.asarray(inverses[order:], dtype=np.intp)
+
+    source = iter_orderly_indices(counts, inverse_permutations(rotation_group, n), n)
+    if max_results is not None:
+        source = islice(source, max_results)
+    while True:
+        chunk = list(islice(source, CHIRALITY_CHUNK))
+        if not chunk:
+            return
+        # 反射陪集 mR 上的最小像即镜像轨道的最小代表，与求规范形的批量计算相同
+        mirrors = canonical_codes(np.array(chunk, dtype=np.int64), coset_perms, len(colors), coset_inverses)
+        for rep, mirror in zip(chunk, map(tuple, mirrors.tolist())):
+            yield tuple(colors[c] for c in rep), tuple(colors[c] for c in mirror), rep <= mirror
+
+
+def iter_achiral(colors, rotation_group, full_group, color_counts, n):
+    """:return: 生成器，按字典序产出非手性轨道的代表（参数同 iter_chirality）"""
+    for rep, mirror, _ in iter_chirality(colors, rotation_group, full_group, color_counts, n):
+        if rep == mirror:
+            yield rep
+
+
+def iter_chiral_pairs(colors, rotation_group, full_group, color_counts, n):
+    """:return: 生成器，按字典序产出手性轨道对 (代表, 镜像代表)，每对只产出一次（参数同 iter_chirality）"""
+    for rep, mirror, leader in iter_chirality(colors, rotation_group, full_group, color_counts, n):
+        if leader and rep != mirror:
+            yield rep, mirror
+
+
+def chirality_report(colors, rotation_group, full_group, color_counts, n):
+    """
+    两种对称模式下的方案数及手性/非手性轨道数。
+    完整对称群的每个轨道要么是一个非手性旋转轨道，要么是一对手性旋转轨道，
+    因此 非手性数 = 2·完整群计数 − 旋转群计数，手性对数 = 旋转群计数 − 完整群计数，
+    都由 Burnside 计数直接得到，不需要枚举。
+    :param colors: 颜色列表
+    :param rotation_group: 旋转群字典
+    :param full_group: 完整对称群字典
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 元素个数
+    :return: 字典，'rotation' 旋转群下的方案数，'full' 完整对称群下的方案数，
+             'achiral' 非手性轨道数，'chiral_pairs' 手性轨道对数；
+             'achiral_representatives'、'chiral_pairs_list' 为对应代表的生成器，遍历时才枚举
+    """
+    counts = counts_in_order(colors, color_counts)
+    rotation = count_orbits(rotation_group, counts, n)
+    full = count_orbits(full_group, counts, n)
+    return {
+        'rotation': rotation,
+        'full': full,
+        'achiral': 2 * full - rotation,
+        'chiral_pairs': rotation - full,
+        'achiral_representatives': iter_achiral(colors, rotation_group, full_group, color_counts, n),
+        'chiral_pairs_list': iter_chiral_pairs(colors, rotation_group, full_group, color_counts, n),
+    }
@@ -0,0 +1,179 @@
+# polya/constrained.py
+"""
+带邻接约束的 Burnside 计数：相邻元素必须异色（'different'）或必须同色（'same'）。
+
+被 g 固定的染色在 g 的每个轮换上取同一种颜色，于是约束可以搬到「轮换商图」上：
+每个轮换是一个结点（权重为轮换长度），原图中有棱相连的两个轮换之间连一条棱。
+- 'different'：若某条棱的两端落在同一个轮换里，g 不固定任何合法染色；否则是商图的
+  带权正常着色计数，每种颜色的结点权重之和须恰为该颜色的使用次数。按「已放置结点中
+  仍有未放置邻居者」为前沿做转移矩阵式动态规划，状态为前沿结点的颜色与各颜色的剩余次数；
+- 'same'：商图的每个连通分量必须同色，等价于以分量大小为「轮换型」的普通固定计数。
+
+群作用保持邻接关系，共轭的元素商图同构、固定数相同，因此每个共轭类只算一次
+（群阶超过 polya.schreier_sims.CONJUGACY_CLASS_LIMIT 时逐个元素计算，不记录元素）。
+"""
+from polya.burnside import fixed_count, sizes_to_cycle_type
+from polya.group_tables import build_permutation
+from polya.schreier_sims import PermutationGroup, cycle_decomposition
+
+# 支持的约束
+CONSTRAINTS = ('different', 'same')
+
+
+def check_invariant_edges(perm_group, n, edges):
+    """
+    检查棱集合在群作用下不变，否则 Burnside 计数没有意义。
+    :param perm_group: 字典，表示群
+    :param n: 元素个数
+    :param edges: (i, j) 棱列表
+    """
+    edge_set = {frozenset(edge) for edge in edges}
+    for cycle_decomp in perm_group.values():
+        p, _ = build_permutation(cycle_decomp, n)
+        if any(frozenset((p[i], p[j])) not in edge_set for i, j in edges):
+            raise ValueError("邻接关系在群作用下不封闭")
+
+
+def quotient_graph(perm, edges):
+    """
+    :param perm: 置换元组，perm[i] 为 i 的像
+    :param edges: (i, j) 棱列表
+    :return: (结点权重列表, 商图棱集合 {(a, b), a < b}, 是否有棱落在同一轮换内)
+    """
+    cycles = cycle_decomposition(perm)
+    cycle_of = {}
+    for idx, cycle in enumerate(cycles):
+        for v in cycle:
+            cycle_of[v] = idx
+    weights = [len(cycle) for cycle in cycles]
+    quotient_edges = set()
+    has_loop = False
+    for i, j in edges:
+        a, b = cycle_of[i], cycle_of[j]
+        if a == b:
+            has_loop = True
+        else:
+            quotient_edges.add((min(a, b), max(a, b)))
+    return weights, quotient_edges, has_loop
+
+
+def _elimination_order(size, neighbors):
+    """每次放置已放置邻居最多的结点，使前沿保持较小。"""
+    placed = [False] * size
+    placed_neighbors = [0] * size
+    order = []
+    for _ in range(size):
+        v = max((u for u in range(size) if not placed[u]), key=lambda u: (placed_neighbors[u], -u))
+        placed[v] = True
+        order.append(v)
+        for u in neighbors[v]:
+            placed_neighbors[u] += 1
+    return order
+
+
+def proper_fixed_count(weights, quotient_edges, counts):
+    """
+    带权正常着色计数：相邻结点异色，颜色 c 的结点权重之和为 counts[c]。
+    :param weights: 结点权重列表
+    :param quotient_edges: 棱集合
+    :param counts: 各颜色的使用次数
+    :return: 整数
+    """
+    size = len(weights)
+    if sum(weights) != sum(counts):
+        return 0
+    neighbors = [[] for _ in range(size)]
+    for a, b in quotient_edges:
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+    order = _elimination_order(size, neighbors)
+    position = {v: pos for pos, v in enumerate(order)}
+    # 结点在前沿中停留到它最后一个邻居被放置为止
+    last_needed = [max((position[u] for u in neighbors[v]), default=-1) for v in range(size)]
+
+    frontier = []
+    states = {((), tuple(counts)): 1}
+    for pos, v in enumerate(order):
+        w = weights[v]
+        slots = [frontier.index(u) for u in neighbors[v] if position[u] < pos]
+        extended = frontier + [v]
+        keep = [idx for idx, u in enumerate(extended) if last_needed[u] > pos]
+        new_states = {}
+        for (colors, remaining), ways in states.items():
+            forbidden = {colors[s] for s in slots}
+            for c, left in enumerate(remaining):
+                if left < w or c in forbidden:
+                    continue
+                new_colors = colors + (c,)
+                key = (tuple(new_colors[idx] for idx in keep),
+                       remaining[:c] + (left - w,) + remaining[c + 1:])
+                new_states[key] = new_states.get(key, 0) + ways
+        states = new_states
+        frontier = [extended[idx] for idx in keep]
+        if not states:
+            return 0
+    return sum(states.values())
+
+
+def same_fixed_count(weights, quotient_edges, counts):
+    """
+    商图每个连通分量同色时的固定染色数。
+    :param weights: 结点权重列表
+    :param quotient_edges: 棱集合
+    :param counts: 各颜色的使用次数
+    :return: 整数
+    """
+    parent = list(range(len(weights)))
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for a, b in quotient_edges:
+        parent[find(a)] = find(b)
+    sizes = {}
+    for v, w in enumerate(weights):
+        root = find(v)
+        sizes[root] = sizes.get(root, 0) + w
+    return fixed_count(sizes_to_cycle_type(list(sizes.values())), counts)
+
+
+def constrained_fixed_count(perm, edges, counts, constraint='different'):
+    """
+    :param perm: 置换元组
+    :param edges: (i, j) 棱列表
+    :param counts: 各颜色的使用次数
+    :param constraint: 'different' 或 'same'
+    :return: 被 perm 固定且满足约束的染色数
+    """
+    weights, quotient_edges, has_loop = quotient_graph(perm, edges)
+    if constraint == 'different':
+        return 0 if has_loop else proper_fixed_count(weights, quotient_edges, counts)
+    if constraint == 'same':
+        return same_fixed_count(weights, quotient_edges, counts)
+    raise ValueError(f"未知的约束: {constraint}，可用: {', '.join(CONSTRAINTS)}")
+
+
+def count_constrained_orbits(perm_group, counts, n, edges, constraint='different'):
+    """
+    精确计算满足邻接约束的不等价染色方案数，不做枚举。
+    :param perm_group: 字典，表示群
+    :param counts: 各颜色的使用次数
+    :param n: 元素个数
+    :param edges: (i, j) 棱列表，须在群作用下不变
+    :param constraint: 'different'（相邻异色）或 'same'（相邻同色）
+    :return: 整数
+    """
+    if constraint not in CONSTRAINTS:
+        raise ValueError(f"未知的约束: {constraint}，可用: {', '.join(CONSTRAINTS)}")
+    if sum(counts) != n or any(c < 0 for c in counts):
+        return 0
+    check_invariant_edges(perm_group, n, edges)
+    total = sum(size * constrained_fixed_count(rep, edges, counts, constraint)
+                for rep, size in PermutationGroup.from_perm_group(perm_group, n).class_representatives())
+    result, rest = divmod(total, len(perm_group))
+    if rest:
+        raise ValueError("固定染色数之和不能被群阶整除，输入的置换集合不是群")
+    return result
@@ -0,0 +1,159 @@
+# polya/cycle_index.py
+"""
+纯 Python 的循环指标多项式展开（图案清单，pattern inventory）。
+
+Z(G; a1+...+ak) 是关于 a1..ak 的对称多项式，单项式 a^λ 的系数只依赖于
+λ 排序后的分拆。因此只需对 n 的每个（至多 k 个部分的）分拆展开一次，
+再把结果分发到该分拆的所有排列上，就得到每一种颜色分布的不等价方案数。
+"""
+from fractions import Fraction
+from math import comb
+
+from polya.burnside import cycle_type_classes
+
+
+def cycle_index(perm_group, n):
+    """
+    计算群的循环指标。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :return: dict，轮换型 -> 系数（Fraction）
+    """
+    group_size = len(perm_group)
+    if group_size == 0:
+        raise ValueError("The permutation group is empty, cannot divide by zero.")
+    return {ctype: Fraction(mult, group_size)
+            for ctype, mult in cycle_type_classes(perm_group, n)}
+
+
+def format_cycle_index(perm_group, n):
+    """
+    把循环指标格式化为形如 "1/60*(x1^20 + 15*x2^10 + ...)" 的字符串。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :return: 字符串
+    """
+    terms = []
+    for ctype, mult in cycle_type_classes(perm_group, n):
+        monomial = '*'.join(f"x{size}^{m}" if m > 1 else f"x{size}" for size, m in ctype)
+        terms.append(monomial if mult == 1 else f"{mult}*{monomial}")
+    return f"1/{len(perm_group)}*({' + '.join(terms)})"
+
+
+def _split_options(sizes, remaining, part):
+    """
+    枚举把若干轮换分给一种颜色、使其恰好占用 part 个元素的所有方式。
+    :param sizes: 轮换长度元组
+    :param remaining: 各长度剩余的轮换个数
+    :param part: 该颜色需要占用的元素个数
+    :return: 列表，每个元素为 (新的剩余个数, 选法数)
+    """
+    options = []
+
+    def walk(idx, left, taken, ways):
+        if idx == len(sizes):
+            if left == 0:
+                options.append((tuple(r - t for r, t in zip(remaining, taken)), ways))
+            return
+        size = sizes[idx]
+        for j in range(min(remaining[idx], left // size) + 1):
+            walk(idx + 1, left - j * size, taken + (j,), ways * comb(remaining[idx], j))
+
+    walk(0, part, (), 1)
+    return options
+
+
+def _expand_cycle_type(ctype, k):
+    """
+    展开单个轮换型对应的单项式 prod_s (a1^s+...+ak^s)^{m_s}。
+    :param ctype: 轮换型
+    :param k: 颜色数
+    :return: dict，非增分拆（长度 k，允许 0）-> 系数
+    """
+    sizes = tuple(size for size, _ in ctype)
+    memo = {}
+
+    def expand(remaining, max_part, parts_left):
+        left = sum(size * r for size, r in zip(sizes, remaining))
+        if left == 0:
+            return {(0,) * parts_left: 1}
+        if parts_left == 0 or max_part * parts_left < left:
+            return {}
+        key = (remaining, max_part, parts_left)
+        if key in memo:
+            return memo[key]
+
+        result = {}
+        for part in range(min(max_part, left), 0, -1):
+            for new_remaining, ways in _split_options(sizes, remaining, part):
+                for tail, coeff in expand(new_remaining, part, parts_left - 1).items():
+                    lam = (part,) + tail
+                    result[lam] = result.get(lam, 0) + ways * coeff
+        memo[key] = result
+        return result
+
+    multiplicities = tuple(m for _, m in ctype)
+    return expand(multiplicities, sum(size * m for size, m in ctype), k)
+
+
+def partition_inventory(perm_group, n, k):
+    """
+    对 n 的每个至多 k 个部分的分拆，计算不等价染色方案数。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param k: 颜色数
+    :return: dict，非增分拆（长度 k，允许 0）-> 不等价方案数（整数）
+    """
+    group_size = len(perm_group)
+    if group_size == 0:
+        raise ValueError("The permutation group is empty, cannot divide by zero.")
+
+    totals = {}
+    for ctype, mult in cycle_type_classes(perm_group, n):
+        for lam, coeff in _expand_cycle_type(ctype, k).items():
+            totals[lam] = totals.get(lam, 0) + mult * coeff
+
+    inventory = {}
+    for lam, total in totals.items():
+        count, rest = divmod(total, group_size)
+        if rest:
+            raise ValueError("固定染色数之和不能被群阶整除，输入的置换集合不是群")
+        inventory[lam] = count
+    return inventory
+
+
+def _distinct_permutations(values):
+    """按字典序生成多重集合的全部不同排列。"""
+    items = sorted(values)
+    size = len(items)
+    while True:
+        yield tuple(items)
+        i = size - 2
+        while i >= 0 and items[i] >= items[i + 1]:
+            i -= 1
+        if i < 0:
+            return
+        j = size - 1
+        while items[j] <= items[i]:
+            j -= 1
+        items[i], items[j] = items[j], items[i]
+        items[i + 1:] = reversed(items[i + 1:])
+
+
+def pattern_inventory(perm_group, n, k, allow_zero=True):
+    """
+    一次展开 Z(G; a1+...+ak)，得到每一种颜色分布的不等价方案数。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param k: 颜色数
+    :param allow_zero: 是否包含某些颜色不使用的分布
+    :return: dict，颜色计数元组 (c1, ..., ck) -> 不等价方案数（整数）
+    """
+    inventory = {}
+    for lam, count in partition_inventory(perm_group, n, k).items():
+        if not allow_zero and lam[-1] == 0:
+            continue
+        for composition in _distinct_permutations(lam):
+            inventory[composition] = count
+    return inventory
+
@@ -0,0 +1,595 @@
+# polya/engine.py
+"""
+按多面体描述符参数化的染色引擎。
+
+原先 dodecahedron/coloring.py 与 icosahedron/coloring.py 各自写死顶点数（20、12）
+和各自的群缓存；这里的函数都以 polya.registry 中的描述符为参数，n、群和输出目录都从
+描述符取得。描述符上的群字典全进程只有一份，按群缓存的置换矩阵、轮换型分类和
+固定染色数记忆表因此在不同调用之间共享。
+"""
+import os
+from collections import Counter
+
+from polya.burnside import count_orbits, fixed_count, sizes_to_cycle_type
+from polya.canonical import Canonicalizer, equivalence_classes as _equivalence_classes
+from polya.canonical import filter_representatives as _filter_representatives
+from polya.chirality import chirality_report as _chirality_report
+from polya.constrained import count_constrained_orbits
+from polya.dedup import dedup_colorings, invariant_blocks
+from polya.enumeration import iter_representatives as _iter_representatives
+from polya.enumeration import counts_in_order, iter_orderly_indices, orderly_representatives
+from polya.enumeration import iter_representatives_with_stabilizers
+from polya.group_tables import GroupCache, inverse_permutations
+from polya.power_group import build_color_group, count_power_orbits, iter_power_representatives
+from polya.paging import DEFAULT_BUCKET_SIZE, OrbitIndex
+from polya.rank import multiset_count
+from polya.registry import PolyhedronDescriptor, get_descriptor
+from polya.rules import compile_rules
+from polya.sampling import sample_representatives
+from polya.store import RepresentativeWriter, open_store
+from polya.writer import stream_colorings_to_file
+
+
+# (群字典, 颜色元组) -> Canonicalizer，LRU
+_CANONICALIZERS = GroupCache()
+
+
+def resolve_descriptor(descriptor, element_type="vertex"):
+    """
+    :param descriptor: PolyhedronDescriptor 或已注册的多面体名
+    :param element_type: descriptor 为名字时使用的元素类型
+    :return: PolyhedronDescriptor
+    """
+    if isinstance(descriptor, PolyhedronDescriptor):
+        return descriptor
+    return get_descriptor(descriptor, element_type)
+
+
+def _resolve_group(descriptor, perm_group, symmetry):
+    """显式给出的 perm_group 优先，否则按对称模式取描述符的群。"""
+    return descriptor.symmetry_group(symmetry) if perm_group is None else perm_group
+
+
+def count_fixed_by_permutation(colors, color_counts, sizes):
+    """
+    计算在给定置换下保持不变的染色方案数。
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param sizes: 轮换大小列表
+    :return: 整数，表示固定染色方案数
+    """
+    return fixed_count(sizes_to_cycle_type(sizes), [color_counts[c] for c in colors])
+
+
+def count_colorings(descriptor, colors, color_counts, perm_group=None, symmetry='rotation'):
+    """
+    Burnside 计数：在描述符的旋转群（或完整对称群）作用下不等价的染色方案数。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 整数
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return count_orbits(perm_group, [color_counts[c] for c in colors], descriptor.n)
+
+
+def count_constrained_colorings(descriptor, colors, color_counts, constraint='different', edges=None, perm_group=None,
+                                symmetry='rotation'):
+    """
+    满足邻接约束的不等价染色方案数，直接由 Burnside 计数得到，不做枚举，见 polya.constrained。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param constraint: 'different'（相邻元素异色）或 'same'（相邻元素同色）
+    :param edges: (i, j) 棱列表，None 表示使用描述符的邻接关系
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 整数
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    if edges is None:
+        edges = descriptor.adjacency
+        if edges is None:
+            raise ValueError(f"{descriptor.key} 没有邻接关系，请显式给出 edges")
+    return count_constrained_orbits(perm_group, [color_counts[c] for c in colors], descriptor.n, edges, constraint)
+
+
+def generate_all_valid_colorings(colors, color_counts, n, perm_group=None):
+    """
+    生成所有满足颜色计数约束的染色方案。
+    给出 perm_group 时在回溯中做字典序最小剪枝，只生成每个轨道的代表元。
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 元素个数
+    :param perm_group: 字典，表示群；None 表示不考虑对称性
+    :return: 列表，每个元素是一个染色方案（元组）
+    """
+    if perm_group is not None:
+        return orderly_representatives(colors, perm_group, color_counts, n)
+
+    colors_list = list(colors)
+    counts_req = [color_counts[c] for c in colors_list]
+    counts_curr = [0] * len(colors_list)
+    results = []
+    current_coloring = [None] * n
+
+    # 颜色数量之和填不满 n 个位置时不存在合法方案，无需展开搜索树
+    if sum(counts_req) != n:
+        return results
+
+    def backtrack(i):
+        if i == n:
+            results.append(tuple(current_coloring))
+            return
+
+        for c_idx, c in enumerate(colors_list):
+            if counts_curr[c_idx] < counts_req[c_idx]:
+                current_coloring[i] = c
+                counts_curr[c_idx] += 1
+                backtrack(i + 1)
+                counts_curr[c_idx] -= 1
+
+    backtrack(0)
+    return results
+
+
+def is_representative(coloring, group_perms):
+    """
+    检查染色方案是否是其轨道的字典序最小代表。
+    :param coloring: 染色方案（元组）
+    :param group_perms: 列表，每个元素是(_, 逆置换函数)
+    :return: 布尔值
+    """
+    return all(tuple(coloring[pinv[i]] for i in range(len(coloring))) >= coloring for _, pinv in group_perms)
+
+
+def filter_representatives(descriptor, colors, colorings, perm_group=None, symmetry='rotation'):
+    """
+    批量筛选字典序最小代表，保持输入顺序。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param colorings: 可迭代对象，候选染色方案
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 列表，其中的代表元（元组）
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return list(_filter_representatives(colorings, colors, perm_group, descriptor.n))
+
+
+def iter_representatives(descriptor, colors, color_counts, max_results=None, method='orderly', perm_group=None,
+                         symmetry='rotation'):
+    """
+    逐个产出不等价染色方案的代表元（生成器）。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param max_results: 最大输出数量，None 表示不限制
+    :param method: 'orderly'、'sweep' 或 'parallel'，见 polya.enumeration.iter_representatives
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 生成器，按字典序产出颜色名元组
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return _iter_representatives(colors, perm_group, color_counts, descriptor.n, max_results, method)
+
+
+def iter_rule_representatives(descriptor, colors, color_counts, rules, max_results=None, scopes=None, perm_group=None,
+                              symmetry='rotation'):
+    """
+    逐个产出满足局部规则的代表元，规则在回溯中增量检查，见 polya.rules。
+    规则在群作用下不变时（如 "not_monochromatic per face"），结果恰好是满足规则的全部轨道。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param rules: 规则文本列表，如 ["at_most(red, 2) per face", "at_least(blue, 1) per neighborhood"]
+    :param max_results: 最大输出数量，None 表示不限制
+    :param scopes: 额外的 {范围名: 块列表}
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 生成器，按字典序产出颜色名元组
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    counts = counts_in_order(colors, color_counts)
+    checker = compile_rules(rules, colors, descriptor, scopes)
+    source = iter_orderly_indices(counts, inverse_permutations(perm_group, descriptor.n), descriptor.n,
+                                  checker=checker)
+    for produced, indices in enumerate(source):
+        if max_results is not None and produced >= max_results:
+            return
+        yield tuple(colors[c] for c in indices)
+
+
+def orbit_index(descriptor, colors, color_counts, bucket_size=DEFAULT_BUCKET_SIZE, index_file=None, perm_group=None,
+                symmetry='rotation'):
+    """
+    建立（或读入）代表元的随机访问索引，用于翻页和轨道编号，见 polya.paging。
+    建立索引要完整枚举一遍全部代表，只适用于代表总数能枚举完的输入；建好后写盘复用。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param bucket_size: 检查点间隔，越小单次访问越快、索引越大
+    :param index_file: 索引文件名（位于描述符输出目录），存在时直接读入，否则建立后写入；None 表示不读写
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: OrbitIndex，支持 unrank(k)、rank(coloring)、page(start, stop)
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    if index_file is None:
+        return OrbitIndex(colors, perm_group, color_counts, descriptor.n, bucket_size)
+    file_path = output_path(descriptor, index_file)
+    if os.path.exists(file_path):
+        return OrbitIndex.load(file_path, colors, perm_group, color_counts, descriptor.n)
+    index = OrbitIndex(colors, perm_group, color_counts, descriptor.n, bucket_size)
+    index.save(file_path)
+    return index
+
+
+def get_all_colorings(descriptor, colors, color_counts, max_results=5000, perm_group=None, symmetry='rotation'):
+    """
+    枚举不等价的染色方案（每个轨道一个代表），超过 max_results 个时只保留前 max_results 个。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param max_results: 最大输出数量
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 列表，每个元素是一个不等价染色方案（元组）
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    representatives = orderly_representatives(colors, perm_group, color_counts, descriptor.n,
+                                              max_results=max_results)
+    if len(representatives) >= max_results:
+        print(f"超过 {max_results} 个方案，仅保留前 {max_results} 个。")
+    return representatives
+
+
+def sample_colorings(descriptor, colors, color_counts, size=1, rng=None, perm_group=None, symmetry='rotation'):
+    """
+    在全部不等价染色方案中均匀抽样（有放回），不做枚举，见 polya.sampling。
+    与 get_all_colorings 截断得到的前若干个方案不同，样本在全部轨道上没有偏向。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param size: 抽样个数
+    :param rng: random.Random 实例或整数种子，None 表示使用全局随机数
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 列表，每个元素是轨道的字典序最小代表（颜色名元组）
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return sample_representatives(colors, perm_group, color_counts, descriptor.n, size, rng)
+
+
+def chirality_report(descriptor, colors, color_counts):
+    """
+    旋转群和完整对称群下的方案数、手性/非手性轨道数，以及按需枚举的代表，见 polya.chirality。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :return: 字典，计数为整数，代表为生成器
+    """
+    descriptor = resolve_descriptor(descriptor)
+    return _chirality_report(colors, descriptor.group, descriptor.full_group, color_counts, descriptor.n)
+
+
+def count_colorings_up_to_relabeling(descriptor, colors, color_counts, color_group=None, perm_group=None,
+                                     symmetry='rotation'):
+    """
+    颜色名可互换时的方案数（如 10/10 两色时交换红蓝视为同一方案），见 polya.power_group。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param color_group: 颜色置换群的生成元，None 表示全部颜色可任意互换（对称群）
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 整数
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return count_power_orbits(perm_group, [color_counts[c] for c in colors], descriptor.n,
+                              build_color_group(colors, color_group))
+
+
+def iter_representatives_up_to_relabeling(descriptor, colors, color_counts, color_group=None, max_results=None,
+                                          perm_group=None, symmetry='rotation'):
+    """
+    逐个产出颜色名可互换时不等价染色方案的代表元（每个轨道中字典序最小者）。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param color_group: 颜色置换群的生成元，None 表示全部颜色可任意互换（对称群）
+    :param max_results: 最大输出数量，None 表示不限制
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 生成器，按字典序产出颜色名元组
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return iter_power_representatives(colors, perm_group, color_counts, descriptor.n,
+                                      build_color_group(colors, color_group), max_results)
+
+
+def canonicalizer(descriptor, colors, perm_group=None, symmetry='rotation'):
+    """
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: Canonicalizer，同一群与颜色顺序全进程共用一个（及其 LRU 缓存）
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    cached = _CANONICALIZERS.get(perm_group, tuple(colors))
+    if cached is None:
+        cached = Canonicalizer(colors, perm_group, descriptor.n)
+        _CANONICALIZERS.put(perm_group, cached, tuple(colors))
+    return cached
+
+
+def canonicalize(descriptor, coloring, colors, perm_group=None, symmetry='rotation'):
+    """
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param coloring: 颜色名序列
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 元组，coloring 所在轨道的字典序最小代表
+    """
+    return canonicalizer(descriptor, colors, perm_group, symmetry).canonicalize(tuple(coloring))
+
+
+def canonicalize_many(descriptor, codes, colors, perm_group=None, symmetry='rotation'):
+    """
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param codes: 形状为 (B, n) 的颜色下标数组（见 polya.canonical.encode_colorings）
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 形状为 (B, n) 的数组，各行为所在轨道的字典序最小代表
+    """
+    return canonicalizer(descriptor, colors, perm_group, symmetry).canonicalize_many(codes)
+
+
+def are_equivalent(descriptor, coloring1, coloring2, colors=None, perm_group=None, symmetry='rotation'):
+    """
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param coloring1: 颜色名序列
+    :param coloring2: 颜色名序列
+    :param colors: 颜色列表，None 表示取两者出现的颜色（按名字排序）
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 布尔值，两个染色是否在群作用下等价
+    """
+    if colors is None:
+        colors = sorted(set(coloring1) | set(coloring2), key=str)
+    return canonicalizer(descriptor, colors, perm_group, symmetry).are_equivalent(coloring1, coloring2)
+
+
+def equivalence_classes(descriptor, colorings, colors=None, perm_group=None, symmetry='rotation'):
+    """
+    一遍扫描把染色按规范形分桶，见 polya.canonical.equivalence_classes。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colorings: 可迭代对象，每个元素是颜色名序列
+    :param colors: 颜色列表（其顺序决定规范形的字典序），None 表示按颜色首次出现的顺序
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 字典，规范形（颜色名元组）-> 输入中属于该轨道的下标列表
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return _equivalence_classes(colorings, perm_group, descriptor.n, colors)
+
+
+def dedup_coloring_files(descriptor, paths, filename, colors, perm_group=None, symmetry='rotation', **options):
+    """
+    把若干染色文件（可远大于内存）去重为互不等价的轨道代表，写到描述符输出目录，见 polya.dedup。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param paths: 输入文件路径列表
+    :param filename: 输出文件名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :param options: 传给 polya.dedup.dedup_colorings 的 partitions、chunk_rows、tmp_dir
+    :return: (读入的染色数, 轨道数)
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    file_path = output_path(descriptor, filename)
+    result = dedup_colorings(paths, file_path, colors, perm_group, descriptor.n, invariant_blocks(descriptor),
+                             descriptor.element_type, **options)
+    print(f"Colorings saved to {file_path}")
+    return result
+
+
+def output_path(descriptor, filename):
+    """
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param filename: 文件名
+    :return: 描述符输出目录下的路径（目录不存在时自动创建）
+    """
+    descriptor = resolve_descriptor(descriptor)
+    if descriptor.output_dir:
+        os.makedirs(descriptor.output_dir, exist_ok=True)
+        return os.path.join(descriptor.output_dir, filename)
+    return filename
+
+
+def save_colorings_to_file(descriptor, colorings, filename, element_type=None):
+    """
+    将染色方案列表保存到文件。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colorings: 染色方案列表
+    :param filename: 文件名
+    :param element_type: 文件头中的元素类型，None 表示使用描述符的元素类型
+    """
+    descriptor = resolve_descriptor(descriptor)
+    element_type = element_type or descriptor.element_type
+    file_path = output_path(descriptor, filename)
+    with open(file_path, 'w') as f:
+        f.write(f"{element_type.capitalize()} colorings with {len(colorings)} classes\n")
+        for idx, coloring in enumerate(colorings, 1):
+            f.write(f"Class {idx}: {' '.join(coloring)}\n")
+    print(f"Colorings saved to {file_path}")
+
+
+def check_orbit_histogram(histogram, counts, orbits):
+    """
+    用 Burnside 结果核对轨道大小直方图：轨道数之和应为不等价方案数，
+    轨道大小之和应为全部染色数（多重组合数）。
+    :param histogram: dict，轨道大小 -> 轨道数
+    :param counts: 各颜色的使用次数
+    :param orbits: Burnside 计数得到的不等价方案数
+    """
+    total = multiset_count(counts)
+    if sum(histogram.values()) != orbits:
+        raise ValueError(f"直方图中的轨道数 {sum(histogram.values())} 与 Burnside 计数 {orbits} 不一致")
+    if sum(size * num for size, num in histogram.items()) != total:
+        raise ValueError(f"直方图中的轨道大小之和与染色总数 {total} 不一致")
+
+
+def format_orbit_histogram(histogram):
+    """:return: 形如 "Orbit sizes: 60x9700 30x70" 的一行文本"""
+    return "Orbit sizes: " + ' '.join(f"{size}x{num}" for size, num in sorted(histogram.items(), reverse=True)) + "\n"
+
+
+def iter_representatives_with_orbits(descriptor, colors, color_counts, max_results=None, perm_group=None,
+                                     symmetry='rotation'):
+    """
+    逐个产出代表元及其稳定子与轨道大小，稳定子在枚举的前缀检测中顺带得到。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param max_results: 最大输出数量，None 表示不限制
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: 生成器，产出 (颜色名元组, 稳定子元素的群字典键元组, 轨道大小)
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    return iter_representatives_with_stabilizers(colors, perm_group, color_counts, descriptor.n, max_results)
+
+
+def orbit_size_histogram(descriptor, colors, color_counts, perm_group=None, symmetry='rotation'):
+    """
+    统计各轨道大小的轨道数，并与 Burnside 计数核对。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: dict，轨道大小 -> 轨道数
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    counts = [color_counts[c] for c in colors]
+    histogram = Counter(size for _, _, size in
+                        iter_representatives_with_stabilizers(colors, perm_group, color_counts, descriptor.n))
+    check_orbit_histogram(histogram, counts, count_orbits(perm_group, counts, descriptor.n))
+    return dict(histogram)
+
+
+def save_representatives_to_file(descriptor, colors, color_counts, filename, max_results=None, perm_group=None,
+                                 element_type=None, symmetry='rotation', with_stabilizers=False, preview=0):
+    """
+    边枚举边写文件：代表元由后台线程分块写盘，内存占用与方案数无关。
+    with_stabilizers 为 True 时每行末尾附上 " | orbit=轨道大小 stabilizer=稳定子元素键"，
+    文件末尾写一行轨道大小直方图；写出全部代表时直方图会与 Burnside 计数核对。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param filename: 文件名
+    :param max_results: 最大输出数量，None 表示全部写出
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param element_type: 文件头中的元素类型，None 表示使用描述符的元素类型
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :param with_stabilizers: 是否同时写出每个代表的轨道大小和稳定子
+    :param preview: 同时收集写出的前 preview 个方案，供调用方显示（不必为预览再枚举一遍）
+    :return: 写入的方案数；preview 大于 0 时为 (写入的方案数, 前 preview 个方案的列表)
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    file_path = output_path(descriptor, filename)
+    counts = [color_counts[c] for c in colors]
+    orbits = count_orbits(perm_group, counts, descriptor.n)
+    total = orbits if max_results is None else min(orbits, max_results)
+    element_type = element_type or descriptor.element_type
+    first = []
+    if not with_stabilizers:
+        def representatives():
+            for coloring in _iter_representatives(colors, perm_group, color_counts, descriptor.n, max_results):
+                if len(first) < preview:
+                    first.append(coloring)
+                yield coloring
+
+        written = stream_colorings_to_file(representatives(), file_path, total, element_type)
+    else:
+        histogram = Counter()
+
+        def annotated():
+            for coloring, stabilizer, size in iter_representatives_with_stabilizers(colors, perm_group, color_counts,
+                                                                                     descriptor.n, max_results):
+                histogram[size] += 1
+                if len(first) < preview:
+                    first.append(coloring)
+                yield coloring, f"orbit={size} stabilizer={','.join(map(str, stabilizer))}"
+
+        def footer():
+            if total == orbits:
+                check_orbit_histogram(histogram, counts, orbits)
+            return format_orbit_histogram(histogram)
+
+        written = stream_colorings_to_file(annotated(), file_path, total, element_type, annotated=True, footer=footer)
+    print(f"Colorings saved to {file_path}")
+    return (written, first) if preview > 0 else written
+
+
+def save_representatives_to_store(descriptor, colors, color_counts, filename, max_results=None, perm_group=None,
+                                  symmetry='rotation', encoding='rows'):
+    """
+    边枚举边写二进制代表元文件（见 polya.store），之后可以 O(1) 读取任意一个方案。
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param filename: 文件名
+    :param max_results: 最大输出数量，None 表示全部写出
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :param encoding: 'rows'（每个位置一个字节）或 'rank'（多重集合排列编号）
+    :return: 写入的方案数
+    """
+    descriptor = resolve_descriptor(descriptor)
+    perm_group = _resolve_group(descriptor, perm_group, symmetry)
+    file_path = output_path(descriptor, filename)
+    counts = counts_in_order(colors, color_counts)
+    source = iter_orderly_indices(counts, inverse_permutations(perm_group, descriptor.n), descriptor.n)
+    with RepresentativeWriter(file_path, colors, descriptor.n, color_counts, perm_group, encoding,
+                              descriptor.element_type) as writer:
+        for produced, coloring in enumerate(source):
+            if max_results is not None and produced >= max_results:
+                break
+            writer.write_indices(coloring)
+    print(f"Colorings saved to {file_path}")
+    return writer.total
+
+
+def open_representative_store(descriptor, filename, perm_group=None, symmetry='rotation'):
+    """
+    :param descriptor: PolyhedronDescriptor 或多面体名
+    :param filename: 描述符输出目录下的文件名
+    :param perm_group: 字典，表示群；None 表示按 symmetry 使用描述符的群
+    :param symmetry: 'rotation'（旋转群）或 'full'（旋转加反射）
+    :return: polya.store.RepresentativeStore，已与群哈希核对
+    """
+    descriptor = resolve_descriptor(descriptor)
+    return open_store(output_path(descriptor, filename), _resolve_group(descriptor, perm_group, symmetry))
@@ -0,0 +1,253 @@
+# polya/enumeration.py
+"""
+不等价染色方案代表元的枚举。
+
+代表元定义为轨道中按 colors 列表顺序的字典序最小者。
+采用有序生成（orderly generation）：逐个位置回溯地填颜色，每填一个位置就检查
+当前前缀能否仍是字典序最小代表的前缀，不能则整棵子树剪掉。
+这样只会访问「规范前缀」，不需要先生成全部多重排列再过滤。
+前缀检测对每个群元素增量维护比较状态，见 _orderly_search。
+"""
+from polya.group_tables import inverse_permutations
+from polya.rank import orbit_sweep
+
+
+def counts_in_order(colors, color_counts):
+    """
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :return: 列表，按 colors 顺序排列的各颜色使用次数
+    """
+    counts = [color_counts[c] for c in colors]
+    if any(c < 0 for c in counts):
+        raise ValueError("颜色数量不能为负数")
+    return counts
+
+
+def _non_identity(inverse_perms, n):
+    return [pinv for pinv in inverse_perms if any(pinv[j] != j for j in range(n))]
+
+
+def _orderly_search(counts, inverse_perms, n, prefix=(), depth=None, checker=None, track_stabilizers=False):
+    """
+    带字典序最小剪枝的回溯搜索。
+
+    对每个非恒等群元素 g 维护比较状态：像 y[j] = x[pinv[j]] 与 x 在前 j 位上相等，
+    第 j 位尚未比较（「仍相等」）。第 j 位要等 j 和 pinv[j] 两个位置都填好才能比较，
+    因此把 (pinv, j) 挂在位置 max(j, pinv[j]) 的等待表上，填到该位置时再推进：
+    - 像更小：当前前缀不可能是代表，整棵子树剪掉；
+    - 像更大：g 对这棵子树不再有约束，从等待表中移除；
+    - 相等：继续比较下一位，直到需要等待更靠后的位置。
+    每个群元素只在它等待的位置上被处理，状态在回溯时按后进先出撤销。
+    比较一直相等直到第 n 位的元素把整个染色映到自身，正是稳定子中的元素，顺带记下即可。
+    :param counts: 各颜色（按下标）的使用次数
+    :param inverse_perms: 群中所有元素的逆置换
+    :param n: 顶点数
+    :param prefix: 固定的前缀
+    :param depth: 搜索到的长度，None 表示完整染色
+    :param checker: 局部约束检查器（见 polya.rules.RuleChecker），None 表示无约束；
+                    其内部计数随搜索变化，每次搜索应使用新的检查器
+    :param track_stabilizers: 为 True 时产出 (染色, 稳定子中非恒等元素的逆置换元组)
+    :return: 生成器，按字典序产出长度为 depth 的颜色下标元组
+    """
+    if depth is None:
+        depth = n
+    # 容量剪枝：剩余颜色数量之和必须恰好填满剩余位置
+    if sum(counts) != n or any(c < 0 for c in counts):
+        return
+    remaining = list(counts)
+    coloring = [0] * n
+    watchers = [[] for _ in range(n)]
+    # 当前前缀下已确认固定整个染色的元素，回溯时按长度截断
+    fixed = [] if track_stabilizers else None
+    for pinv in _non_identity(inverse_perms, n):
+        watchers[max(0, pinv[0])].append((pinv, 0))
+
+    def settle(i):
+        """位置 i 填好后推进等待它的群元素；剪枝时返回 None，否则返回新挂上的等待位置。"""
+        added = []
+        for pinv, j in watchers[i]:
+            while True:
+                src = pinv[j]
+                wait = src if src > j else j
+                if wait > i:
+                    watchers[wait].append((pinv, j))
+                    added.append(wait)
+                    break
+                a = coloring[src]
+                b = coloring[j]
+                if a < b:
+                    undo(added)
+                    return None
+                if a > b:
+                    break
+                j += 1
+                if j == n:
+                    if fixed is not None:
+                        fixed.append(pinv)
+                    break
+        return added
+
+    def undo(added):
+        for wait in reversed(added):
+            watchers[wait].pop()
+
+    for i, c_idx in enumerate(prefix):
+        coloring[i] = c_idx
+        remaining[c_idx] -= 1
+        if remaining[c_idx] < 0 or settle(i) is None:
+            return
+        if checker is not None and not checker.assign(i, c_idx):
+            return
+
+    def backtrack(i):
+        if i == depth:
+            if fixed is not None:
+                yield tuple(coloring[:depth]), tuple(fixed)
+            else:
+                yield tuple(coloring[:depth])
+            return
+        for c_idx in range(len(remaining)):
+            if remaining[c_idx] == 0:
+                continue
+            # 约束检查只看包含位置 i 的块，比前缀检测便宜，先做
+            if checker is not None and not checker.assign(i, c_idx):
+                continue
+            coloring[i] = c_idx
+            mark = 0 if fixed is None else len(fixed)
+            added = settle(i)
+            if added is None:
+                if fixed is not None:
+                    del fixed[mark:]
+                if checker is not None:
+                    checker.unassign(i, c_idx)
+                continue
+            remaining[c_idx] -= 1
+            yield from backtrack(i + 1)
+            remaining[c_idx] += 1
+            undo(added)
+            if fixed is not None:
+                del fixed[mark:]
+            if checker is not None:
+                checker.unassign(i, c_idx)
+
+    yield from backtrack(len(prefix))
+
+
+def iter_orderly_indices(counts, inverse_perms, n, prefix=(), checker=None):
+    """
+    有序生成全部字典序最小代表（以颜色下标表示）。
+    :param counts: 各颜色（按下标）的使用次数
+    :param inverse_perms: 群中所有元素的逆置换
+    :param n: 顶点数
+    :param prefix: 固定的前缀（须是 canonical_prefixes 给出的规范前缀），只枚举以它开头的代表
+    :param checker: 局部约束检查器，None 表示无约束
+    :return: 生成器，按字典序产出颜色下标元组
+    """
+    return _orderly_search(counts, inverse_perms, n, prefix, checker=checker)
+
+
+def iter_orderly_from(counts, inverse_perms, n, start, fixed=0):
+    """
+    从给定染色开始，按字典序产出不小于它的全部代表。
+    依次处理 start 自身、与 start 共享前 n-1 位、前 n-2 位……的兄弟子树，
+    每棵子树各调用一次有序生成，额外开销为 O(n·k) 次前缀检测，与跳过的代表数无关。
+    :param counts: 各颜色（按下标）的使用次数
+    :param inverse_perms: 群中所有元素的逆置换
+    :param n: 顶点数
+    :param start: 颜色下标元组（满足颜色计数，可以不是代表）
+    :param fixed: 只产出与 start 共享前 fixed 位的代表（即停留在该前缀的子树内）
+    :return: 生成器，按字典序产出颜色下标元组
+    """
+    start = tuple(start)
+    yield from _orderly_search(counts, inverse_perms, n, start)
+    for i in range(n - 1, fixed - 1, -1):
+        for c_idx in range(start[i] + 1, len(counts)):
+            yield from _orderly_search(counts, inverse_perms, n, start[:i] + (c_idx,))
+
+
+def canonical_prefixes(counts, inverse_perms, n, depth):
+    """
+    按字典序列出长度为 depth、能通过前缀检测的全部前缀。
+    以这些前缀为界划分的子树互不相交，按顺序拼接即为完整的字典序输出。
+    :param counts: 各颜色（按下标）的使用次数
+    :param inverse_perms: 群中所有元素的逆置换
+    :param n: 顶点数
+    :param depth: 前缀长度
+    :return: 列表，每个元素是颜色下标元组
+    """
+    return list(_orderly_search(counts, inverse_perms, n, depth=min(depth, n)))
+
+
+def iter_orderly_with_stabilizers(counts, inverse_perms, n):
+    """
+    有序生成代表，同时给出各代表的稳定子（在前缀检测中顺带得到，不需要额外一轮 |G| 次比较）。
+    :param counts: 各颜色（按下标）的使用次数
+    :param inverse_perms: 群中所有元素的逆置换
+    :param n: 顶点数
+    :return: 生成器，按字典序产出 (颜色下标元组, 稳定子元素在 inverse_perms 中的下标元组)
+    """
+    position = {id(pinv): idx for idx, pinv in enumerate(inverse_perms)}
+    identity = tuple(idx for idx, pinv in enumerate(inverse_perms) if all(pinv[j] == j for j in range(n)))
+    for coloring, fixed in _orderly_search(counts, inverse_perms, n, track_stabilizers=True):
+        yield coloring, tuple(sorted(identity + tuple(position[id(pinv)] for pinv in fixed)))
+
+
+def iter_representatives_with_stabilizers(colors, perm_group, color_counts, n, max_results=None):
+    """
+    逐个产出代表元及其稳定子和轨道大小。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 顶点数
+    :param max_results: 最大输出数量，None 表示不限制
+    :return: 生成器，按字典序产出 (颜色名元组, 稳定子元素在群字典中的键元组, 轨道大小 |G|/|Stab|)
+    """
+    counts = counts_in_order(colors, color_counts)
+    keys = list(perm_group)
+    source = iter_orderly_with_stabilizers(counts, inverse_permutations(perm_group, n), n)
+    for produced, (indices, stabilizer) in enumerate(source):
+        if max_results is not None and produced >= max_results:
+            return
+        yield tuple(colors[c] for c in indices), tuple(keys[g] for g in stabilizer), len(keys) // len(stabilizer)
+
+
+def iter_representatives(colors, perm_group, color_counts, n, max_results=None, method='orderly'):
+    """
+    以生成器形式逐个产出不等价染色方案的代表元，内存占用与输出规模无关。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 顶点数
+    :param max_results: 最大输出数量，None 表示不限制
+    :param method: 'orderly'（有序生成）、'sweep'（编号 + 访问位图扫描）或 'parallel'（多进程有序生成）
+    :return: 生成器，按字典序产出颜色名元组
+    """
+    counts = counts_in_order(colors, color_counts)
+    if method == 'orderly':
+        source = iter_orderly_indices(counts, inverse_permutations(perm_group, n), n)
+    elif method == 'sweep':
+        source = (coloring for coloring, _ in orbit_sweep(counts, perm_group, n))
+    elif method == 'parallel':
+        # polya.parallel 依赖本模块，在这里延迟导入
+        from polya.parallel import parallel_orderly_indices
+        source = parallel_orderly_indices(counts, perm_group, n)
+    else:
+        raise ValueError(f"未知的枚举方式: {method}")
+    for produced, indices in enumerate(source):
+        if max_results is not None and produced >= max_results:
+            return
+        yield tuple(colors[c] for c in indices)
+
+
+def orderly_representatives(colors, perm_group, color_counts, n, max_results=None):
+    """
+    有序生成不等价染色方案的代表元。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 顶点数
+    :param max_results: 最大输出数量，None 表示不限制
+    :return: 列表，每个元素是一个不等价染色方案（颜色名元组），按字典序排列
+    """
+    return list(iter_representatives(colors, perm_group, color_counts, n, max_results))
@@ -0,0 +1,238 @@
+# polya/group_tables.py
+"""
+把轮换分解形式的群转换为置换表，供枚举代码使用。
+
+按群缓存的表（GroupCache）对只读的 FrozenGroup 以对象本身为键，对普通字典以内容指纹为键，
+群字典被原地修改后不会拿到过期的表。注册表中的群在加载时冻结为 FrozenGroup。
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+# 每个按群缓存的表最多保留的群数
+GROUP_CACHE_SIZE = 64
+
+
+def _cycles_of(p):
+    """:return: 置换 p（p[i] 为 i 的像）的轮换分解列表，包含不动点"""
+    seen = [False] * len(p)
+    cycles = []
+    for start in range(len(p)):
+        if seen[start]:
+            continue
+        cycle = []
+        x = start
+        while not seen[x]:
+            seen[x] = True
+            cycle.append(x)
+            x = p[x]
+        cycles.append(tuple(cycle))
+    return cycles
+
+
+class FrozenGroup(Mapping):
+    """
+    只读的群。底层存储是 |G|×n 的置换矩阵与逆置换矩阵，按 Mapping 接口提供
+    群字典键 -> 轮换分解列表，轮换分解在访问时由矩阵的对应行现算。
+    内容不可修改，按群缓存的表可以直接以它本身为键，不会拿到过期的表。
+    """
+
+    def __init__(self, perms, inverses=None, keys=None):
+        """
+        :param perms: |G|×n 置换矩阵，perms[g][i] 为 i 在第 g 个元素下的像；交出后调用方不应再修改
+        :param inverses: 对应的逆置换矩阵，None 表示由 perms 计算
+        :param keys: 各行对应的群字典键，None 表示 0..|G|-1
+        """
+        perms = np.asarray(perms)
+        if perms.ndim != 2:
+            raise ValueError("置换矩阵必须是二维数组")
+        inverses = np.argsort(perms, axis=1) if inverses is None else np.asarray(inverses)
+        if inverses.shape != perms.shape:
+            raise ValueError("逆置换矩阵的形状与置换矩阵不一致")
+        self.perms = perms.view()
+        self.inverses = inverses.view()
+        self.perms.setflags(write=False)
+        self.inverses.setflags(write=False)
+        self.n = perms.shape[1]
+        self._keys = None if keys is None else tuple(keys)
+        if self._keys is not None and len(self._keys) != len(perms):
+            raise ValueError("群字典键的个数与置换矩阵的行数不一致")
+        self._rows = None
+
+    def _row(self, key):
+        if self._keys is None:
+            if isinstance(key, (int, np.integer)) and not isinstance(key, bool) and 0 <= key < len(self.perms):
+                return int(key)
+            raise KeyError(key)
+        if self._rows is None:
+            self._rows = {k: i for i, k in enumerate(self._keys)}
+        return self._rows[key]
+
+    def __getitem__(self, key):
+        return _cycles_of(self.perms[self._row(key)].tolist())
+
+    def __iter__(self):
+        return iter(range(len(self.perms)) if self._keys is None else self._keys)
+
+    def __len__(self):
+        return len(self.perms)
+
+    def __repr__(self):
+        return f"FrozenGroup(order={len(self)}, n={self.n})"
+
+
+def group_fingerprint(perm_group):
+    """
+    :param perm_group: 字典，表示群
+    :return: 由全部键和轮换分解组成的元组，群的内容变化时随之变化
+    """
+    return tuple((key, tuple(map(tuple, cycle_decomp))) for key, cycle_decomp in perm_group.items())
+
+
+class GroupCache:
+    """
+    按群缓存的 LRU，容量为 GROUP_CACHE_SIZE 个条目，超出时淘汰最久未用的条目。
+    FrozenGroup 不可修改，以 id 为键，条目保存群本身的引用，保证缓存期间 id 不会被复用；
+    普通字典可能被原地修改，以内容指纹（group_fingerprint）为键，修改后自然查不到旧表。
+    """
+
+    def __init__(self, maxsize=GROUP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(perm_group, extra):
+        if isinstance(perm_group, FrozenGroup):
+            return id(perm_group), extra
+        return group_fingerprint(perm_group), extra
+
+    def get(self, perm_group, extra=()):
+        """
+        :param perm_group: 字典或 FrozenGroup，表示群
+        :param extra: 附加键（如 n、颜色元组）
+        :return: 缓存的值，没有则返回 None
+        """
+        key = self._key(perm_group, extra)
+        entry = self._entries.get(key)
+        if entry is None or (isinstance(perm_group, FrozenGroup) and entry[0] is not perm_group):
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, perm_group, value, extra=()):
+        key = self._key(perm_group, extra)
+        self._entries[key] = (perm_group if isinstance(perm_group, FrozenGroup) else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# (群, n) -> 逆置换列表
+_INVERSE_CACHE = GroupCache()
+# (群, n) -> (置换矩阵, 逆置换矩阵)，只用于普通字典；FrozenGroup 直接返回其底层矩阵
+_MATRIX_CACHE = GroupCache()
+
+
+def build_permutation(cycle_decomp, n=20):
+    """
+    从轮换分解构建置换函数及其逆函数。
+    :param cycle_decomp: 轮换分解列表
+    :param n: 顶点数
+    :return: (置换函数p, 逆置换函数pinv)
+    """
+    p = list(range(n))
+    for cycle in cycle_decomp:
+        k = len(cycle)
+        if k == 1:
+            continue
+        for idx in range(k):
+            i = cycle[idx]
+            j = cycle[(idx + 1) % k]
+            p[i] = j
+    pinv = [0] * n
+    for i in range(n):
+        pinv[p[i]] = i
+    return p, pinv
+
+
+def freeze_group(perm_group, n):
+    """
+    :param perm_group: 字典或 FrozenGroup，表示群
+    :param n: 顶点数
+    :return: 内容相同、键相同的 FrozenGroup；已是 FrozenGroup 时原样返回
+    """
+    if isinstance(perm_group, FrozenGroup):
+        if perm_group.n != n:
+            raise ValueError(f"群作用在 {perm_group.n} 个点上，不是 {n} 个")
+        return perm_group
+    perms, inverses = permutation_matrices(perm_group, n)
+    return FrozenGroup(perms, inverses, perm_group.keys())
+
+
+def inverse_permutations(perm_group, n):
+    """
+    群中所有元素的逆置换（按群字典的顺序），每个群只构建一次。
+    染色 x 在元素 g 下的像为 y[i] = x[pinv[i]]。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :return: 元组，每个元素是长度为 n 的逆置换元组
+    """
+    cached = _INVERSE_CACHE.get(perm_group, n)
+    if cached is not None:
+        return cached
+
+    if isinstance(perm_group, FrozenGroup):
+        inverses = tuple(map(tuple, freeze_group(perm_group, n).inverses.tolist()))
+    else:
+        inverses = tuple(tuple(build_permutation(cycle_decomp, n)[1])
+                         for cycle_decomp in perm_group.values())
+    _INVERSE_CACHE.put(perm_group, inverses, n)
+    return inverses
+
+
+def permutation_matrices(perm_group, n):
+    """
+    把群编译为 NumPy 置换矩阵，每个群只编译一次。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :return: (perms, inverses)，形状均为 |G|×n 的只读整数数组，第 g 行为第 g 个元素
+    """
+    if isinstance(perm_group, FrozenGroup):
+        perm_group = freeze_group(perm_group, n)
+        return perm_group.perms, perm_group.inverses
+    cached = _MATRIX_CACHE.get(perm_group, n)
+    if cached is not None:
+        return cached
+
+    inverses = np.array(inverse_permutations(perm_group, n), dtype=np.intp).reshape(-1, n)
+    perms = np.empty_like(inverses)
+    rows = np.arange(len(inverses))[:, None]
+    perms[rows, inverses] = np.arange(n)
+    perms.setflags(write=False)
+    inverses.setflags(write=False)
+    _MATRIX_CACHE.put(perm_group, (perms, inverses), n)
+    return perms, inverses
+
+
+def extend_group(perm_group, n, extra):
+    """
+    添加一个正规化该群的置换 extra（如镜面反射），得到 G ∪ extra·G。
+    新群的前 |G| 个元素与原群相同，其后依次为 extra 与各元素的复合（先作用原元素）。
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param extra: 长度为 n 的置换序列
+    :return: FrozenGroup，扩充后的群，以置换矩阵为底层存储
+    """
+    perms, _ = permutation_matrices(perm_group, n)
+    extra = np.asarray(extra, dtype=np.intp)
+    full = np.concatenate([perms, extra[perms]])
+    if len(np.unique(full, axis=0)) != len(full):
+        raise ValueError("extra 已在群中，无法扩充")
+    return FrozenGroup(full, np.argsort(full, axis=1))
@@ -0,0 +1,105 @@
+# polya/induced.py
+"""
+由顶点置换群导出面、棱、有向棱上的置换群。
+
+每个对象（面、棱、有向棱）用其顶点元组表示。对所有群元素一次性做
+perms[:, 对象顶点]，得到全部像的顶点元组；无向对象先在最后一维排序，
+再把顶点元组编码为 n 进制整数，在已排序的对象键表上 searchsorted 查回下标。
+整个过程没有逐元素、逐对象的线性查找。
+"""
+import numpy as np
+
+from polya.group_tables import FrozenGroup, permutation_matrices
+
+
+def _object_keys(objects, n):
+    """把等长的顶点元组数组 (m, k) 编码为整数键。"""
+    weights = n ** np.arange(objects.shape[-1] - 1, -1, -1, dtype=np.int64)
+    return objects.astype(np.int64) @ weights
+
+
+def induced_permutations(vertex_perms, objects, oriented=False):
+    """
+    计算顶点置换在一组对象上诱导的置换。
+    :param vertex_perms: |G|×n 顶点置换矩阵，vertex_perms[g, i] 为顶点 i 的像
+    :param objects: 列表，每个对象是一个顶点序列（同一列表内长度相同）
+    :param oriented: True 时顶点顺序有意义（如有向棱），False 时按顶点集合比较
+    :return: 形状为 (|G|, 对象数) 的数组，第 g 行第 j 列为对象 j 的像
+    """
+    vertex_perms = np.asarray(vertex_perms, dtype=np.int64)
+    n = vertex_perms.shape[1]
+    objs = np.asarray(objects, dtype=np.int64)
+    if objs.ndim != 2:
+        raise ValueError("对象的顶点数必须相同")
+    if not oriented:
+        objs = np.sort(objs, axis=1)
+    keys = _object_keys(objs, n)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    if len(np.unique(sorted_keys)) != len(keys):
+        raise ValueError("对象列表中有重复")
+
+    images = vertex_perms[:, objs]  # (|G|, m, k)
+    if not oriented:
+        images = np.sort(images, axis=2)
+    image_keys = _object_keys(images, n)
+    pos = np.searchsorted(sorted_keys, image_keys)
+    pos = np.minimum(pos, len(sorted_keys) - 1)
+    if not (sorted_keys[pos] == image_keys).all():
+        raise ValueError("对象集合在群作用下不封闭")
+    return order[pos]
+
+
+def induced_group(perm_group, n, objects, oriented=False):
+    """
+    :param perm_group: 顶点上的群（轮换分解字典）
+    :param n: 顶点数
+    :param objects: 对象的顶点序列列表
+    :param oriented: 对象的顶点顺序是否有意义
+    :return: 对象上的群（FrozenGroup，以置换矩阵为底层存储），行顺序与 perm_group 一致
+    """
+    perms, _ = permutation_matrices(perm_group, n)
+    induced = induced_permutations(perms, objects, oriented).astype(np.intp)
+    return FrozenGroup(induced, np.argsort(induced, axis=1))
+
+
+def oriented_edges(edges):
+    """
+    :param edges: 无向棱列表
+    :return: 列表，每条棱的两个方向 (i, j) 与 (j, i)
+    """
+    result = []
+    for i, j in edges:
+        result.append((i, j))
+        result.append((j, i))
+    return result
+
+
+def faces_from_vertices(vertices, edges):
+    """
+    由凸多面体的顶点坐标和棱求出全部面：过相邻两条棱的平面若为支撑平面，
+    平面上的顶点就构成一个面。
+    :param vertices: 形状为 (n, 3) 的顶点坐标（中心在原点）
+    :param edges: 棱列表
+    :return: 列表，每个面为排序后的顶点元组，按字典序排列
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    neighbors = {}
+    for i, j in edges:
+        neighbors.setdefault(i, []).append(j)
+        neighbors.setdefault(j, []).append(i)
+    faces = set()
+    for center, adjacent in neighbors.items():
+        for a in range(len(adjacent)):
+            for b in range(a + 1, len(adjacent)):
+                normal = np.cross(vertices[adjacent[a]] - vertices[center],
+                                  vertices[adjacent[b]] - vertices[center])
+                if np.linalg.norm(normal) < 1e-9:
+                    continue
+                offset = normal @ vertices[center]
+                if offset < 0:
+                    normal, offset = -normal, -offset
+                heights = vertices @ normal - offset
+                if (heights <= 1e-9).all():
+                    faces.add(tuple(np.flatnonzero(np.abs(heights) <= 1e-9).tolist()))
+    return sorted(faces)
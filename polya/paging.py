@@ -0,0 +1,162 @@
+# polya/paging.py
+"""
+代表元的随机访问：第 k 个代表（unrank）与任意染色所在轨道的编号（rank）。
+
+字典序最小代表的前缀集合在群作用下并不封闭，「以某前缀开头的代表有多少个」
+没有 Burnside 式的闭式公式。这里用一次计数扫描建立检查点索引：每隔 bucket_size 个
+代表记下一个代表（第 0、bucket_size、2·bucket_size…个），保存为 uint8 矩阵。
+之后：
+- unrank(k)：取第 k // bucket_size 个检查点，用 iter_orderly_from 从它往后数
+  k % bucket_size 个；
+- rank(x)：先把 x 规范化为轨道最小代表（O(|G|·n)），二分查找所在的检查点区间，
+  再在区间内数出位置。
+单次访问的代价只与 bucket_size 有关，与页码无关；索引可以写盘复用。
+
+适用范围：这不是按前缀计数的 rank/unrank。建立索引要完整枚举一遍全部代表（单核每秒约十余万个，
+正十二面体顶点 7/7/6 的 221 万个代表约 15 秒），因此只适用于代表总数能枚举一遍的输入；
+对枚举不完的规模（如正十二面体多色的面/棱染色），请改用 Burnside 计数与随机抽样。
+"""
+from bisect import bisect_right
+from itertools import islice
+
+import numpy as np
+
+from polya.artifacts import group_hash
+from polya.burnside import count_orbits
+from polya.canonical import canonical_codes
+from polya.enumeration import counts_in_order, iter_orderly_from, iter_orderly_indices
+from polya.group_tables import inverse_permutations, permutation_matrices
+
+# 默认每个检查点区间包含的代表数
+DEFAULT_BUCKET_SIZE = 4096
+
+
+class OrbitIndex:
+    """字典序代表的检查点索引；建立时完整枚举一遍，只适用于代表能枚举完的输入。"""
+
+    def __init__(self, colors, perm_group, color_counts, n, bucket_size=DEFAULT_BUCKET_SIZE, checkpoints=None):
+        """
+        :param colors: 颜色列表（其顺序决定字典序）
+        :param perm_group: 字典，表示群
+        :param color_counts: dict，颜色->该颜色应使用的次数
+        :param n: 元素个数
+        :param bucket_size: 检查点间隔
+        :param checkpoints: 已有的检查点矩阵（如 load 读入），None 表示枚举全部代表建立（耗时与代表总数成正比）
+        """
+        if bucket_size < 1:
+            raise ValueError("bucket_size 必须为正整数")
+        self.colors = list(colors)
+        self.counts = counts_in_order(colors, color_counts)
+        self.perm_group = perm_group
+        self.n = n
+        self.bucket_size = bucket_size
+        self.total = count_orbits(perm_group, self.counts, n)
+        self._inverse_perms = inverse_permutations(perm_group, n)
+        if checkpoints is None:
+            checkpoints = self._build()
+        checkpoints = np.asarray(checkpoints, dtype=np.uint8).reshape(-1, n)
+        if len(checkpoints) != -(-self.total // bucket_size):
+            raise ValueError("检查点个数与 Burnside 计数不一致")
+        self.checkpoints = checkpoints
+        self._keys = [tuple(row) for row in checkpoints.tolist()]
+
+    def _build(self):
+        if len(self.colors) > 256:
+            raise ValueError("颜色种类过多，无法用 uint8 保存检查点")
+        rows = []
+        scanned = 0
+        for scanned, coloring in enumerate(iter_orderly_indices(self.counts, self._inverse_perms, self.n), 1):
+            if (scanned - 1) % self.bucket_size == 0:
+                rows.append(coloring)
+        if scanned != self.total:
+            raise ValueError(f"扫描得到 {scanned} 个代表，与 Burnside 计数 {self.total} 不一致")
+        return rows
+
+    def __len__(self):
+        return self.total
+
+    def _iter_from(self, k):
+        if not 0 <= k < self.total:
+            raise IndexError(f"编号 {k} 超出范围 [0, {self.total})")
+        bucket, offset = divmod(k, self.bucket_size)
+        source = iter_orderly_from(self.counts, self._inverse_perms, self.n, self._keys[bucket])
+        return islice(source, offset, None)
+
+    def unrank_indices(self, k):
+        """
+        :param k: 代表编号（从 0 开始）
+        :return: 第 k 个代表（颜色下标元组）
+        """
+        return next(self._iter_from(k))
+
+    def unrank(self, k):
+        """
+        :param k: 代表编号（从 0 开始）
+        :return: 第 k 个代表（颜色名元组）
+        """
+        return tuple(self.colors[c] for c in self.unrank_indices(k))
+
+    def page(self, start, stop):
+        """
+        :param start: 起始编号（含）
+        :param stop: 结束编号（不含），超过总数时截断
+        :return: 列表，编号在 [start, stop) 内的代表（颜色名元组）
+        """
+        stop = min(stop, self.total)
+        if start >= stop:
+            return []
+        return [tuple(self.colors[c] for c in coloring) for coloring in islice(self._iter_from(start), stop - start)]
+
+    def rank(self, coloring):
+        """
+        :param coloring: 颜色名序列（任意满足颜色计数的染色，不必是代表）
+        :return: 其轨道代表的编号，即稠密的轨道编号
+        """
+        index = {c: i for i, c in enumerate(self.colors)}
+        codes = [index[c] for c in coloring]
+        if len(codes) != self.n or [codes.count(i) for i in range(len(self.colors))] != self.counts:
+            raise ValueError("染色不满足颜色计数")
+        perms, inverses = permutation_matrices(self.perm_group, self.n)
+        canonical = tuple(canonical_codes(np.array([codes], dtype=np.int64), perms, len(self.colors), inverses)[0].tolist())
+        bucket = bisect_right(self._keys, canonical) - 1
+        source = iter_orderly_from(self.counts, self._inverse_perms, self.n, self._keys[bucket])
+        for offset, rep in enumerate(islice(source, self.bucket_size)):
+            if rep == canonical:
+                return bucket * self.bucket_size + offset
+        raise ValueError("未在索引中找到该轨道，索引与群或颜色计数不匹配")
+
+    def save(self, path):
+        """
+        把检查点写入 npz 格式的文件。通过文件对象写入，文件名按原样使用（numpy.savez 对路径
+        会自动补上 .npz 后缀）。
+        :param path: 文件路径
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, checkpoints=self.checkpoints, counts=np.array(self.counts, dtype=np.int64),
+                     colors=np.array([str(c) for c in self.colors]), bucket_size=self.bucket_size,
+                     total=self.total, order=len(self.perm_group), group_sha256=group_hash(self.perm_group, self.n))
+
+    @classmethod
+    def load(cls, path, colors, perm_group, color_counts, n):
+        """
+        读入 save 写出的索引，并核对颜色顺序、颜色计数、群的内容哈希和代表总数。
+        :param path: 文件路径
+        :param colors: 颜色列表（须与建立索引时的顺序相同）
+        :param perm_group: 字典，表示群
+        :param color_counts: dict，颜色->该颜色应使用的次数
+        :param n: 元素个数
+        :return: OrbitIndex
+        """
+        with np.load(path) as data:
+            if 'group_sha256' not in data.files or 'colors' not in data.files:
+                raise ValueError(f"索引文件 {path} 缺少群哈希或颜色表，需要重新建立")
+            if data['colors'].tolist() != [str(c) for c in colors]:
+                raise ValueError(f"索引文件 {path} 的颜色顺序不一致")
+            if data['counts'].tolist() != counts_in_order(colors, color_counts):
+                raise ValueError(f"索引文件 {path} 与颜色计数不匹配")
+            if int(data['order']) != len(perm_group) or str(data['group_sha256']) != group_hash(perm_group, n):
+                raise ValueError(f"索引文件 {path} 不是在给定的群下建立的")
+            index = cls(colors, perm_group, color_counts, n, int(data['bucket_size']), data['checkpoints'])
+            if index.total != int(data['total']):
+                raise ValueError(f"索引文件 {path} 的代表总数不一致")
+        return index
@@ -0,0 +1,191 @@
+# polya/parallel.py
+"""
+多进程并行枚举代表元。
+
+1. 把搜索空间按前 d 个位置的颜色划分为互不相交的前缀桶（只保留能通过前缀检测的前缀）；
+2. 各桶分发给 ProcessPoolExecutor 中的进程，每个任务在桶内做有序生成，最多产出
+   PARALLEL_CHUNK 个代表，写入共享内存中的一个槽位，只把个数和最后一个代表传回主进程；
+   桶没有枚举完时，从最后一个代表处续接下一块；
+3. 编译好的逆置换矩阵同样放在 multiprocessing.shared_memory 中，子进程按名字挂载读取，
+   而不是随每个任务重新序列化；
+4. 按前缀的字典序依次取回各桶的各块，拼接后与串行输出完全一致。槽位数固定，
+   内存占用与桶的大小和输出规模都无关；生成器提前关闭时取消尚未开始的任务。
+"""
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from polya.enumeration import canonical_prefixes, iter_orderly_from, iter_orderly_indices
+from polya.group_tables import inverse_permutations, permutation_matrices
+
+# 每个进程大约分到的桶数，桶越多负载越均衡
+BUCKETS_PER_WORKER = 8
+
+# 每个任务最多产出的代表数（共享内存中一个槽位的行数）
+PARALLEL_CHUNK = 4096
+
+# 子进程中的群数据与结果槽位：逆置换列表、n、结果数组
+_WORKER_STATE = {}
+
+
+def _init_worker(shm_name, shape, dtype, output_name, output_shape):
+    """子进程初始化：从共享内存读取逆置换矩阵，并挂载结果槽位。"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        inverses = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        _WORKER_STATE['inverse_perms'] = [tuple(row) for row in inverses.tolist()]
+        _WORKER_STATE['n'] = shape[1]
+    finally:
+        shm.close()
+    output = shared_memory.SharedMemory(name=output_name)
+    _WORKER_STATE['output_shm'] = output
+    _WORKER_STATE['output'] = np.ndarray(output_shape, dtype=np.uint8, buffer=output.buf)
+
+
+def _enumerate_chunk(counts, prefix, resume, slot):
+    """
+    子进程任务：枚举以 prefix 开头、在 resume 之后的至多 PARALLEL_CHUNK 个代表，写入第 slot 个槽位。
+    :param counts: 各颜色（按下标）的使用次数
+    :param prefix: 桶的前缀
+    :param resume: 上一块的最后一个代表，None 表示从桶的开头枚举
+    :param slot: 结果槽位的序号
+    :return: (写入的代表数, 最后一个代表)
+    """
+    n = _WORKER_STATE['n']
+    inverse_perms = _WORKER_STATE['inverse_perms']
+    out = _WORKER_STATE['output'][slot]
+    if resume is None:
+        source = iter_orderly_indices(counts, inverse_perms, n, prefix)
+    else:
+        # iter_orderly_from 从 resume 自身开始，跳过它
+        source = islice(iter_orderly_from(counts, inverse_perms, n, resume, len(prefix)), 1, None)
+    size = 0
+    last = None
+    for row in islice(source, len(out)):
+        out[size] = row
+        last = row
+        size += 1
+    return size, last
+
+
+class _Bucket:
+    """一个前缀桶的调度状态。"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.resume = None
+        self.future = None
+        self.slot = None
+        self.ready = deque()  # 已完成、待输出的块：(槽位, 代表数)
+        self.done = False
+
+
+def _choose_depth(counts, inverse_perms, n, workers):
+    """选择前缀长度，使桶数至少为 workers * BUCKETS_PER_WORKER。"""
+    target = workers * BUCKETS_PER_WORKER
+    depth = 1
+    while depth < n and len(canonical_prefixes(counts, inverse_perms, n, depth)) < target:
+        depth += 1
+    return depth
+
+
+def parallel_orderly_indices(counts, perm_group, n, workers=None, prefix_depth=None):
+    """
+    并行有序生成全部字典序最小代表，输出顺序与 iter_orderly_indices 完全相同。
+    :param counts: 各颜色（按下标）的使用次数
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param workers: 进程数，None 表示使用全部 CPU
+    :param prefix_depth: 前缀长度，None 表示自动选择
+    :return: 生成器，按字典序产出颜色下标元组
+    """
+    if len(counts) > 256:
+        raise ValueError("颜色种类过多，无法用 uint8 传输结果")
+    workers = workers or os.cpu_count() or 1
+    inverse_perms = inverse_permutations(perm_group, n)
+    if prefix_depth is None:
+        prefix_depth = _choose_depth(counts, inverse_perms, n, workers)
+    prefixes = canonical_prefixes(counts, inverse_perms, n, prefix_depth)
+    if not prefixes:
+        return
+
+    _, inverses = permutation_matrices(perm_group, n)
+    table = np.ascontiguousarray(inverses, dtype=np.uint8 if n <= 256 else np.int32)
+    window = 2 * workers
+    output_shape = (2 * window, PARALLEL_CHUNK, n)
+    shm = shared_memory.SharedMemory(create=True, size=max(table.nbytes, 1))
+    output_shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(output_shape)), 1))
+    output = None
+    try:
+        np.ndarray(table.shape, dtype=table.dtype, buffer=shm.buf)[:] = table
+        output = np.ndarray(output_shape, dtype=np.uint8, buffer=output_shm.buf)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, table.shape, table.dtype.str,
+                                           output_shm.name, output_shape)) as executor:
+            # 同时处理至多 window 个桶，按前缀顺序输出；槽位在块输出后归还
+            active = deque()
+            tasks = iter(prefixes)
+            free = list(range(output_shape[0] - 1, -1, -1))
+
+            def schedule():
+                # 按前缀顺序给空闲的桶提交下一块；首桶之外的桶不占用最后一个空闲槽位，保证首桶总能继续
+                for i, bucket in enumerate(active):
+                    if not free:
+                        break
+                    if bucket.future is None and not bucket.done and (i == 0 or len(free) > 1):
+                        bucket.slot = free.pop()
+                        bucket.future = executor.submit(_enumerate_chunk, counts, bucket.prefix,
+                                                        bucket.resume, bucket.slot)
+
+            def collect(bucket):
+                size, last = bucket.future.result()
+                bucket.future = None
+                bucket.ready.append((bucket.slot, size))
+                if size < PARALLEL_CHUNK:
+                    bucket.done = True
+                else:
+                    bucket.resume = tuple(last)
+
+            try:
+                while True:
+                    while len(active) < window:
+                        prefix = next(tasks, None)
+                        if prefix is None:
+                            break
+                        active.append(_Bucket(prefix))
+                    if not active:
+                        return
+                    schedule()
+                    head = active[0]
+                    if not head.ready:
+                        running = [bucket.future for bucket in active if bucket.future is not None]
+                        wait(running, return_when=FIRST_COMPLETED)
+                        for bucket in active:
+                            if bucket.future is not None and bucket.future.done():
+                                collect(bucket)
+                        continue
+                    slot, size = head.ready.popleft()
+                    rows = output[slot, :size].tolist()
+                    free.append(slot)
+                    if head.done and not head.ready:
+                        active.popleft()
+                    schedule()
+                    for row in rows:
+                        yield tuple(row)
+            finally:
+                # 生成器提前关闭或出错时，取消尚未开始的块；正在运行的块很小，退出 with 时等待其结束
+                for bucket in active:
+                    if bucket.future is not None:
+                        bucket.future.cancel()
+                executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        # 先释放对共享内存的数组视图，否则无法关闭
+        output = None
+        shm.close()
+        shm.unlink()
+        output_shm.close()
+        output_shm.unlink()
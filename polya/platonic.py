@@ -0,0 +1,240 @@
+# polya/platonic.py
+"""
+不依赖 SageMath，由顶点坐标直接生成正多面体的旋转群。
+
+1. 取顶点 v0 及其最近的顶点 v1，两个生成元为：绕 v0 轴转 2π/度数、绕棱 v0v1 中点轴转 π；
+   二者生成整个旋转群；
+2. 以四舍五入后的矩阵为键做广度优先闭包，得到全部旋转矩阵；
+3. 对每个旋转，把全部顶点一次性旋转后按四舍五入坐标查哈希表，得到顶点置换。
+
+结果写入 polya.artifacts 格式的二进制群文件，之后的加载只需映射文件。
+包内 polya/data 的群文件只由 python -m polya.artifacts 重新生成，运行时生成的写入 CACHE_DIR。
+"""
+import itertools
+import os
+
+import numpy as np
+
+from polya.artifacts import ARTIFACT_DIR, artifact_exists, load_group_artifact, save_group_artifact
+from polya.group_tables import FrozenGroup
+
+# 黄金比例
+PHI = (1 + 5 ** 0.5) / 2
+
+# 坐标与矩阵取整的小数位数
+ROUND_DECIMALS = 6
+
+# 正多面体名 -> 顶点坐标的构造函数（未归一化）
+_VERTEX_BUILDERS = {}
+
+# 运行时生成的群文件写入的缓存目录，可用环境变量 POLYA_CACHE_DIR 指定
+CACHE_DIR = os.environ.get('POLYA_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'polya')
+
+# 正多面体名 -> 旋转群字典（进程内缓存）
+_GROUP_CACHE = {}
+
+
+def _register_vertices(name):
+    def decorator(func):
+        _VERTEX_BUILDERS[name] = func
+        return func
+    return decorator
+
+
+@_register_vertices('tetrahedron')
+def _tetrahedron_vertices():
+    return [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]
+
+
+@_register_vertices('cube')
+def _cube_vertices():
+    return [list(v) for v in itertools.product((-1, 1), repeat=3)]
+
+
+@_register_vertices('octahedron')
+def _octahedron_vertices():
+    return [[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1]]
+
+
+@_register_vertices('dodecahedron')
+def _dodecahedron_vertices():
+    # 与 dodecahedron_group.txt 的编号一致
+    from polya.registry import get_descriptor
+    return get_descriptor('dodecahedron', 'vertex').geometry['vertices']
+
+
+@_register_vertices('icosahedron')
+def _icosahedron_vertices():
+    # 由 icosahedron_group.txt 反推的顶点排列，生成的群与该文件逐元素相同。
+    # 仅凭群无法区分相差一个外自同构的排列，这里取其中一种
+    return [[0, 1, PHI], [0, 1, -PHI], [PHI, 0, -1], [PHI, 0, 1],
+            [-1, -PHI, 0], [-1, PHI, 0], [-PHI, 0, -1], [-PHI, 0, 1],
+            [1, -PHI, 0], [0, -1, PHI], [0, -1, -PHI], [1, PHI, 0]]
+
+
+def platonic_solids():
+    """:return: 列表，支持的正多面体名"""
+    return list(_VERTEX_BUILDERS)
+
+
+def platonic_vertices(name):
+    """
+    :param name: 正多面体名
+    :return: 形状为 (n, 3) 的数组，顶点坐标归一化到单位球面
+    """
+    builder = _VERTEX_BUILDERS.get(name)
+    if builder is None:
+        raise ValueError(f"未知的正多面体: {name}，可用: {', '.join(_VERTEX_BUILDERS)}")
+    vertices = np.asarray(builder(), dtype=np.float64)
+    return vertices / np.linalg.norm(vertices, axis=1)[:, None]
+
+
+def _rounded_keys(points):
+    """把一组点（最后一维为坐标）取整为可哈希的元组，+0.0 消除 -0.0。"""
+    rounded = np.round(points, ROUND_DECIMALS) + 0.0
+    return [tuple(row) for row in rounded.reshape(-1, rounded.shape[-1]).tolist()]
+
+
+def rotation_matrix(axis, angle):
+    """
+    Rodrigues 公式。
+    :param axis: 旋转轴（不必归一化）
+    :param angle: 旋转角（弧度）
+    :return: 3×3 旋转矩阵
+    """
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    k = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+    return np.eye(3) + np.sin(angle) * k + (1 - np.cos(angle)) * (k @ k)
+
+
+def edges_from_vertices(vertices):
+    """
+    :param vertices: 形状为 (n, 3) 的顶点坐标
+    :return: 元组，距离最近的顶点对 (i, j)，i < j，即多面体的棱
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    dist = np.linalg.norm(vertices[:, None, :] - vertices[None, :, :], axis=2)
+    np.fill_diagonal(dist, np.inf)
+    nearest = np.isclose(dist, dist.min())
+    i, j = np.nonzero(np.triu(nearest))
+    return tuple(zip(i.tolist(), j.tolist()))
+
+
+def rotation_generators(vertices):
+    """
+    由顶点坐标构造两个生成元：绕顶点轴的最小旋转与绕棱中点轴的半周旋转。
+    :param vertices: 形状为 (n, 3) 的顶点坐标
+    :return: (a, b) 两个 3×3 矩阵
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    dist = np.linalg.norm(vertices - vertices[0], axis=1)
+    dist[0] = np.inf
+    degree = int(np.isclose(dist, dist.min()).sum())
+    v1 = vertices[int(dist.argmin())]
+    a = rotation_matrix(vertices[0], 2 * np.pi / degree)
+    b = rotation_matrix(vertices[0] + v1, np.pi)
+    return a, b
+
+
+def mirror_matrix(vertices):
+    """
+    过中心、垂直于棱 v0v1 的镜面反射（五种正多面体都以它为对称面）。
+    :param vertices: 形状为 (n, 3) 的顶点坐标
+    :return: 3×3 反射矩阵
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    dist = np.linalg.norm(vertices - vertices[0], axis=1)
+    dist[0] = np.inf
+    u = vertices[0] - vertices[int(dist.argmin())]
+    return np.eye(3) - 2 * np.outer(u, u) / (u @ u)
+
+
+def mirror_permutation(vertices):
+    """
+    :param vertices: 形状为 (n, 3) 的顶点坐标
+    :return: 列表，镜面反射诱导的顶点置换
+    """
+    return rotations_to_permutations([mirror_matrix(vertices)], vertices)[0].tolist()
+
+
+def close_group(generators):
+    """
+    用广度优先搜索求生成元生成的矩阵群。
+    :param generators: 3×3 矩阵列表
+    :return: 列表，全部群元素（第一个为单位矩阵）
+    """
+    identity = np.eye(3)
+    elements = [identity]
+    seen = set(_rounded_keys(identity.reshape(1, 9)))
+    frontier = [identity]
+    while frontier:
+        products = np.einsum('aij,bjk->abik', np.array(frontier), np.array(generators)).reshape(-1, 3, 3)
+        frontier = []
+        for matrix, key in zip(products, _rounded_keys(products.reshape(-1, 9))):
+            if key not in seen:
+                seen.add(key)
+                elements.append(matrix)
+                frontier.append(matrix)
+    return elements
+
+
+def rotations_to_permutations(rotations, vertices):
+    """
+    把旋转（或任意保持顶点集合的正交变换）矩阵转换为顶点置换。
+    :param rotations: 3×3 矩阵列表
+    :param vertices: 形状为 (n, 3) 的顶点坐标
+    :return: 形状为 (|G|, n) 的数组，第 g 行第 i 列为顶点 i 在旋转 g 下的像
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    n = len(vertices)
+    index = {key: i for i, key in enumerate(_rounded_keys(vertices))}
+    if len(index) != n:
+        raise ValueError("顶点坐标取整后有重复")
+    images = np.einsum('gij,vj->gvi', np.array(rotations), vertices)
+    perms = np.empty((len(rotations), n), dtype=np.int64)
+    for pos, key in enumerate(_rounded_keys(images)):
+        target = index.get(key)
+        if target is None:
+            raise ValueError("旋转后的顶点不在顶点集合中，坐标不是正多面体")
+        perms.flat[pos] = target
+    return perms
+
+
+def rotation_group_from_vertices(vertices):
+    """
+    :param vertices: 形状为 (n, 3) 的顶点坐标（中心在原点）
+    :return: 旋转群（FrozenGroup，以置换矩阵为底层存储）
+    """
+    rotations = close_group(rotation_generators(vertices))
+    return FrozenGroup(rotations_to_permutations(rotations, vertices))
+
+
+def platonic_rotation_group(name, cache_dir=CACHE_DIR):
+    """
+    正多面体顶点上的旋转群。先查包内预先生成的群文件（只读），再查 cache_dir；
+    都没有时由顶点坐标生成，并写入 cache_dir，运行时不会改动包内的 polya/data。
+    :param name: 正多面体名
+    :param cache_dir: 运行时生成的群文件的缓存目录，None 表示不写磁盘缓存
+    :return: 旋转群（FrozenGroup）
+    """
+    cached = _GROUP_CACHE.get(name)
+    if cached is not None:
+        return cached
+    directories = [ARTIFACT_DIR] + ([cache_dir] if cache_dir else [])
+    for directory in directories:
+        prefix = os.path.join(directory, f"{name}_vertex")
+        if artifact_exists(prefix):
+            perm_group = load_group_artifact(prefix).to_perm_group()
+            break
+    else:
+        vertices = platonic_vertices(name)
+        perm_group = rotation_group_from_vertices(vertices)
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                save_group_artifact(perm_group, len(vertices), os.path.join(cache_dir, f"{name}_vertex"))
+            except OSError as e:
+                print(f"警告：无法写入群文件缓存 {cache_dir}：{e}")
+    _GROUP_CACHE[name] = perm_group
+    return perm_group
@@ -0,0 +1,301 @@
+# polya/power_group.py
+"""
+颜色可互换时的计数与枚举（de Bruijn 的幂群计数）。
+
+群 G 作用在位置上，颜色置换群 H 作用在颜色上，(g, h) 把染色 f 变为 h∘f∘g⁻¹。
+颜色计数固定为 c 时，H 中只有保持 c 的元素（H_c）会把合法染色映到合法染色；
+「计数为 c 的某个颜色重命名」的染色在 G×H 下的轨道，与计数恰为 c 的染色在 G×H_c 下的
+轨道一一对应，因此只需处理 H_c。
+
+计数：(g, h) 固定 f 当且仅当 h(f(v)) = f(g(v))。g 的一个长度为 l 的轮换只能染在
+h 的一个长度 d 整除 l 的轮换 D 上：起点颜色有 d 种取法，D 中每种颜色各用 l/d 次。
+所以固定数只依赖 g 的轮换型和 h 的「带计数轮换型」（各轮换的长度及其颜色的公共计数），
+在两者的分类上做一次与普通 Burnside 同规模的求和即可。
+
+H 为全部颜色的对称群时，H_c 就是「计数相同的颜色」各块对称群的直积，不需要列出 k! 个置换：
+带计数轮换型的分布由各块大小的分拆直接写出（见 stabilizer_signatures）。
+H 由生成元给出时保持 Schreier–Sims 稳定子链表示，H_c 由剪枝搜索逐个产出。
+
+枚举：先有序生成 G 下的字典序最小代表 x，x 是 G×H_c 轨道的字典序最小代表当且仅当
+它不大于每个 (h·x)∘g。对称群时对每个位置像直接写出 H_c 下的最小重命名（各块内按首次
+出现的顺序换成最小的未用颜色），代价与 |H_c| 无关；一般的 H_c 则逐个 h 批量规范化后比较。
+"""
+from collections import Counter
+from functools import lru_cache
+from itertools import islice, permutations, product
+from math import comb, factorial
+
+import numpy as np
+
+from polya.burnside import cycle_type_classes
+from polya.canonical import canonical_codes, lex_compare
+from polya.enumeration import counts_in_order, iter_orderly_indices
+from polya.group_tables import inverse_permutations, permutation_matrices
+from polya.schreier_sims import PermutationGroup, cycle_decomposition
+
+# 每批做颜色置换检测的代表数
+POWER_CHUNK = 1024
+
+
+def build_color_group(colors, generators=None):
+    """
+    :param colors: 颜色列表
+    :param generators: None 表示全部颜色的对称群；否则为生成元列表，每个生成元是
+                       dict（颜色 -> 颜色，未列出的颜色不动）或按 colors 顺序给出的像的颜色名序列
+    :return: None 表示对称群（生成元恰好生成整个对称群时也返回 None）；
+             否则为颜色下标上的 PermutationGroup，以稳定子链表示，不展开元素
+    """
+    if generators is None:
+        return None
+    k = len(colors)
+    index = {c: i for i, c in enumerate(colors)}
+    perms = []
+    for gen in generators:
+        if isinstance(gen, dict):
+            images = [gen.get(c, c) for c in colors]
+        else:
+            images = list(gen)
+        if len(images) != k or any(c not in index for c in images):
+            raise ValueError(f"颜色置换 {gen} 与颜色列表 {colors} 不匹配")
+        perms.append(tuple(index[c] for c in images))
+    group = PermutationGroup(perms, k)
+    return None if group.order() == factorial(k) else group
+
+
+def count_blocks(counts):
+    """
+    :param counts: 各颜色（按下标）的使用次数
+    :return: 列表，每个元素是计数相同的颜色下标元组（升序）；对称群的计数稳定子就是各块对称群的直积
+    """
+    blocks = {}
+    for i, c in enumerate(counts):
+        blocks.setdefault(c, []).append(i)
+    return [tuple(block) for block in blocks.values()]
+
+
+def count_stabilizer(color_group, counts):
+    """
+    逐个产出保持颜色计数的颜色置换（H_c），不保存列表。
+    :param color_group: build_color_group 的结果，None 表示对称群
+    :param counts: 各颜色（按下标）的使用次数
+    :return: 生成器，产出置换元组 p，p[i] 为颜色 i 的像
+    """
+    if color_group is not None:
+        yield from color_group.iter_preserving(counts)
+        return
+    blocks = count_blocks(counts)
+    for images in product(*(permutations(block) for block in blocks)):
+        p = [0] * len(counts)
+        for block, image in zip(blocks, images):
+            for i, j in zip(block, image):
+                p[i] = j
+        yield tuple(p)
+
+
+def _partitions(m, largest=None):
+    """按非增顺序产出 m 的全部分拆。"""
+    if m == 0:
+        yield ()
+        return
+    for part in range(min(m, largest or m), 0, -1):
+        for rest in _partitions(m - part, part):
+            yield (part,) + rest
+
+
+def _symmetric_cycle_types(m):
+    """:return: 列表，(轮换长度元组, Sym(m) 中该轮换型的元素个数)"""
+    result = []
+    for lengths in _partitions(m):
+        centralizer = 1
+        for length, mult in Counter(lengths).items():
+            centralizer *= length ** mult * factorial(mult)
+        result.append((lengths, factorial(m) // centralizer))
+    return result
+
+
+def stabilizer_signatures(color_group, counts):
+    """
+    :param color_group: build_color_group 的结果，None 表示对称群
+    :param counts: 各颜色（按下标）的使用次数
+    :return: Counter，带计数轮换型（见 color_cycle_signature）-> H_c 中的元素个数
+    """
+    if color_group is not None:
+        return Counter(color_cycle_signature(p, counts) for p in count_stabilizer(color_group, counts))
+    # 对称群：各块独立地取 Sym(块大小) 的轮换型，组合数只与各块大小的分拆数有关
+    per_block = [[(tuple((length, counts[block[0]]) for length in lengths), mult)
+                  for lengths, mult in _symmetric_cycle_types(len(block))]
+                 for block in count_blocks(counts)]
+    signatures = Counter()
+    for choice in product(*per_block):
+        mult = 1
+        pairs = []
+        for block_pairs, block_mult in choice:
+            pairs.extend(block_pairs)
+            mult *= block_mult
+        signatures[tuple(sorted(pairs, reverse=True))] += mult
+    return signatures
+
+
+def color_cycle_signature(p, counts):
+    """
+    :param p: 颜色置换（须保持 counts）
+    :param counts: 各颜色的使用次数
+    :return: 元组，((轮换长度, 轮换中颜色的计数), ...)，按降序排列
+    """
+    return tuple(sorted(((len(cycle), counts[cycle[0]]) for cycle in cycle_decomposition(p)), reverse=True))
+
+
+def _power_fixed_kernel(ctype, signature):
+    """
+    计算轮换型为 ctype 的位置置换与带计数轮换型为 signature 的颜色置换共同固定的染色数。
+    对颜色轮换逐个做动态规划，状态是各长度「尚未分配的位置轮换个数」。
+    :param ctype: 位置置换的轮换型
+    :param signature: 颜色置换的带计数轮换型
+    :return: 整数
+    """
+    sizes = [size for size, _ in ctype]
+    table = {tuple(mult for _, mult in ctype): 1}
+    for d, part in signature:
+        if part == 0:
+            continue
+        new_table = {}
+        for remaining, ways in table.items():
+            # 给这个颜色轮换挑选长度为 d 的倍数的位置轮换，恰好用掉每种颜色 part 次
+            stack = [(0, part, remaining, ways)]
+            while stack:
+                idx, left, rest, w = stack.pop()
+                if left == 0:
+                    new_table[rest] = new_table.get(rest, 0) + w
+                    continue
+                if idx == len(sizes):
+                    continue
+                stack.append((idx + 1, left, rest, w))
+                size = sizes[idx]
+                if size % d:
+                    continue
+                units = size // d
+                for j in range(1, min(rest[idx], left // units) + 1):
+                    taken = rest[:idx] + (rest[idx] - j,) + rest[idx + 1:]
+                    stack.append((idx + 1, left - j * units, taken, w * comb(rest[idx], j) * d ** j))
+        table = new_table
+    return table.get((0,) * len(sizes), 0)
+
+
+@lru_cache(maxsize=65536)
+def _cached_power_fixed(ctype, signature):
+    return _power_fixed_kernel(ctype, signature)
+
+
+def count_power_orbits(perm_group, counts, n, color_group=None):
+    """
+    在位置群 × 颜色置换群下不等价的染色方案数。
+    :param perm_group: 字典，表示位置上的群
+    :param counts: 各颜色（按下标）的使用次数
+    :param n: 元素个数
+    :param color_group: build_color_group 的结果，None 表示对称群
+    :return: 整数
+    """
+    if sum(counts) != n or any(c < 0 for c in counts):
+        return 0
+    signatures = stabilizer_signatures(color_group, counts)
+    total = sum(g_mult * h_mult * _cached_power_fixed(ctype, signature)
+                for ctype, g_mult in cycle_type_classes(perm_group, n)
+                for signature, h_mult in signatures.items())
+    result, rest = divmod(total, len(perm_group) * sum(signatures.values()))
+    if rest:
+        raise ValueError("固定染色数之和不能被群阶整除，输入的置换集合不是群")
+    return result
+
+
+def _block_minima(images, counts):
+    """
+    对称群时 H_c 是各块对称群的直积，染色在 H_c 下的字典序最小重命名可以直接写出：
+    从左到右扫描，每块中的颜色按首次出现的顺序依次换成该块中最小的未用颜色。
+    :param images: 形状为 (R, n) 的颜色下标数组
+    :param counts: 各颜色（按下标）的使用次数
+    :return: 形状为 (R, n) 的数组，各行在 H_c 下的最小重命名
+    """
+    blocks = count_blocks(counts)
+    block_of = np.empty(len(counts), dtype=np.intp)
+    members = np.zeros((len(blocks), max(len(block) for block in blocks)), dtype=np.int16)
+    for b, block in enumerate(blocks):
+        block_of[list(block)] = b
+        members[b, :len(block)] = block
+    rows = np.arange(len(images))
+    mapping = np.full((len(images), len(counts)), -1, dtype=np.int16)
+    used = np.zeros((len(images), len(blocks)), dtype=np.intp)
+    result = np.empty(images.shape, dtype=np.int16)
+    for j in range(images.shape[1]):
+        c = images[:, j]
+        mapped = mapping[rows, c]
+        new = np.flatnonzero(mapped < 0)
+        if len(new):
+            b = block_of[c[new]]
+            mapped[new] = members[b, used[new, b]]
+            mapping[new, c[new]] = mapped[new]
+            used[new, b] += 1
+        result[:, j] = mapped
+    return result
+
+
+def _relabel_minima(codes, counts, color_group, perms, inverses):
+    """
+    :param codes: 形状为 (B, n) 的颜色下标数组（均为 G 下的字典序最小代表）
+    :param counts: 各颜色（按下标）的使用次数
+    :param color_group: build_color_group 的结果，None 表示对称群
+    :param perms: 位置群的置换矩阵
+    :param inverses: 对应的逆置换矩阵
+    :return: 布尔数组，每个染色是否为其 G×H_c 轨道的字典序最小者
+    """
+    if color_group is None:
+        # 对全部位置像直接求 H_c 下的最小重命名，代价 O(|G|·n)，与 |H_c| 无关
+        images = codes[:, inverses]  # (B, |G|, n)
+        minima = _block_minima(images.reshape(-1, codes.shape[1]), counts).reshape(images.shape)
+        return (lex_compare(minima, codes[:, None, :]) >= 0).all(axis=1)
+    identity = tuple(range(len(counts)))
+    keep = np.ones(len(codes), dtype=bool)
+    for relabel in count_stabilizer(color_group, counts):
+        if relabel != identity:
+            relabeled = np.asarray(relabel, dtype=codes.dtype)[codes]
+            keep &= lex_compare(canonical_codes(relabeled, perms, len(counts), inverses), codes) >= 0
+    return keep
+
+
+def iter_power_indices(counts, perm_group, n, color_group=None):
+    """
+    :param counts: 各颜色（按下标）的使用次数
+    :param perm_group: 字典，表示位置上的群
+    :param n: 元素个数
+    :param color_group: build_color_group 的结果，None 表示对称群
+    :return: 生成器，按字典序产出 G×H 轨道的字典序最小代表（颜色下标元组）
+    """
+    perms, inverses = permutation_matrices(perm_group, n)
+    inverses = np.asarray(inverses)
+    source = iter_orderly_indices(counts, inverse_permutations(perm_group, n), n)
+    while True:
+        chunk = list(islice(source, POWER_CHUNK))
+        if not chunk:
+            return
+        codes = np.array(chunk, dtype=np.uint8)
+        for coloring, keep in zip(chunk, _relabel_minima(codes, counts, color_group, perms, inverses)):
+            if keep:
+                yield coloring
+
+
+def iter_power_representatives(colors, perm_group, color_counts, n, color_group=None, max_results=None):
+    """
+    逐个产出颜色可互换时不等价染色方案的代表元。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示位置上的群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 元素个数
+    :param color_group: build_color_group 的结果，None 表示对称群
+    :param max_results: 最大输出数量，None 表示不限制
+    :return: 生成器，按字典序产出颜色名元组
+    """
+    counts = counts_in_order(colors, color_counts)
+    source = iter_power_indices(counts, perm_group, n, color_group)
+    if max_results is not None:
+        source = islice(source, max_results)
+    for indices in source:
+        yield tuple(colors[c] for c in indices)
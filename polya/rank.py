@@ -0,0 +1,241 @@
+# polya/rank.py
+"""
+多重集合排列的字典序编号（rank/unrank）与基于访问位图的轨道扫描。
+
+颜色计数固定时，所有合法染色按字典序排成 0..N-1（N 为多重组合数）。
+扫描时用一个 N 位的位图记录已经覆盖的染色：每遇到一个未访问的编号，
+它必然是所在轨道的字典序最小代表；把它在群作用下的全部像标记为已访问，
+同时得到轨道大小。位图放不进内存时改用内存映射文件。
+"""
+import os
+import tempfile
+from math import factorial
+
+import numpy as np
+
+from polya.group_tables import permutation_matrices
+
+# 位图默认允许占用的最大内存（字节），超过则使用内存映射文件
+DEFAULT_BITMAP_MEMORY = 256 * 1024 * 1024
+
+# _FIRST_ZERO_BIT[b]：字节 b 中最低的 0 位的位置（b=0xFF 时为 8）
+_FIRST_ZERO_BIT = np.array([next((i for i in range(8) if not (b >> i) & 1), 8) for b in range(256)],
+                           dtype=np.int64)
+
+# 每次扫描位图的字节数
+_SCAN_BLOCK = 1 << 20
+
+
+def multiset_count(counts):
+    """
+    多重组合数 n! / (c1! c2! ... ck!)。
+    :param counts: 各颜色的使用次数
+    :return: 整数
+    """
+    total = factorial(sum(counts))
+    for c in counts:
+        total //= factorial(c)
+    return total
+
+
+def rank_coloring(indices, counts):
+    """
+    计算染色在所有同计数染色中的字典序编号。
+    :param indices: 颜色下标序列
+    :param counts: 各颜色的使用次数
+    :return: 整数，0 <= rank < multiset_count(counts)
+    """
+    remaining = list(counts)
+    left = sum(remaining)
+    block = multiset_count(remaining)
+    rank = 0
+    for c in indices:
+        if remaining[c] <= 0:
+            raise ValueError("染色与颜色计数不一致")
+        # 以颜色 d 开头的后缀数为 block * remaining[d] / left
+        rank += block * sum(remaining[:c]) // left
+        block = block * remaining[c] // left
+        remaining[c] -= 1
+        left -= 1
+    return rank
+
+
+def unrank_coloring(rank, counts):
+    """
+    由字典序编号还原染色。
+    :param rank: 编号
+    :param counts: 各颜色的使用次数
+    :return: 元组，颜色下标序列
+    """
+    remaining = list(counts)
+    left = sum(remaining)
+    block = multiset_count(remaining)
+    if not 0 <= rank < block:
+        raise ValueError(f"编号超出范围 [0, {block})")
+    coloring = []
+    for _ in range(left):
+        for c, r in enumerate(remaining):
+            if r == 0:
+                continue
+            sub = block * r // left
+            if rank < sub:
+                coloring.append(c)
+                block = sub
+                remaining[c] -= 1
+                left -= 1
+                break
+            rank -= sub
+    return tuple(coloring)
+
+
+def rank_many(codes, counts):
+    """
+    批量计算字典序编号（要求 多重组合数 * n 不超过 int64）。
+    :param codes: 形状为 (B, n) 的颜色下标数组
+    :param counts: 各颜色的使用次数
+    :return: 长度为 B 的 int64 数组
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    rows, n = codes.shape
+    k = len(counts)
+    if multiset_count(counts) * max(n, 1) >= 2 ** 63:
+        raise ValueError("染色数过多，编号超出 int64 范围")
+    remaining = np.tile(np.asarray(counts, dtype=np.int64), (rows, 1))
+    block = np.full(rows, multiset_count(counts), dtype=np.int64)
+    ranks = np.zeros(rows, dtype=np.int64)
+    row_idx = np.arange(rows)
+    colors = np.arange(k)
+    for i in range(n):
+        c = codes[:, i]
+        left = n - i
+        smaller = (remaining * (colors[None, :] < c[:, None])).sum(axis=1)
+        ranks += block * smaller // left
+        block = block * remaining[row_idx, c] // left
+        remaining[row_idx, c] -= 1
+    return ranks
+
+
+def unrank_many(ranks, counts):
+    """
+    批量由字典序编号还原染色（要求 多重组合数 * n 不超过 int64），是 rank_many 的逆。
+    :param ranks: 整数数组
+    :param counts: 各颜色的使用次数
+    :return: 形状为 (B, n) 的 uint8 数组
+    """
+    ranks = np.array(ranks, dtype=np.int64).ravel()
+    rows = len(ranks)
+    n = sum(counts)
+    total = multiset_count(counts)
+    if total * max(n, 1) >= 2 ** 63:
+        raise ValueError("染色数过多，编号超出 int64 范围")
+    if rows and (ranks.min() < 0 or ranks.max() >= total):
+        raise ValueError(f"编号超出范围 [0, {total})")
+    remaining = np.tile(np.asarray(counts, dtype=np.int64), (rows, 1))
+    block = np.full(rows, total, dtype=np.int64)
+    codes = np.empty((rows, n), dtype=np.uint8)
+    row_idx = np.arange(rows)
+    for i in range(n):
+        left = n - i
+        # 以颜色 c 开头的后缀数为 block * remaining[c] / left，按累计和定位编号落在哪种颜色
+        sub = block[:, None] * remaining // left
+        upper = np.cumsum(sub, axis=1)
+        c = (upper <= ranks[:, None]).sum(axis=1)
+        ranks -= upper[row_idx, c] - sub[row_idx, c]
+        block = sub[row_idx, c]
+        remaining[row_idx, c] -= 1
+        codes[:, i] = c
+    return codes
+
+
+class VisitedBitmap:
+    """N 位的访问位图，放不进内存时使用内存映射文件。"""
+
+    def __init__(self, size, path=None, max_memory=DEFAULT_BITMAP_MEMORY):
+        """
+        :param size: 位数
+        :param path: 内存映射文件路径，None 表示需要时自动创建临时文件
+        :param max_memory: 允许放在内存中的最大字节数
+        """
+        self.size = size
+        n_bytes = (size + 7) // 8
+        self._temp_path = None
+        if path is None and n_bytes <= max_memory:
+            self.bits = np.zeros(n_bytes, dtype=np.uint8)
+        else:
+            if path is None:
+                fd, path = tempfile.mkstemp(suffix='.bitmap')
+                os.close(fd)
+                self._temp_path = path
+            self.bits = np.memmap(path, dtype=np.uint8, mode='w+', shape=(max(n_bytes, 1),))
+        # 末尾多出的位预先置 1，避免被当成未访问
+        extra = n_bytes * 8 - size
+        if extra:
+            self.bits[-1] = (0xFF << (8 - extra)) & 0xFF
+
+    def mark(self, ranks):
+        """
+        标记一组编号为已访问。
+        :param ranks: 整数数组
+        """
+        ranks = np.asarray(ranks, dtype=np.int64)
+        np.bitwise_or.at(self.bits, ranks >> 3, (1 << (ranks & 7)).astype(np.uint8))
+
+    def is_marked(self, rank):
+        return bool((self.bits[rank >> 3] >> (rank & 7)) & 1)
+
+    def next_unmarked(self, start):
+        """
+        :param start: 起始编号
+        :return: 不小于 start 的第一个未访问编号，没有则返回 None
+        """
+        byte = start >> 3
+        # 起始字节中 start 之前的位视为已访问
+        head = int(self.bits[byte]) | ((1 << (start & 7)) - 1) if byte < len(self.bits) else 0xFF
+        if head != 0xFF:
+            return byte * 8 + int(_FIRST_ZERO_BIT[head])
+        byte += 1
+        while byte < len(self.bits):
+            block = self.bits[byte:byte + _SCAN_BLOCK]
+            open_bytes = np.flatnonzero(block != 0xFF)
+            if len(open_bytes):
+                pos = byte + int(open_bytes[0])
+                return pos * 8 + int(_FIRST_ZERO_BIT[self.bits[pos]])
+            byte += len(block)
+        return None
+
+    def close(self):
+        """释放位图，删除自动创建的临时文件。"""
+        if isinstance(self.bits, np.memmap):
+            self.bits._mmap.close()
+        self.bits = None
+        if self._temp_path is not None:
+            os.remove(self._temp_path)
+            self._temp_path = None
+
+
+def orbit_sweep(counts, perm_group, n, bitmap_path=None, max_memory=DEFAULT_BITMAP_MEMORY):
+    """
+    按字典序扫描全部同计数染色，每个轨道产出一次最小代表及其轨道大小。
+    :param counts: 各颜色（按下标）的使用次数
+    :param perm_group: 字典，表示群
+    :param n: 顶点数
+    :param bitmap_path: 位图的内存映射文件路径，None 表示按需使用临时文件
+    :param max_memory: 位图允许放在内存中的最大字节数
+    :return: 生成器，产出 (颜色下标元组, 轨道大小)
+    """
+    if sum(counts) != n:
+        return
+    _, inverses = permutation_matrices(perm_group, n)
+    total = multiset_count(counts)
+    bitmap = VisitedBitmap(total, bitmap_path, max_memory)
+    try:
+        rank = bitmap.next_unmarked(0)
+        while rank is not None:
+            coloring = unrank_coloring(rank, counts)
+            images = np.asarray(coloring, dtype=np.int64)[inverses]
+            orbit = np.unique(rank_many(images, counts))
+            bitmap.mark(orbit)
+            yield coloring, len(orbit)
+            rank = bitmap.next_unmarked(rank + 1)
+    finally:
+        bitmap.close()
@@ -0,0 +1,355 @@
+# polya/registry.py
+"""
+多面体描述符注册表。
+
+每个 (多面体, 元素类型) 对应一个描述符，记录元素个数 n、对称群、邻接关系和几何数据。
+群、邻接和几何都在第一次访问时加载并保存在描述符上，之后同一进程内的所有调用
+拿到的都是同一个只读的群（FrozenGroup），因此 polya 中按群缓存的置换矩阵、轮换型分类等只编译一次。
+"""
+import ast
+import json
+import os
+
+from polya.burnside import cycle_type_classes
+from polya.group_tables import FrozenGroup, extend_group, freeze_group, inverse_permutations, permutation_matrices
+
+# 仓库根目录，内置数据文件的路径都相对于它
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (多面体名, 元素类型) -> PolyhedronDescriptor
+_REGISTRY = {}
+
+# 对称模式：'rotation' 只用旋转群，'full' 为旋转加反射的完整对称群
+SYMMETRY_MODES = ('rotation', 'full')
+
+
+def load_cycle_group(file_path, n):
+    """
+    读取每行一个轮换分解的群文件，并补齐不动点。
+    :param file_path: 文件路径
+    :param n: 元素个数
+    :return: 字典，序号 -> 轮换分解列表
+    """
+    perm_group = {}
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            cycle_decomp = [tuple(cycle) for cycle in ast.literal_eval(line)]
+            covered = {v for cycle in cycle_decomp for v in cycle}
+            perm_group[len(perm_group)] = cycle_decomp + [(v,) for v in range(n) if v not in covered]
+    return perm_group
+
+
+def adjacency_from_faces(faces):
+    """
+    由面的顶点集合推出棱：两个顶点恰好同属两个面时相邻。
+    :param faces: 列表，每个元素是一个面的顶点序列
+    :return: 元组，每个元素是 (i, j)，i < j
+    """
+    shared = {}
+    for face in faces:
+        face = sorted(face)
+        for a in range(len(face)):
+            for b in range(a + 1, len(face)):
+                pair = (face[a], face[b])
+                shared[pair] = shared.get(pair, 0) + 1
+    return tuple(sorted(pair for pair, count in shared.items() if count >= 2))
+
+
+class PolyhedronDescriptor:
+    """一个 (多面体, 元素类型) 的描述：元素个数、对称群、邻接关系和几何数据。"""
+
+    def __init__(self, name, element_type, n, group_loader, adjacency_loader=None, geometry_loader=None,
+                 output_dir="result", mirror_loader=None):
+        """
+        :param name: 多面体名，如 'dodecahedron'
+        :param element_type: 被染色的元素类型，如 'vertex'
+        :param n: 元素个数
+        :param group_loader: 无参函数，返回旋转群（轮换分解形式的群字典或 FrozenGroup）
+        :param adjacency_loader: 无参函数，返回 (i, j) 棱列表；None 表示未知
+        :param geometry_loader: 无参函数，返回几何数据字典；None 表示未知
+        :param output_dir: 保存染色方案的默认目录
+        :param mirror_loader: 无参函数，返回一个镜面反射诱导的置换；None 表示不支持完整对称群
+        """
+        self.name = name
+        self.element_type = element_type
+        self.n = n
+        self.output_dir = output_dir
+        self._group_loader = group_loader
+        self._adjacency_loader = adjacency_loader
+        self._geometry_loader = geometry_loader
+        self._mirror_loader = mirror_loader
+        self._group = None
+        self._adjacency = None
+        self._geometry = None
+        self._mirror = None
+        self._full_group = None
+
+    def __repr__(self):
+        return f"PolyhedronDescriptor({self.name!r}, {self.element_type!r}, n={self.n})"
+
+    @property
+    def key(self):
+        return self.name, self.element_type
+
+    @property
+    def group(self):
+        """对称群，只加载一次；登记时冻结为 FrozenGroup，之后不能原地修改。"""
+        if self._group is None:
+            group = self._group_loader()
+            if not isinstance(group, FrozenGroup):
+                for idx, cycle_decomp in group.items():
+                    if sum(len(cycle) for cycle in cycle_decomp) != self.n:
+                        raise ValueError(f"{self.name} 的群元素 {idx} 没有覆盖全部 {self.n} 个{self.element_type}")
+            elif group.n != self.n:
+                raise ValueError(f"{self.name} 的群作用在 {group.n} 个点上，不是 {self.n} 个{self.element_type}")
+            self._group = freeze_group(group, self.n)
+        return self._group
+
+    @property
+    def adjacency(self):
+        """元素之间的邻接关系，(i, j) 元组的元组；未知时为 None。"""
+        if self._adjacency is None and self._adjacency_loader is not None:
+            self._adjacency = tuple(tuple(edge) for edge in self._adjacency_loader())
+        return self._adjacency
+
+    @property
+    def geometry(self):
+        """几何数据字典（如 'vertices'、'faces'）；未知时为 None。"""
+        if self._geometry is None and self._geometry_loader is not None:
+            self._geometry = self._geometry_loader()
+        return self._geometry
+
+    @property
+    def mirror(self):
+        """一个镜面反射诱导的置换（列表）；未知时为 None。"""
+        if self._mirror is None and self._mirror_loader is not None:
+            self._mirror = list(self._mirror_loader())
+        return self._mirror
+
+    @property
+    def full_group(self):
+        """完整对称群（旋转加反射），前 |旋转群| 个元素为旋转，其余为反射类元素。"""
+        if self._full_group is None:
+            if self.mirror is None:
+                raise ValueError(f"{self.name}/{self.element_type} 没有镜面反射数据，不支持完整对称群")
+            self._full_group = extend_group(self.group, self.n, self.mirror)
+        return self._full_group
+
+    def symmetry_group(self, symmetry="rotation"):
+        """
+        :param symmetry: 'rotation' 或 'full'
+        :return: 对应的群（FrozenGroup）
+        """
+        if symmetry == "rotation":
+            return self.group
+        if symmetry == "full":
+            return self.full_group
+        raise ValueError(f"未知的对称模式: {symmetry}，可用: {', '.join(SYMMETRY_MODES)}")
+
+    def warm(self, symmetry="rotation"):
+        """预先加载群并编译逆置换、置换矩阵和轮换型分类。"""
+        group = self.symmetry_group(symmetry)
+        inverse_permutations(group, self.n)
+        permutation_matrices(group, self.n)
+        cycle_type_classes(group, self.n)
+        return self
+
+
+def register_polyhedron(descriptor, replace=False):
+    """
+    注册描述符。
+    :param descriptor: PolyhedronDescriptor
+    :param replace: 已存在同名描述符时是否替换
+    :return: descriptor
+    """
+    if descriptor.key in _REGISTRY and not replace:
+        raise ValueError(f"{descriptor.key} 已注册")
+    _REGISTRY[descriptor.key] = descriptor
+    return descriptor
+
+
+def get_descriptor(name, element_type="vertex"):
+    """
+    :param name: 多面体名
+    :param element_type: 元素类型
+    :return: PolyhedronDescriptor
+    """
+    descriptor = _REGISTRY.get((name, element_type))
+    if descriptor is None:
+        known = ", ".join(f"{a}/{b}" for a, b in sorted(_REGISTRY))
+        raise ValueError(f"未注册的多面体 {name}/{element_type}，可用: {known}")
+    return descriptor
+
+
+def registered_polyhedra():
+    """:return: 列表，已注册的 (多面体名, 元素类型)"""
+    return sorted(_REGISTRY)
+
+
+# ----------------------------------------------------------------------
+# 内置多面体
+# ----------------------------------------------------------------------
+# 文本群文件：(多面体名, 元素类型) -> (路径, 元素个数)，用于生成 polya/data 中的二进制群文件
+TEXT_GROUP_SOURCES = {
+    ('dodecahedron', 'vertex'): (os.path.join(ROOT_DIR, 'dodecahedron', 'dodecahedron_group.txt'), 20),
+    ('icosahedron', 'vertex'): (os.path.join(ROOT_DIR, 'icosahedron', 'icosahedron_group.txt'), 12),
+}
+
+
+def _builtin_group_loader(name, element_type):
+    """优先映射 polya/data 中的二进制群文件，没有时退回解析文本群文件。"""
+    def load():
+        from polya.artifacts import artifact_exists, artifact_prefix, load_group_artifact
+
+        prefix = artifact_prefix(name, element_type)
+        if artifact_exists(prefix):
+            return load_group_artifact(prefix).to_perm_group()
+        return load_cycle_group(*TEXT_GROUP_SOURCES[(name, element_type)])
+    return load
+
+
+def _load_dodecahedron_json():
+    with open(os.path.join(ROOT_DIR, 'dodecahedron', 'dodeca_sage.json'), 'r') as f:
+        data = json.load(f)
+    # JSON 中的顶点坐标和面与群文件的编号一致；其中的邻接表有误，改由面推出
+    return {'vertices': data['DODECAHEDRON_VERTICES'], 'faces': data['DODECAHEDRON_FACES']}
+
+
+register_polyhedron(PolyhedronDescriptor(
+    'dodecahedron', 'vertex', 20,
+    group_loader=_builtin_group_loader('dodecahedron', 'vertex'),
+    adjacency_loader=lambda: adjacency_from_faces(_load_dodecahedron_json()['faces']),
+    geometry_loader=_load_dodecahedron_json,
+    output_dir="dodecahedron",
+    mirror_loader=lambda: _platonic_mirror('dodecahedron'),
+))
+
+register_polyhedron(PolyhedronDescriptor(
+    'icosahedron', 'vertex', 12,
+    group_loader=_builtin_group_loader('icosahedron', 'vertex'),
+    adjacency_loader=lambda: _platonic_edges('icosahedron'),
+    geometry_loader=lambda: _platonic_geometry('icosahedron'),
+    output_dir="result",
+    mirror_loader=lambda: _platonic_mirror('icosahedron'),
+))
+
+
+def _platonic_loader(name):
+    def load():
+        from polya.platonic import platonic_rotation_group
+        return platonic_rotation_group(name)
+    return load
+
+
+def _platonic_edges(name):
+    from polya.platonic import edges_from_vertices, platonic_vertices
+    return edges_from_vertices(platonic_vertices(name))
+
+
+def _platonic_geometry(name):
+    from polya.platonic import platonic_vertices
+    return {'vertices': platonic_vertices(name).tolist()}
+
+
+def _platonic_mirror(name):
+    from polya.platonic import mirror_permutation, platonic_vertices
+    return mirror_permutation(platonic_vertices(name))
+
+
+# 其余正多面体的群由 polya.platonic 从顶点坐标生成
+for _name, _n in (('tetrahedron', 4), ('cube', 8), ('octahedron', 6)):
+    register_polyhedron(PolyhedronDescriptor(
+        _name, 'vertex', _n,
+        group_loader=_platonic_loader(_name),
+        adjacency_loader=lambda name=_name: _platonic_edges(name),
+        geometry_loader=lambda name=_name: _platonic_geometry(name),
+        output_dir="result",
+        mirror_loader=lambda name=_name: _platonic_mirror(name),
+    ))
+
+
+# ----------------------------------------------------------------------
+# 面、棱、有向棱：由顶点群诱导
+# ----------------------------------------------------------------------
+# 多面体名 -> {'vertices', 'edges', 'faces'}
+_TOPOLOGY_CACHE = {}
+
+
+def polyhedron_topology(name):
+    """
+    :param name: 多面体名
+    :return: 字典，'vertices' 顶点坐标，'edges' 棱 (i, j) 列表，'faces' 面的顶点元组列表
+    """
+    topology = _TOPOLOGY_CACHE.get(name)
+    if topology is not None:
+        return topology
+    vertex = get_descriptor(name, 'vertex')
+    geometry = vertex.geometry
+    if geometry is None or vertex.adjacency is None:
+        raise ValueError(f"{name} 没有几何数据，无法推出面和棱")
+    edges = [tuple(edge) for edge in vertex.adjacency]
+    if 'faces' in geometry:
+        faces = [tuple(sorted(face)) for face in geometry['faces']]
+    else:
+        from polya.induced import faces_from_vertices
+        faces = faces_from_vertices(geometry['vertices'], edges)
+    topology = {'vertices': geometry['vertices'], 'edges': edges, 'faces': faces}
+    _TOPOLOGY_CACHE[name] = topology
+    return topology
+
+
+def _objects(name, element_type):
+    from polya.induced import oriented_edges
+
+    topology = polyhedron_topology(name)
+    if element_type == 'face':
+        return topology['faces']
+    if element_type == 'edge':
+        return topology['edges']
+    return oriented_edges(topology['edges'])
+
+
+def _induced_loader(name, element_type):
+    def load():
+        from polya.induced import induced_group
+
+        vertex = get_descriptor(name, 'vertex')
+        return induced_group(vertex.group, vertex.n, _objects(name, element_type), element_type == 'oriented_edge')
+    return load
+
+
+def _induced_mirror(name, element_type):
+    from polya.induced import induced_permutations
+
+    mirror = get_descriptor(name, 'vertex').mirror
+    return induced_permutations([mirror], _objects(name, element_type), element_type == 'oriented_edge')[0].tolist()
+
+
+def _induced_adjacency(name, element_type):
+    """面：共享一条棱即相邻；棱：共享一个顶点即相邻；有向棱不定义邻接。"""
+    if element_type == 'oriented_edge':
+        return None
+    objects = [set(obj) for obj in _objects(name, element_type)]
+    shared = 2 if element_type == 'face' else 1
+    return [(i, j) for i in range(len(objects)) for j in range(i + 1, len(objects))
+            if len(objects[i] & objects[j]) >= shared]
+
+
+# (多面体名, 顶点数, 棱数, 面数)
+_SOLID_SIZES = (('tetrahedron', 4, 6, 4), ('cube', 8, 12, 6), ('octahedron', 6, 12, 8),
+                ('dodecahedron', 20, 30, 12), ('icosahedron', 12, 30, 20))
+
+for _name, _, _edges, _faces in _SOLID_SIZES:
+    for _element_type, _n in (('face', _faces), ('edge', _edges), ('oriented_edge', 2 * _edges)):
+        register_polyhedron(PolyhedronDescriptor(
+            _name, _element_type, _n,
+            group_loader=_induced_loader(_name, _element_type),
+            adjacency_loader=(None if _element_type == 'oriented_edge'
+                              else lambda name=_name, kind=_element_type: _induced_adjacency(name, kind)),
+            geometry_loader=lambda name=_name: polyhedron_topology(name),
+            output_dir=get_descriptor(_name, 'vertex').output_dir,
+            mirror_loader=lambda name=_name, kind=_element_type: _induced_mirror(name, kind),
+        ))
@@ -0,0 +1,172 @@
+# polya/rules.py
+"""
+局部约束的小型描述语言，在有序生成的回溯中增量检查。
+
+一条规则写成「条件 per 范围」，例如：
+    "not_monochromatic per face"      每个面不全同色
+    "at_most(red, 2) per face"        每个面至多两个红色
+    "at_least(blue, 1) per neighborhood"  每个顶点至少有一个蓝色邻居
+    "distinct per edge"               相邻元素异色
+条件：at_most(颜色, k)、at_least(颜色, k)、exactly(颜色, k)、not_monochromatic、distinct。
+范围是若干「块」（位置集合）：
+    edge                 描述符邻接关系中的每条棱
+    neighborhood         每个元素的邻居（不含自身）
+    closed_neighborhood  每个元素及其邻居
+    face                 每个面上的元素（顶点或棱描述符）
+    vertex               每个顶点处的元素（面或棱描述符）
+也可以通过 scopes 参数传入自定义的 {范围名: 块列表}。
+
+检查方式是对每个块的各颜色计数做前向检查：填入一个位置时只更新包含它的块，
+块中已有颜色与尚未填的位置数一旦不可能满足条件，立即剪掉整棵子树。
+"""
+import re
+
+from polya.registry import polyhedron_topology
+
+# 条件名 -> 是否带 (颜色, k) 参数
+RULE_KINDS = {'at_most': True, 'at_least': True, 'exactly': True, 'not_monochromatic': False, 'distinct': False}
+
+_RULE_PATTERN = re.compile(r"^\s*(\w+)\s*(?:\(\s*([^,()]+?)\s*,\s*(\d+)\s*\))?\s+per\s+(\w+)\s*$")
+
+
+def parse_rule(text):
+    """
+    :param text: 规则文本，如 "at_most(red, 2) per face"
+    :return: (条件名, 颜色或 None, k 或 None, 范围名)
+    """
+    match = _RULE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"无法解析的规则: {text!r}")
+    kind, color, k, scope = match.groups()
+    if kind not in RULE_KINDS:
+        raise ValueError(f"未知的条件: {kind}，可用: {', '.join(RULE_KINDS)}")
+    if RULE_KINDS[kind] != (color is not None):
+        raise ValueError(f"条件 {kind} 的参数不正确: {text!r}")
+    return kind, color, None if k is None else int(k), scope
+
+
+def descriptor_scopes(descriptor):
+    """
+    :param descriptor: PolyhedronDescriptor
+    :return: 字典，范围名 -> 块列表（每块为位置元组）
+    """
+    scopes = {}
+    n = descriptor.n
+    if descriptor.adjacency is not None:
+        neighbors = [[] for _ in range(n)]
+        for i, j in descriptor.adjacency:
+            neighbors[i].append(j)
+            neighbors[j].append(i)
+        scopes['edge'] = [tuple(edge) for edge in descriptor.adjacency]
+        scopes['neighborhood'] = [tuple(sorted(nb)) for nb in neighbors]
+        scopes['closed_neighborhood'] = [tuple(sorted(nb + [v])) for v, nb in enumerate(neighbors)]
+    try:
+        topology = polyhedron_topology(descriptor.name)
+    except ValueError:
+        return scopes
+    faces = [set(face) for face in topology['faces']]
+    if descriptor.element_type == 'vertex':
+        scopes['face'] = [tuple(sorted(face)) for face in faces]
+    elif descriptor.element_type == 'edge':
+        edges = topology['edges']
+        scopes['face'] = [tuple(e for e, (i, j) in enumerate(edges) if i in face and j in face) for face in faces]
+        scopes['vertex'] = [tuple(e for e, edge in enumerate(edges) if v in edge)
+                            for v in range(len(topology['vertices']))]
+    elif descriptor.element_type == 'face':
+        scopes['vertex'] = [tuple(f for f, face in enumerate(faces) if v in face)
+                            for v in range(len(topology['vertices']))]
+    return scopes
+
+
+class RuleChecker:
+    """回溯中逐位置维护各块的颜色计数，做前向检查。"""
+
+    def __init__(self, rules, colors, n, scopes):
+        """
+        :param rules: 规则文本列表
+        :param colors: 颜色列表（颜色下标与枚举一致）
+        :param n: 元素个数
+        :param scopes: 字典，范围名 -> 块列表
+        """
+        index = {c: i for i, c in enumerate(colors)}
+        k = len(colors)
+        # 每个块：[条件名, 颜色下标, k, 各颜色计数, 未填位置数, 块大小]
+        self.blocks = []
+        self.members = [[] for _ in range(n)]
+        for text in rules:
+            kind, color, bound, scope = parse_rule(text)
+            if scope not in scopes:
+                raise ValueError(f"未知的范围: {scope}，可用: {', '.join(scopes)}")
+            if color is not None and color not in index:
+                raise ValueError(f"规则中的颜色 {color} 不在颜色列表中")
+            c_idx = None if color is None else index[color]
+            for block in scopes[scope]:
+                state = [kind, c_idx, bound, [0] * k, len(block), len(block)]
+                if not self._feasible(state):
+                    raise ValueError(f"规则 {text!r} 在任何染色下都无法满足")
+                self.blocks.append(state)
+                for v in block:
+                    self.members[v].append(state)
+
+    @staticmethod
+    def _feasible(state):
+        kind, c_idx, bound, counts, free, size = state
+        if kind == 'at_most':
+            return counts[c_idx] <= bound
+        if kind == 'at_least':
+            return counts[c_idx] + free >= bound
+        if kind == 'exactly':
+            return counts[c_idx] <= bound <= counts[c_idx] + free
+        if kind == 'distinct':
+            return max(counts) <= 1
+        # not_monochromatic：单元素块总是同色，视为不约束
+        return free > 0 or size < 2 or max(counts) < size
+
+    def assign(self, i, c_idx):
+        """
+        把位置 i 填为颜色 c_idx；违反任一规则时撤销并返回 False。
+        :return: 布尔值
+        """
+        members = self.members[i]
+        for state in members:
+            state[3][c_idx] += 1
+            state[4] -= 1
+        if all(self._feasible(state) for state in members):
+            return True
+        self.unassign(i, c_idx)
+        return False
+
+    def unassign(self, i, c_idx):
+        for state in self.members[i]:
+            state[3][c_idx] -= 1
+            state[4] += 1
+
+    def check(self, coloring):
+        """
+        :param coloring: 颜色下标序列（完整染色）
+        :return: 布尔值，是否满足全部规则（不改变内部状态）
+        """
+        ok = True
+        for i, c_idx in enumerate(coloring):
+            for state in self.members[i]:
+                state[3][c_idx] += 1
+                state[4] -= 1
+        if not all(self._feasible(state) for state in self.blocks):
+            ok = False
+        for i, c_idx in enumerate(coloring):
+            self.unassign(i, c_idx)
+        return ok
+
+
+def compile_rules(rules, colors, descriptor, scopes=None):
+    """
+    :param rules: 规则文本列表
+    :param colors: 颜色列表
+    :param descriptor: PolyhedronDescriptor
+    :param scopes: 额外的 {范围名: 块列表}，与描述符自带的范围合并
+    :return: RuleChecker
+    """
+    all_scopes = descriptor_scopes(descriptor)
+    if scopes:
+        all_scopes.update(scopes)
+    return RuleChecker(rules, colors, descriptor.n, all_scopes)
@@ -0,0 +1,112 @@
+# polya/sampling.py
+"""
+不枚举的均匀轨道抽样。
+
+Burnside 引理的另一种读法：满足 g·x = x 的二元组 (g, x) 中，每个轨道 O 恰好出现
+|O|·|Stab(x)| = |G| 次。因此
+1. 以固定染色数为权重抽取群元素 g；
+2. 在 g 固定的染色中均匀抽取一个 x（每个轮换整体染一种颜色）；
+3. 把 x 规范化为其轨道的字典序最小代表（polya.canonical.canonical_codes）；
+得到的代表在全部轨道上严格均匀分布。第 2 步逐个轮换选色，选某种颜色的概率正比于
+剩余轮换在剩余颜色计数下的固定染色数（由 polya.burnside 的缓存核函数给出）。
+每次抽样的代价为 O(|G|·n)，与轨道总数无关。
+"""
+import random
+
+import numpy as np
+
+from polya.burnside import cycle_type, fixed_count, sizes_to_cycle_type
+from polya.canonical import canonical_codes
+from polya.enumeration import counts_in_order
+from polya.group_tables import build_permutation, permutation_matrices
+from polya.schreier_sims import cycle_decomposition
+
+
+def _resolve_rng(rng):
+    """None 表示使用全局随机数，整数作为种子，否则原样使用 random.Random 实例。"""
+    if rng is None:
+        return random
+    if isinstance(rng, random.Random):
+        return rng
+    return random.Random(rng)
+
+
+def element_weights(perm_group, counts, n):
+    """
+    :param perm_group: 字典，表示群
+    :param counts: 各颜色的使用次数
+    :param n: 元素个数
+    :return: 列表，与群字典顺序一致的各元素固定染色数
+    """
+    return [fixed_count(cycle_type(cycle_decomp, n), counts) for cycle_decomp in perm_group.values()]
+
+
+def sample_fixed_coloring(cycles, counts, rng=None):
+    """
+    在轮换分解为 cycles 的置换固定的染色中均匀抽取一个。
+    :param cycles: 轮换列表（须包含不动点）
+    :param counts: 各颜色的使用次数
+    :param rng: random.Random 实例、整数种子或 None
+    :return: 列表，颜色下标形式的染色
+    """
+    rng = _resolve_rng(rng)
+    n = sum(len(cycle) for cycle in cycles)
+    remaining = list(counts)
+    coloring = [0] * n
+    for t, cycle in enumerate(cycles):
+        size = len(cycle)
+        rest = sizes_to_cycle_type([len(c) for c in cycles[t + 1:]])
+        weights = []
+        for c, left in enumerate(remaining):
+            if left < size:
+                weights.append(0)
+                continue
+            remaining[c] -= size
+            weights.append(fixed_count(rest, remaining))
+            remaining[c] += size
+        if not any(weights):
+            raise ValueError("该置换不固定任何满足颜色计数的染色")
+        c = rng.choices(range(len(remaining)), weights=weights)[0]
+        remaining[c] -= size
+        for v in cycle:
+            coloring[v] = c
+    return coloring
+
+
+def iter_orbit_samples(counts, perm_group, n, rng=None):
+    """
+    :param counts: 各颜色（按下标）的使用次数
+    :param perm_group: 字典，表示群
+    :param n: 元素个数
+    :param rng: random.Random 实例、整数种子或 None
+    :return: 无限生成器，逐个产出均匀抽取的轨道代表（颜色下标元组）
+    """
+    rng = _resolve_rng(rng)
+    if sum(counts) != n or any(c < 0 for c in counts):
+        raise ValueError("颜色数量之和必须等于元素个数")
+    keys = list(perm_group)
+    weights = element_weights(perm_group, counts, n)
+    perms, inverses = permutation_matrices(perm_group, n)
+    cycles = {}
+    while True:
+        g = rng.choices(range(len(keys)), weights=weights)[0]
+        if g not in cycles:
+            cycles[g] = cycle_decomposition(build_permutation(perm_group[keys[g]], n)[0])
+        sample = np.array([sample_fixed_coloring(cycles[g], counts, rng)], dtype=np.int64)
+        yield tuple(canonical_codes(sample, perms, len(counts), inverses)[0].tolist())
+
+
+def sample_representatives(colors, perm_group, color_counts, n, size, rng=None):
+    """
+    均匀抽取若干个不等价染色方案（有放回）。
+    :param colors: 颜色列表（其顺序决定字典序）
+    :param perm_group: 字典，表示群
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param n: 元素个数
+    :param size: 抽样个数
+    :param rng: random.Random 实例、整数种子或 None
+    :return: 列表，每个元素是轨道的字典序最小代表（颜色名元组）
+    """
+    counts = counts_in_order(colors, color_counts)
+    samples = iter_orbit_samples(counts, perm_group, n, rng)
+    return [tuple(colors[c] for c in next(samples)) for _ in range(size)]
@@ -0,0 +1,307 @@
+# polya/schreier_sims.py
+"""
+基于稳定子链（Schreier–Sims）的置换群。
+
+群由少量生成元给出，不再需要把全部元素列出来。构造得到基（base）与强生成集后：
+- 群阶为各层陪集代表数之积；
+- 成员判定用筛法（sift），每层一次查表；
+- 随机元素和逐个遍历都只需从每层的陪集代表中各取一个相乘。
+
+实现采用 Knuth 的增量算法（Efficient representation of perm groups, 1991）：
+以 0, 1, ..., n-1 为基，第 k 层是固定 0..k-1 的稳定子，记录点 k 的轨道与陪集代表。
+递归改写为显式工作栈，避免大群时超出递归深度。
+
+置换用元组表示，p[i] 为 i 的像；乘积 compose(a, b) 表示先作用 a 再作用 b。
+"""
+import random
+from collections import Counter
+from itertools import product
+
+from polya.burnside import fixed_count, sizes_to_cycle_type
+from polya.group_tables import build_permutation
+
+# 共轭类计算要记录已归类的全部元素，只对阶数不超过此值的群使用
+CONJUGACY_CLASS_LIMIT = 100000
+
+
+def compose(a, b):
+    """先作用 a 再作用 b。"""
+    return tuple(b[x] for x in a)
+
+
+def invert(p):
+    inverse = [0] * len(p)
+    for i, j in enumerate(p):
+        inverse[j] = i
+    return tuple(inverse)
+
+
+def cycle_decomposition(p, include_fixed=True):
+    """
+    :param p: 置换元组
+    :param include_fixed: 是否包含长度为 1 的轮换
+    :return: 列表，每个元素是一个轮换元组
+    """
+    seen = [False] * len(p)
+    cycles = []
+    for start in range(len(p)):
+        if seen[start]:
+            continue
+        cycle = []
+        x = start
+        while not seen[x]:
+            seen[x] = True
+            cycle.append(x)
+            x = p[x]
+        if include_fixed or len(cycle) > 1:
+            cycles.append(tuple(cycle))
+    return cycles
+
+
+def permutation_cycle_type(p):
+    """:return: 置换的轮换型，格式同 polya.burnside.cycle_type"""
+    return sizes_to_cycle_type([len(c) for c in cycle_decomposition(p)])
+
+
+class PermutationGroup:
+    """由生成元给出、以稳定子链表示的置换群。"""
+
+    def __init__(self, generators, n):
+        """
+        :param generators: 生成元列表，每个元素是长度为 n 的置换序列
+        :param n: 作用的点数
+        """
+        self.n = n
+        self.identity = tuple(range(n))
+        # 第 k 层的强生成元与陪集代表：transversals[k][j] 为把 k 送到 j 的元素
+        self.strong_generators = [[] for _ in range(n)]
+        self.transversals = [{k: self.identity} for k in range(n)]
+        self._inverse_reps = [{k: self.identity} for k in range(n)]
+        for g in generators:
+            self.add_generator(g)
+
+    @classmethod
+    def from_perm_group(cls, perm_group, n):
+        """
+        由轮换分解形式的群（如 SYMMETRY_CACHE）构造，只保留必要的生成元。
+        :param perm_group: 字典，表示群
+        :param n: 顶点数
+        :return: PermutationGroup
+        """
+        return cls([build_permutation(cycle_decomp, n)[0] for cycle_decomp in perm_group.values()], n)
+
+    # ------------------------------------------------------------------
+    # 构造
+    # ------------------------------------------------------------------
+    def sift(self, g, start=0):
+        """
+        依次用各层陪集代表约化 g。
+        :param g: 置换元组（须固定 0..start-1）
+        :param start: 起始层
+        :return: (余元, 层号)，完全约化时层号为 n、余元为恒等置换
+        """
+        for k in range(start, self.n):
+            j = g[k]
+            if j == k:
+                continue
+            inverse_rep = self._inverse_reps[k].get(j)
+            if inverse_rep is None:
+                return g, k
+            g = compose(g, inverse_rep)
+        return g, self.n
+
+    def add_generator(self, g):
+        """
+        向群中加入一个生成元（已在群中则忽略）。
+        :param g: 置换序列
+        :return: 布尔值，群是否因此变大
+        """
+        g = tuple(g)
+        if len(g) != self.n or sorted(g) != list(self.identity):
+            raise ValueError("生成元不是合法的置换")
+        if self.sift(g)[1] == self.n:
+            return False
+        # 工作栈中的任务：('A', k, g) 把 g 加入第 k 层生成元，('B', k, g) 检测陪集代表。
+        # 第 k 层的群由 strong_generators[k] 生成，新生成元总是从第 0 层加入
+        stack = [('A', 0, g)]
+        while stack:
+            kind, k, h = stack.pop()
+            if kind == 'A':
+                self.strong_generators[k].append(h)
+                for rep in list(self.transversals[k].values()):
+                    stack.append(('B', k, compose(rep, h)))
+                continue
+            j = h[k]
+            rep = self.transversals[k].get(j)
+            if rep is None:
+                self.transversals[k][j] = h
+                self._inverse_reps[k][j] = invert(h)
+                for s in self.strong_generators[k]:
+                    stack.append(('B', k, compose(h, s)))
+                continue
+            # Schreier 生成元固定 0..k，不在下一层的群中则加入下一层
+            reduced = compose(h, self._inverse_reps[k][j])
+            if self.sift(reduced, k + 1)[1] < self.n:
+                stack.append(('A', k + 1, reduced))
+        return True
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    @property
+    def base(self):
+        """非平凡层对应的基点。"""
+        return [k for k in range(self.n) if len(self.transversals[k]) > 1]
+
+    @property
+    def generators(self):
+        """强生成集（第 0 层的生成元已生成整个群，其余各层的生成元都属于它）。"""
+        seen = set()
+        result = []
+        for level in self.strong_generators:
+            for g in level:
+                if g not in seen:
+                    seen.add(g)
+                    result.append(g)
+        return result
+
+    def order(self):
+        result = 1
+        for transversal in self.transversals:
+            result *= len(transversal)
+        return result
+
+    def __len__(self):
+        return self.order()
+
+    def __contains__(self, g):
+        g = tuple(g)
+        return len(g) == self.n and self.sift(g)[1] == self.n
+
+    def random_element(self, rng=None):
+        """
+        均匀随机地取一个群元素。
+        :param rng: random.Random 实例，None 表示使用全局随机数
+        :return: 置换元组
+        """
+        rng = rng or random
+        g = self.identity
+        for k in range(self.n - 1, -1, -1):
+            transversal = self.transversals[k]
+            if len(transversal) > 1:
+                g = compose(g, transversal[rng.choice(list(transversal))])
+        return g
+
+    def __iter__(self):
+        """逐个产出全部群元素，不保存元素列表。"""
+        levels = [list(self.transversals[k].values()) for k in range(self.n - 1, -1, -1)
+                  if len(self.transversals[k]) > 1]
+        for reps in product(*levels):
+            g = self.identity
+            for rep in reps:
+                g = compose(g, rep)
+            yield g
+
+    def iter_preserving(self, labels):
+        """
+        逐个产出保持标号的元素（labels[g(i)] == labels[i]），即标号划分的稳定子。
+        群元素是各层陪集代表之积（高层先作用），点 i 的像只取决于第 0..i 层的选择；
+        按层从低到高选代表，点 i 的像一经确定就核对标号，不符合的整棵子树剪掉，
+        不必遍历整个群。
+        :param labels: 长度为 n 的标号序列
+        :return: 生成器，产出置换元组
+        """
+        if len(labels) != self.n:
+            raise ValueError(f"标号个数必须为 {self.n}")
+        # t 为已选各层代表之积：先作用第 k 层，再作用第 k-1 层……最后作用第 0 层
+        stack = [(0, self.identity)]
+        while stack:
+            k, t = stack.pop()
+            if k == self.n:
+                yield t
+                continue
+            for rep in self.transversals[k].values():
+                g = compose(rep, t)
+                if labels[g[k]] == labels[k]:
+                    stack.append((k + 1, g))
+
+    def to_perm_group(self):
+        """
+        展开为轮换分解形式的群字典（与 SYMMETRY_CACHE 格式相同），会列出全部元素。
+        :return: 字典，序号 -> 轮换分解列表
+        """
+        return {i: cycle_decomposition(g) for i, g in enumerate(self)}
+
+    # ------------------------------------------------------------------
+    # 共轭类与 Burnside 计数
+    # ------------------------------------------------------------------
+    def conjugacy_classes(self):
+        """
+        计算共轭类。对每个尚未归类的元素，用生成元做共轭的广度优先搜索得到整个类。
+        需要记录已归类的元素，只用于阶数不超过 CONJUGACY_CLASS_LIMIT 的群。
+        :return: 列表，每个元素为 (代表元, 类的大小)
+        """
+        if self.order() > CONJUGACY_CLASS_LIMIT:
+            raise ValueError(f"群阶 {self.order()} 超过 {CONJUGACY_CLASS_LIMIT}，不计算共轭类，请改用 cycle_type_counts")
+        gens = self.generators
+        inverse_gens = [invert(s) for s in gens]
+        seen = set()
+        classes = []
+        for g in self:
+            if g in seen:
+                continue
+            seen.add(g)
+            frontier = [g]
+            size = 1
+            while frontier:
+                x = frontier.pop()
+                for s, s_inv in zip(gens, inverse_gens):
+                    y = compose(compose(s_inv, x), s)
+                    if y not in seen:
+                        seen.add(y)
+                        frontier.append(y)
+                        size += 1
+            classes.append((g, size))
+        return classes
+
+    def class_representatives(self):
+        """
+        按共轭类压缩的元素：小群返回共轭类，大群逐个产出 (元素, 1)，不保存元素。
+        :return: 可迭代对象，每个元素为 (置换元组, 个数)
+        """
+        if self.order() > CONJUGACY_CLASS_LIMIT:
+            return ((g, 1) for g in self)
+        return self.conjugacy_classes()
+
+    def cycle_type_counts(self):
+        """
+        逐个遍历元素统计轮换型，不保存元素，只需 O(n) 额外内存。
+        :return: 元组，((轮换型, 个数), ...)
+        """
+        return tuple(sorted(Counter(permutation_cycle_type(g) for g in self).items()))
+
+    def cycle_type_classes(self):
+        """
+        由共轭类代表得到 (轮换型, 个数)，格式同 polya.burnside.cycle_type_classes；大群退回逐个遍历。
+        :return: 元组
+        """
+        counter = Counter()
+        for rep, size in self.class_representatives():
+            counter[permutation_cycle_type(rep)] += size
+        return tuple(sorted(counter.items()))
+
+    def count_orbits(self, counts, classes=None):
+        """
+        按轮换型做 Burnside 计数。
+        :param counts: 各颜色的使用次数
+        :param classes: 预先计算好的 (轮换型, 个数)，None 表示用 cycle_type_counts 逐个遍历元素统计
+                        （只需 O(n) 额外内存；对同一个群反复计数时应先算好传入）
+        :return: 整数，不等价染色方案数
+        """
+        if classes is None:
+            classes = self.cycle_type_counts()
+        total = sum(mult * fixed_count(ctype, counts) for ctype, mult in classes)
+        result, rest = divmod(total, self.order())
+        if rest:
+            raise ValueError("固定染色数之和不能被群阶整除")
+        return result
@@ -0,0 +1,413 @@
+# polya/store.py
+"""
+二进制的代表元文件，取代逐行解析的 "Class N: ..." 文本。
+
+文件布局：
+- 前 HEADER_SIZE 字节：魔数 STORE_MAGIC 加 UTF-8 JSON 文件头（空格补齐），记录格式版本、
+  元素类型、n、颜色表、颜色计数、群的内容哈希与阶、编码方式、每条记录的字节数和记录总数；
+- 之后是等宽记录，第 i 条记录的偏移为 HEADER_SIZE + i * record_size，不需要单独的偏移表。
+编码方式：
+- 'rows'：每个位置一个 uint8 颜色下标，n 字节；
+- 'rank'：颜色计数固定时记录染色的多重集合排列编号（polya.rank），按大端写成
+  ceil(log2(多重组合数) / 8) 字节，20 顶点 3 色只需 4 字节；大端保证字节序与字典序一致。
+写入时按块追加、关闭时回填记录总数；读取时用 numpy.memmap 映射记录区，
+第 i 个方案只读一条记录，与文件大小无关。
+
+命令行：
+    python -m polya.store pack 文本文件 -o 二进制文件 --colors red,blue,green [--encoding rank]
+    python -m polya.store unpack 二进制文件 -o 文本文件
+    python -m polya.store show 二进制文件 方案编号
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from polya.artifacts import group_hash
+from polya.dedup import iter_coloring_chunks
+from polya.rank import multiset_count, rank_coloring, rank_many, unrank_coloring, unrank_many
+from polya.writer import stream_colorings_to_file
+
+# 文件开头的魔数
+STORE_MAGIC = b"POLYAREP"
+
+# 文件格式版本
+FORMAT_VERSION = 1
+
+# 文件头占用的字节数（记录区从这里开始）
+HEADER_SIZE = 4096
+
+# 代表元文件的约定扩展名
+STORE_SUFFIX = ".reps"
+
+# 可用的编码方式
+ENCODINGS = ('rows', 'rank')
+
+# 每次写入、解码的最大记录数
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+def _rank_width(counts):
+    """rank 编码每条记录的字节数。"""
+    return max(1, ((multiset_count(counts) - 1).bit_length() + 7) // 8)
+
+
+def _fits_int64(counts):
+    return _rank_width(counts) <= 8 and multiset_count(counts) * max(sum(counts), 1) < 2 ** 63
+
+
+def _read_header(f, path):
+    block = f.read(HEADER_SIZE)
+    if len(block) < HEADER_SIZE or not block.startswith(STORE_MAGIC):
+        raise ValueError(f"{path} 不是代表元文件")
+    header = json.loads(block[len(STORE_MAGIC):].decode('utf-8'))
+    if header.get('format') != FORMAT_VERSION:
+        raise ValueError(f"不支持的代表元文件版本: {header.get('format')}")
+    return header
+
+
+def _write_header(f, header):
+    data = STORE_MAGIC + json.dumps(header, ensure_ascii=False).encode('utf-8')
+    if len(data) > HEADER_SIZE:
+        raise ValueError("文件头过长（颜色表过大）")
+    f.seek(0)
+    f.write(data.ljust(HEADER_SIZE, b' '))
+
+
+class RepresentativeWriter:
+    """
+    按块追加写代表元文件，可用作上下文管理器；正常关闭时回填记录总数。
+    with 块内抛出异常时不回填总数，留下的文件读取时会报“没有正常关闭”。
+    """
+
+    def __init__(self, path, colors, n, color_counts=None, perm_group=None, encoding='rows',
+                 element_type="vertex", chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        :param path: 输出文件路径
+        :param colors: 颜色列表，颜色 colors[i] 编码为 i
+        :param n: 元素个数
+        :param color_counts: dict，颜色->该颜色应使用的次数；给出时逐块核对，'rank' 编码必须给出
+        :param perm_group: 字典，表示群；给出时把其内容哈希写入文件头，读取时可据此核对
+        :param encoding: 'rows' 或 'rank'
+        :param element_type: 元素类型（如'vertex'）
+        :param chunk_rows: 缓存多少条记录写一次盘
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"未知的编码方式: {encoding}，可用: {', '.join(ENCODINGS)}")
+        if len(colors) > 256:
+            raise ValueError("颜色种类过多，无法用 uint8 编码")
+        self.colors = list(colors)
+        self.n = n
+        self.counts = None if color_counts is None else [color_counts[c] for c in self.colors]
+        if self.counts is not None and sum(self.counts) != n:
+            raise ValueError("颜色数量之和必须等于元素个数")
+        if encoding == 'rank' and self.counts is None:
+            raise ValueError("'rank' 编码需要给出颜色计数")
+        self.encoding = encoding
+        self.record_size = n if encoding == 'rows' else _rank_width(self.counts)
+        self.chunk_rows = chunk_rows
+        self.total = 0
+        self._index = {c: i for i, c in enumerate(self.colors)}
+        self._pending = []
+        self.header = {
+            'format': FORMAT_VERSION,
+            'element_type': element_type,
+            'n': n,
+            'colors': self.colors,
+            'counts': self.counts,
+            'group_sha256': None if perm_group is None else group_hash(perm_group, n),
+            'group_order': None if perm_group is None else len(perm_group),
+            'encoding': encoding,
+            'record_size': self.record_size,
+            'total': None,
+        }
+        self.path = path
+        self._file = open(path, 'wb')
+        _write_header(self._file, self.header)
+
+    def write(self, coloring):
+        """
+        :param coloring: 颜色名序列
+        """
+        self._pending.append([self._index[c] for c in coloring])
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def write_indices(self, coloring):
+        """
+        :param coloring: 颜色下标序列（枚举代码内部的表示，省去名字的往返）
+        """
+        self._pending.append(coloring)
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.write_codes(np.array(pending, dtype=np.uint8).reshape(-1, self.n))
+
+    def write_codes(self, codes):
+        """
+        :param codes: 形状为 (B, n) 的颜色下标数组，整块编码后追加到文件
+        """
+        codes = np.asarray(codes, dtype=np.uint8)
+        if codes.ndim != 2 or codes.shape[1] != self.n:
+            raise ValueError(f"codes 必须是 (B, {self.n}) 的数组")
+        if len(codes) == 0:
+            return
+        if self.counts is not None:
+            k = len(self.colors)
+            histograms = (codes[:, :, None] == np.arange(k, dtype=np.uint8)).sum(axis=1)
+            if (histograms != self.counts).any():
+                raise ValueError("染色不满足颜色计数")
+        self._file.write(self._encode(codes).tobytes())
+        self.total += len(codes)
+
+    def _encode(self, codes):
+        if self.encoding == 'rows':
+            return codes
+        if _fits_int64(self.counts):
+            ranks = rank_many(codes, self.counts).astype('>u8')
+            return ranks.view(np.uint8).reshape(-1, 8)[:, 8 - self.record_size:]
+        data = b''.join(rank_coloring(row, self.counts).to_bytes(self.record_size, 'big') for row in codes.tolist())
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def close(self):
+        """写出剩余记录并回填文件头中的记录总数。"""
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+            self.header['total'] = self.total
+            _write_header(self._file, self.header)
+        finally:
+            self._file.close()
+
+    def abort(self):
+        """写出已缓存的记录后关闭，但不回填记录总数，标记文件不完整。"""
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+        except ValueError:
+            # 缓存中有不满足颜色计数的记录：文件反正不完整，不再掩盖原来的异常
+            pass
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class RepresentativeStore:
+    """内存映射的代表元文件，按编号随机访问。"""
+
+    def __init__(self, path, perm_group=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        :param path: 文件路径
+        :param perm_group: 字典，表示群；给出时与文件头中的群哈希核对
+        :param chunk_rows: 顺序遍历时每次解码的记录数
+        """
+        with open(path, 'rb') as f:
+            header = _read_header(f, path)
+        if header['total'] is None:
+            raise ValueError(f"{path} 没有正常关闭，记录总数未知")
+        self.path = path
+        self.header = header
+        self.element_type = header['element_type']
+        self.n = header['n']
+        self.colors = header['colors']
+        self.counts = header['counts']
+        self.encoding = header['encoding']
+        self.record_size = header['record_size']
+        self.total = header['total']
+        self.chunk_rows = chunk_rows
+        if os.path.getsize(path) != HEADER_SIZE + self.total * self.record_size:
+            raise ValueError(f"{path} 的大小与记录总数不一致")
+        if perm_group is not None:
+            if header['group_sha256'] is None:
+                print(f"警告：{path} 没有记录群哈希，无法核对群。")
+            elif group_hash(perm_group, self.n) != header['group_sha256']:
+                raise ValueError(f"{path} 不是在给定的群下生成的")
+        if self.total:
+            self.records = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                                     shape=(self.total, self.record_size))
+        else:
+            self.records = np.zeros((0, self.record_size), dtype=np.uint8)
+
+    def __len__(self):
+        return self.total
+
+    def _decode(self, records):
+        if self.encoding == 'rows':
+            return np.asarray(records)
+        if _fits_int64(self.counts):
+            padded = np.zeros((len(records), 8), dtype=np.uint8)
+            padded[:, 8 - self.record_size:] = records
+            return unrank_many(padded.view('>u8').ravel().astype(np.int64), self.counts)
+        return np.array([unrank_coloring(int.from_bytes(bytes(row), 'big'), self.counts)
+                         for row in np.asarray(records)], dtype=np.uint8).reshape(-1, self.n)
+
+    def codes(self, start, stop):
+        """
+        :param start: 起始编号（含）
+        :param stop: 结束编号（不含），超过总数时截断
+        :return: 形状为 (stop - start, n) 的 uint8 颜色下标数组
+        """
+        return self._decode(self.records[start:min(stop, self.total)])
+
+    def __getitem__(self, i):
+        """
+        :param i: 方案编号（从 0 开始，可为负数）或切片
+        :return: 颜色名元组；切片时为颜色名元组列表
+        """
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.total)
+            return [tuple(self.colors[c] for c in row) for row in self.codes(start, stop)[::step].tolist()]
+        if i < 0:
+            i += self.total
+        if not 0 <= i < self.total:
+            raise IndexError(f"编号 {i} 超出范围 [0, {self.total})")
+        if self.encoding == 'rank':
+            # 单条记录直接按整数还原，比批量解码的数组开销小
+            coloring = unrank_coloring(int.from_bytes(self.records[i].tobytes(), 'big'), self.counts)
+        else:
+            coloring = self.records[i].tolist()
+        return tuple(self.colors[c] for c in coloring)
+
+    def iter_codes(self):
+        """:return: 生成器，按顺序逐块产出 uint8 颜色下标数组"""
+        for start in range(0, self.total, self.chunk_rows):
+            yield self.codes(start, start + self.chunk_rows)
+
+    def __iter__(self):
+        names = np.array(self.colors, dtype=object)
+        for block in self.iter_codes():
+            yield from (tuple(row) for row in names[block].tolist())
+
+
+def open_store(path, perm_group=None):
+    """
+    :param path: 文件路径
+    :param perm_group: 字典，表示群；给出时与文件头中的群哈希核对
+    :return: RepresentativeStore
+    """
+    return RepresentativeStore(path, perm_group)
+
+
+def write_store(colorings, path, colors, n, color_counts=None, perm_group=None, encoding='rows',
+                element_type="vertex"):
+    """
+    :param colorings: 可迭代对象，逐个产出颜色名序列
+    :param path: 输出文件路径
+    :param colors: 颜色列表
+    :param n: 元素个数
+    :param color_counts: dict，颜色->该颜色应使用的次数
+    :param perm_group: 字典，表示群
+    :param encoding: 'rows' 或 'rank'
+    :param element_type: 元素类型
+    :return: 写入的方案数
+    """
+    with RepresentativeWriter(path, colors, n, color_counts, perm_group, encoding, element_type) as writer:
+        for coloring in colorings:
+            writer.write(coloring)
+    return writer.total
+
+
+def _scan_text_file(text_path):
+    """读到第一个染色为止：返回 (文件头中的元素类型或 None, 第一个染色的颜色名列表)。"""
+    element_type = None
+    with open(text_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith("Class"):
+                return element_type, line.partition(':')[2].partition('|')[0].split()
+            words = line.split()
+            if element_type is None and len(words) > 2 and words[1] == "colorings":
+                element_type = words[0].lower()
+    raise ValueError(f"{text_path} 中没有 \"Class N: ...\" 形式的染色")
+
+
+def text_to_store(text_path, path, colors, color_counts=None, perm_group=None, encoding='rows',
+                  element_type=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    把 "Class N: ..." 文本文件转换为代表元文件（保持原有顺序，不做规范化）。
+    :param text_path: 文本文件路径
+    :param path: 输出文件路径
+    :param colors: 颜色列表
+    :param color_counts: dict，颜色->该颜色应使用的次数；None 且编码为 'rank' 时按第一个染色推断
+    :param perm_group: 字典，表示群（只用于写入群哈希）
+    :param encoding: 'rows' 或 'rank'
+    :param element_type: 元素类型，None 表示取文本文件头中的类型
+    :param chunk_rows: 每次解析、写入的行数
+    :return: 写入的方案数
+    """
+    header_type, first = _scan_text_file(text_path)
+    n = len(first)
+    if color_counts is None and encoding == 'rank':
+        color_counts = {c: first.count(c) for c in colors}
+    with RepresentativeWriter(path, colors, n, color_counts, perm_group, encoding,
+                              element_type or header_type or "vertex", chunk_rows) as writer:
+        for codes in iter_coloring_chunks([text_path], colors, n, chunk_rows):
+            writer.write_codes(codes)
+    return writer.total
+
+
+def store_to_text(path, text_path):
+    """
+    把代表元文件转换回 "Class N: ..." 文本文件。
+    :param path: 代表元文件路径
+    :param text_path: 输出的文本文件路径
+    :return: 写入的方案数
+    """
+    store = open_store(path)
+    return stream_colorings_to_file(iter(store), text_path, len(store), store.element_type)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="代表元文件与 \"Class N: ...\" 文本之间的转换")
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack = commands.add_parser('pack', help="文本 -> 代表元文件")
+    pack.add_argument('input', help="文本文件")
+    pack.add_argument('-o', '--output', required=True, help="输出文件")
+    pack.add_argument('--colors', required=True, help="逗号分隔的颜色列表")
+    pack.add_argument('--encoding', default='rows', choices=ENCODINGS)
+    pack.add_argument('--polyhedron', default=None, help="多面体名，给出时写入群哈希")
+    pack.add_argument('--element-type', default=None, help="元素类型，默认取文本文件头中的类型")
+    pack.add_argument('--symmetry', default='rotation', help="'rotation' 或 'full'")
+    unpack = commands.add_parser('unpack', help="代表元文件 -> 文本")
+    unpack.add_argument('input', help="代表元文件")
+    unpack.add_argument('-o', '--output', required=True, help="输出文件")
+    show = commands.add_parser('show', help="显示第 i 个方案（从 1 开始）")
+    show.add_argument('input', help="代表元文件")
+    show.add_argument('index', type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == 'pack':
+        perm_group = None
+        if args.polyhedron is not None:
+            from polya.registry import get_descriptor
+
+            perm_group = get_descriptor(args.polyhedron, args.element_type or 'vertex').symmetry_group(args.symmetry)
+        written = text_to_store(args.input, args.output, args.colors.split(','), None, perm_group,
+                                args.encoding, args.element_type)
+        print(f"写入 {written} 个方案到 {args.output}")
+    elif args.command == 'unpack':
+        written = store_to_text(args.input, args.output)
+        print(f"写入 {written} 个方案到 {args.output}")
+    else:
+        if args.index < 1:
+            parser.error("方案编号从 1 开始")
+        store = open_store(args.input)
+        print(f"Class {args.index}: {' '.join(store[args.index - 1])}")
+
+
+if __name__ == "__main__":
+    main()
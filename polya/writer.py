@@ -0,0 +1,107 @@
+# polya/writer.py
+"""
+后台线程分块写出染色方案文件。
+
+生产者（枚举代码）把若干行打包成一块放进有界队列，后台线程取出后写盘并刷新。
+队列满时生产者阻塞，因此内存占用只与 chunk_size * queue_size 有关，与输出规模无关。
+文件格式与 save_colorings_to_file 相同（"Class N: ..."）；带附注时附注以 " | " 接在行尾。
+"""
+import queue
+import threading
+
+# 队列中的结束标记
+_DONE = object()
+
+
+class ChunkedFileWriter:
+    """在后台线程中按块写文件的写入器，可用作上下文管理器。"""
+
+    def __init__(self, file_path, header="", queue_size=16):
+        """
+        :param file_path: 输出文件路径
+        :param header: 文件开头写入的内容
+        :param queue_size: 队列中最多缓存的块数
+        """
+        self.file_path = file_path
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._file = open(file_path, 'w', encoding='utf-8')
+        self._file.write(header)
+        self._thread = threading.Thread(target=self._run, name="coloring-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is _DONE:
+                    break
+                self._file.write(''.join(chunk))
+                self._file.flush()
+        except Exception as e:
+            self._error = e
+            # 出错后继续取空队列，避免生产者永久阻塞
+            while self._queue.get() is not _DONE:
+                pass
+        finally:
+            self._file.close()
+
+    def put(self, chunk):
+        """
+        提交一块文本行，队列满时阻塞。
+        :param chunk: 字符串列表（每行需自带换行符）
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def close(self):
+        """等待所有块写完并关闭文件。"""
+        if self._thread.is_alive():
+            self._queue.put(_DONE)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def stream_colorings_to_file(colorings, file_path, total, element_type="vertex",
+                             chunk_size=4096, queue_size=16, annotated=False, footer=None):
+    """
+    边枚举边把染色方案写入文件。
+    :param colorings: 可迭代对象，逐个产出染色方案（颜色名序列）
+    :param file_path: 输出文件路径
+    :param total: 写入文件头的方案总数
+    :param element_type: 元素类型（如'vertex'）
+    :param chunk_size: 每块包含的行数
+    :param queue_size: 队列中最多缓存的块数
+    :param annotated: 为 True 时 colorings 逐个产出 (染色方案, 附注)，附注以 " | " 分隔写在同一行末尾
+    :param footer: 无参函数，全部方案写完后调用，返回写在文件末尾的文本；None 表示不写
+    :return: 实际写入的方案数
+    """
+    header = f"{element_type.capitalize()} colorings with {total} classes\n"
+    written = 0
+    with ChunkedFileWriter(file_path, header, queue_size) as writer:
+        chunk = []
+        for written, item in enumerate(colorings, 1):
+            if annotated:
+                coloring, note = item
+                chunk.append(f"Class {written}: {' '.join(coloring)} | {note}\n")
+            else:
+                chunk.append(f"Class {written}: {' '.join(item)}\n")
+            if len(chunk) >= chunk_size:
+                writer.put(chunk)
+                chunk = []
+        if footer is not None:
+            chunk.append(footer())
+        if chunk:
+            writer.put(chunk)
+    if written != total:
+        print(f"警告：文件头记录 {total} 个方案，实际写入 {written} 个。")
+    return written
@@ -0,0 +1,98 @@
+"""
+测试用的暴力对照。
+
+列出满足颜色计数的全部染色，逐个求全部像，取字典序最小者为轨道代表。
+只用群的轮换分解（polya.group_tables.build_permutation），不经过置换矩阵、枚举与计数代码。
+"""
+from functools import lru_cache
+from itertools import permutations
+
+from polya.group_tables import build_permutation
+from polya.registry import get_descriptor
+
+COLORS = ['r', 'g', 'b']
+
+SYMMETRIES = ['rotation', 'full']
+
+SOLIDS = [(name, element_type) for name in ('tetrahedron', 'cube') for element_type in ('vertex', 'edge', 'face')]
+
+
+def count_cases(n):
+    """每个元素个数下核对的颜色计数：两色对半、三色均分、一种颜色占多数。"""
+    cases = [(n - n // 2, n // 2, 0), (n - 2 * (n // 3), n // 3, n // 3), (n - 2, 1, 1)]
+    return list(dict.fromkeys(cases))
+
+
+# (多面体名, 元素类型, 颜色计数)，供 pytest.mark.parametrize 使用
+CASES = [(name, element_type, counts) for name, element_type in SOLIDS
+         for counts in count_cases(get_descriptor(name, element_type).n)]
+
+
+def color_counts(counts):
+    return dict(zip(COLORS, counts))
+
+
+def names(codes):
+    return tuple(COLORS[c] for c in codes)
+
+
+@lru_cache(maxsize=None)
+def multiset_permutations(counts):
+    """
+    :param counts: 各颜色的使用次数（元组）
+    :return: 元组，按字典序列出满足颜色计数的全部染色（颜色下标元组）
+    """
+    n = sum(counts)
+    remaining = list(counts)
+    prefix = []
+    result = []
+
+    def extend():
+        if len(prefix) == n:
+            result.append(tuple(prefix))
+            return
+        for c, r in enumerate(remaining):
+            if r:
+                remaining[c] -= 1
+                prefix.append(c)
+                extend()
+                prefix.pop()
+                remaining[c] += 1
+
+    extend()
+    return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def brute_orbits(name, element_type, symmetry, counts, relabel=False):
+    """
+    :param name: 多面体名
+    :param element_type: 元素类型
+    :param symmetry: 'rotation' 或 'full'
+    :param counts: 各颜色的使用次数（元组）
+    :param relabel: 为 True 时同时允许互换使用次数相同的颜色
+    :return: (染色 -> 轨道代表 的字典, 轨道代表 -> 轨道大小 的字典)
+    """
+    descriptor = get_descriptor(name, element_type)
+    n = descriptor.n
+    inverses = [build_permutation(cycles, n)[1] for cycles in descriptor.symmetry_group(symmetry).values()]
+    k = len(counts)
+    color_perms = [tuple(range(k))]
+    if relabel:
+        color_perms = [sigma for sigma in permutations(range(k)) if all(counts[sigma[c]] == counts[c] for c in range(k))]
+    rep_of = {}
+    sizes = {}
+    for x in multiset_permutations(counts):
+        if x in rep_of:
+            continue
+        orbit = {tuple(sigma[x[i]] for i in pinv) for pinv in inverses for sigma in color_perms}
+        rep = min(orbit)
+        for y in orbit:
+            rep_of[y] = rep
+        sizes[rep] = len(orbit)
+    return rep_of, sizes
+
+
+def brute_representatives(name, element_type, symmetry, counts, relabel=False):
+    """:return: 列表，按字典序排列的轨道代表（颜色名元组）"""
+    return [names(rep) for rep in sorted(brute_orbits(name, element_type, symmetry, counts, relabel)[1])]
@@ -0,0 +1,30 @@
+import numpy as np
+
+from polya.artifacts import group_hash, load_group_artifact, save_group_artifact
+from polya.burnside import cycle_type_classes
+from polya.group_tables import FrozenGroup, inverse_permutations, permutation_matrices
+from polya.registry import get_descriptor
+
+
+def is_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_round_trip_keeps_the_mapping(tmp_path):
+    descriptor = get_descriptor('cube', 'edge')
+    original = {key: list(cycles) for key, cycles in descriptor.full_group.items()}
+    prefix = str(tmp_path / 'cube_edge')
+    digest = save_group_artifact(original, descriptor.n, prefix)
+    artifact = load_group_artifact(prefix, verify=True)
+    group = artifact.to_perm_group()
+    assert isinstance(group, FrozenGroup)
+    perms, inverses = permutation_matrices(group, descriptor.n)
+    assert is_mapped(perms) and is_mapped(inverses)
+    assert dict(group.items()) == original
+    assert cycle_type_classes(group, descriptor.n) == cycle_type_classes(original, descriptor.n)
+    assert inverse_permutations(group, descriptor.n) == inverse_permutations(original, descriptor.n)
+    assert group_hash(group, descriptor.n) == group_hash(original, descriptor.n) == digest
@@ -0,0 +1,31 @@
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_orbits, color_counts
+from polya import engine
+from polya.burnside import count_orbits, cycle_type_classes, fixed_count
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_count_matches_brute_force(name, element_type, counts, symmetry):
+    descriptor = get_descriptor(name, element_type)
+    _, sizes = brute_orbits(name, element_type, symmetry, counts)
+    assert engine.count_colorings(descriptor, COLORS, color_counts(counts), symmetry=symmetry) == len(sizes)
+
+
+def test_classes_cover_the_group():
+    descriptor = get_descriptor('cube', 'edge')
+    classes = cycle_type_classes(descriptor.group, descriptor.n)
+    assert sum(mult for _, mult in classes) == len(descriptor.group)
+
+
+def test_fixed_count_ignores_color_order():
+    # 颜色计数只是顺序不同时，固定染色数相同（命中同一条缓存）
+    ctype = ((5, 4),)
+    assert fixed_count(ctype, (10, 5, 5)) == fixed_count(ctype, (5, 10, 5)) == 12
+
+
+def test_counts_not_summing_to_n():
+    descriptor = get_descriptor('cube', 'face')
+    assert count_orbits(descriptor.group, [2, 2, 1], descriptor.n) == 0
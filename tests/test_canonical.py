@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_orbits, color_counts, multiset_permutations, names
+from polya import canonical, engine
+from polya.canonical import canonical_codes, representative_mask
+from polya.group_tables import build_permutation
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_equivalence_classes_match_brute_force(name, element_type, counts, symmetry):
+    descriptor = get_descriptor(name, element_type)
+    sizes = brute_orbits(name, element_type, symmetry, counts)[1]
+    colorings = [names(x) for x in multiset_permutations(counts)]
+    classes = engine.equivalence_classes(descriptor, colorings, COLORS, symmetry=symmetry)
+    assert {key: len(members) for key, members in classes.items()} == {names(rep): size for rep, size in sizes.items()}
+
+
+def test_are_equivalent():
+    rep_of = brute_orbits('cube', 'edge', 'rotation', (4, 4, 4))[0]
+    descriptor = get_descriptor('cube', 'edge')
+    colorings = random.Random(5).sample(sorted(rep_of), 300)
+    # 相邻的随机染色多半不等价；每个染色与其轨道代表必然等价
+    for x, y in zip(colorings, colorings[1:]):
+        assert engine.are_equivalent(descriptor, names(x), names(y), COLORS) == (rep_of[x] == rep_of[y])
+        assert engine.are_equivalent(descriptor, names(x), names(rep_of[x]), COLORS)
+
+
+@pytest.mark.parametrize('name, element_type, k', [('cube', 'oriented_edge', 7), ('dodecahedron', 'edge', 6),
+                                                   ('tetrahedron', 'edge', 3)])
+def test_packed_keys_match_brute_force(monkeypatch, name, element_type, k):
+    # 前两例 k^n >= 2^63，走多字压缩的键；小块大小让一批染色分成多块
+    monkeypatch.setattr(canonical, 'PACKED_BLOCK', 1000)
+    descriptor = get_descriptor(name, element_type)
+    group = descriptor.symmetry_group('full')
+    inverses = [build_permutation(cycles, descriptor.n)[1] for cycles in group.values()]
+    perms = np.argsort(np.array(inverses), axis=1)
+    codes = np.random.default_rng(1).integers(0, k, size=(300, descriptor.n)).astype(np.uint8)
+    expected = [min(tuple(row[i] for i in pinv) for pinv in inverses) for row in codes.tolist()]
+    assert canonical_codes(codes, perms, k).tolist() == [list(rep) for rep in expected]
+    batch = np.concatenate([codes, np.array(expected, dtype=np.uint8)])
+    mask = [tuple(row) == rep for row, rep in zip(batch.tolist(), expected * 2)]
+    assert representative_mask(batch, perms, k).tolist() == mask
@@ -0,0 +1,40 @@
+import pytest
+
+from brute_force import CASES, COLORS, brute_orbits, color_counts, names
+from polya.chirality import chirality_report, iter_chirality
+from polya.registry import get_descriptor
+
+
+def report(name, element_type, counts):
+    descriptor = get_descriptor(name, element_type)
+    return chirality_report(COLORS, descriptor.group, descriptor.full_group, color_counts(counts), descriptor.n)
+
+
+@pytest.mark.parametrize('name, element_type, counts', CASES)
+def test_report_matches_brute_force(name, element_type, counts):
+    rotation_sizes = brute_orbits(name, element_type, 'rotation', counts)[1]
+    full_rep_of, full_sizes = brute_orbits(name, element_type, 'full', counts)
+    # 非手性：完整对称群轨道与旋转群轨道相同
+    achiral = sorted(rep for rep in rotation_sizes if full_sizes.get(rep) == rotation_sizes[rep])
+    chiral = sorted(rep for rep in full_sizes if rep not in achiral)
+    result = report(name, element_type, counts)
+    assert result['rotation'] == len(rotation_sizes)
+    assert result['full'] == len(full_sizes)
+    assert result['achiral'] == len(achiral)
+    assert result['chiral_pairs'] == len(chiral)
+    assert list(result['achiral_representatives']) == [names(rep) for rep in achiral]
+    pairs = list(result['chiral_pairs_list'])
+    assert [rep for rep, _ in pairs] == [names(rep) for rep in chiral]
+    rotation_rep_of = brute_orbits(name, element_type, 'rotation', counts)[0]
+    for rep, mirror in pairs:
+        codes = tuple(COLORS.index(c) for c in mirror)
+        assert rotation_rep_of[codes] == codes and full_rep_of[codes] == tuple(COLORS.index(c) for c in rep)
+
+
+def test_representatives_are_lazy():
+    result = report('cube', 'face', (2, 2, 2))
+    assert next(result['achiral_representatives']) == ('r', 'r', 'g', 'g', 'b', 'b')
+    descriptor = get_descriptor('cube', 'face')
+    leaders = [rep for rep, _, leader in iter_chirality(COLORS, descriptor.group, descriptor.full_group,
+                                                        color_counts((2, 2, 2)), 6) if leader]
+    assert len(leaders) == result['full']
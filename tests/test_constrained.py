@@ -0,0 +1,28 @@
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_orbits, color_counts
+from polya import engine
+from polya.registry import get_descriptor
+
+CONSTRAINTS = {
+    'different': lambda x, edges: all(x[i] != x[j] for i, j in edges),
+    'same': lambda x, edges: all(x[i] == x[j] for i, j in edges),
+}
+
+
+@pytest.mark.parametrize('constraint', sorted(CONSTRAINTS))
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_constrained_count_matches_brute_force(name, element_type, counts, symmetry, constraint):
+    descriptor = get_descriptor(name, element_type)
+    edges = descriptor.adjacency
+    # 约束在群作用下不变，满足约束的轨道即代表满足约束的轨道
+    expected = sum(1 for rep in brute_orbits(name, element_type, symmetry, counts)[1]
+                   if CONSTRAINTS[constraint](rep, edges))
+    got = engine.count_constrained_colorings(descriptor, COLORS, color_counts(counts), constraint, symmetry=symmetry)
+    assert got == expected
+
+
+def test_unknown_constraint():
+    with pytest.raises(ValueError):
+        engine.count_constrained_colorings('cube', COLORS, color_counts((4, 4, 0)), 'adjacent')
@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+import pytest
+
+from brute_force import COLORS, brute_orbits, brute_representatives, names
+from polya.dedup import dedup_colorings, invariant_blocks, parse_coloring_lines
+from polya.registry import get_descriptor
+from polya.store import open_store, text_to_store
+
+
+@pytest.mark.parametrize('name, element_type, counts', [('cube', 'edge', (4, 4, 4)), ('tetrahedron', 'face', (2, 1, 1)),
+                                                        ('cube', 'face', (2, 2, 2))])
+def test_dedup_matches_brute_force(tmp_path, name, element_type, counts):
+    descriptor = get_descriptor(name, element_type)
+    rep_of = brute_orbits(name, element_type, 'rotation', counts)[0]
+    colorings = list(rep_of) * 2
+    random.Random(3).shuffle(colorings)
+    half = len(colorings) // 2
+    inputs = []
+    for i, part in enumerate((colorings[:half], colorings[half:])):
+        path = tmp_path / f'in{i}.txt'
+        path.write_text(''.join(f"Class {j}: {' '.join(names(x))}\n" for j, x in enumerate(part, 1)))
+        inputs.append(path)
+    output = tmp_path / 'out.txt'
+    read, unique = dedup_colorings(inputs, output, COLORS, descriptor.symmetry_group('rotation'), descriptor.n,
+                                   invariant_blocks(descriptor), element_type, partitions=4, chunk_rows=64)
+    expected = brute_representatives(name, element_type, 'rotation', counts)
+    assert (read, unique) == (len(colorings), len(expected))
+    assert [tuple(line.partition(':')[2].split()) for line in output.read_text().splitlines()[1:]] == expected
+
+
+def test_parse_skips_only_known_lines():
+    lines = ["Edge colorings with 3 classes\n", "Class 1: r g | orbit=2 stabilizer=0\n", "\n",
+             "Class 2: b\tr\r\n", "g  g\n", "Orbit sizes: 2x1\n"]
+    assert parse_coloring_lines(lines, COLORS, 2).tolist() == [[0, 1], [2, 0], [1, 1]]
+    assert parse_coloring_lines([b"Class 1: r g\n"], COLORS, 2).tolist() == [[0, 1]]
+    assert parse_coloring_lines([], COLORS, 2).shape == (0, 2)
+
+
+@pytest.mark.parametrize('line', ["Class 1: r x\n", "r\tx\n", "r g b\n", "Class 1 r g\n", "rr g\n", "notes\n"])
+def test_parse_rejects_malformed_lines(line):
+    with pytest.raises(ValueError):
+        parse_coloring_lines(["Class 1: r g\n", line], COLORS, 2)
+
+
+def test_parse_long_color_names():
+    colors = ['red', 'blue', 'ultramarine-blue', '绿']
+    codes = np.random.default_rng(0).integers(0, len(colors), size=(50, 6))
+    lines = [' '.join(colors[c] for c in row) + '\n' for row in codes]
+    assert (parse_coloring_lines(lines, colors, 6) == codes).all()
+    with pytest.raises(ValueError):
+        parse_coloring_lines(["red ultramarine-bluee red red red red\n"], colors, 6)
+
+
+def test_text_to_store(tmp_path):
+    reps = brute_representatives('cube', 'face', 'rotation', (2, 2, 2))
+    text = tmp_path / 'reps.txt'
+    text.write_text(f"Face colorings with {len(reps)} classes\n"
+                    + ''.join(f"Class {i}: {' '.join(rep)}\n" for i, rep in enumerate(reps, 1)))
+    assert text_to_store(text, tmp_path / 'reps.bin', COLORS) == len(reps)
+    assert list(open_store(tmp_path / 'reps.bin')) == reps
@@ -0,0 +1,39 @@
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_representatives, color_counts
+from polya import engine
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_orderly_matches_brute_force(name, element_type, counts, symmetry):
+    descriptor = get_descriptor(name, element_type)
+    got = list(engine.iter_representatives(descriptor, COLORS, color_counts(counts), symmetry=symmetry))
+    assert got == brute_representatives(name, element_type, symmetry, counts)
+
+
+def test_max_results_truncates():
+    expected = brute_representatives('cube', 'edge', 'rotation', (4, 4, 4))
+    got = list(engine.iter_representatives('cube', COLORS, color_counts((4, 4, 0)), max_results=3))
+    assert len(got) == 3
+    got = list(engine.iter_representatives(get_descriptor('cube', 'edge'), COLORS, color_counts((4, 4, 4)),
+                                           max_results=10))
+    assert got == expected[:10]
+
+
+def test_counts_not_summing_to_n_yield_nothing():
+    assert list(engine.iter_representatives('cube', COLORS, color_counts((3, 3, 3)))) == []
+
+
+@pytest.mark.parametrize('with_stabilizers', [False, True])
+def test_save_returns_preview(tmp_path, with_stabilizers):
+    expected = brute_representatives('cube', 'edge', 'rotation', (4, 4, 4))
+    path = tmp_path / 'reps.txt'
+    written, preview = engine.save_representatives_to_file(get_descriptor('cube', 'edge'), COLORS,
+                                                           color_counts((4, 4, 4)), str(path),
+                                                           with_stabilizers=with_stabilizers, preview=5)
+    assert written == len(expected)
+    assert preview == expected[:5]
+    lines = path.read_text().splitlines()
+    assert [tuple(line.partition(':')[2].partition('|')[0].split()) for line in lines[1:6]] == expected[:5]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from polya.burnside import count_orbits, cycle_type_classes
+from polya.group_tables import (FrozenGroup, build_permutation, freeze_group, inverse_permutations,
+                                permutation_matrices)
+from polya.registry import get_descriptor, registered_polyhedra
+
+
+def test_mutated_dict_group_is_not_stale():
+    group = {0: [(0,), (1,), (2,), (3,)], 1: [(0, 1, 2, 3)]}
+    perms, _ = permutation_matrices(group, 4)
+    assert perms.tolist() == [[0, 1, 2, 3], [1, 2, 3, 0]]
+    group[1] = [(0, 1), (2, 3)]
+    perms, inverses = permutation_matrices(group, 4)
+    assert perms.tolist() == [[0, 1, 2, 3], [1, 0, 3, 2]]
+    assert inverse_permutations(group, 4) == ((0, 1, 2, 3), (1, 0, 3, 2))
+    assert dict(cycle_type_classes(group, 4)) == {((1, 4),): 1, ((2, 2),): 1}
+    group[2] = [(0, 3), (1, 2)]
+    group[3] = [(0, 2), (1, 3)]
+    assert len(permutation_matrices(group, 4)[0]) == 4
+    assert count_orbits(group, (2, 2), 4) == 3
+
+
+def test_frozen_group_is_read_only():
+    descriptor = get_descriptor('cube', 'edge')
+    group = descriptor.group
+    assert isinstance(group, FrozenGroup)
+    with pytest.raises(TypeError):
+        group[0] = []
+    perms, inverses = permutation_matrices(group, descriptor.n)
+    assert not perms.flags.writeable and not inverses.flags.writeable
+    assert freeze_group(group, descriptor.n) is group
+    with pytest.raises(ValueError):
+        freeze_group(group, descriptor.n + 1)
+
+
+@pytest.mark.parametrize('name, element_type', registered_polyhedra())
+def test_frozen_groups_match_their_tables(name, element_type):
+    descriptor = get_descriptor(name, element_type)
+    group = descriptor.group
+    perms, inverses = permutation_matrices(group, descriptor.n)
+    for key, cycle_decomp in group.items():
+        p, pinv = build_permutation(cycle_decomp, descriptor.n)
+        assert list(perms[key]) == p and list(inverses[key]) == pinv
+    refrozen = freeze_group(dict(group.items()), descriptor.n)
+    assert np.array_equal(refrozen.perms, perms)
+
+
+def test_keys_are_kept():
+    group = freeze_group({'e': [(0,), (1,)], 's': [(0, 1)]}, 2)
+    assert list(group) == ['e', 's']
+    assert group['s'] == [(0, 1)]
+    with pytest.raises(KeyError):
+        group[0]
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_orbits, brute_representatives, color_counts, names
+from polya.paging import OrbitIndex
+from polya.registry import get_descriptor
+
+
+def make_index(name, element_type, symmetry, counts, bucket_size=5):
+    descriptor = get_descriptor(name, element_type)
+    return OrbitIndex(COLORS, descriptor.symmetry_group(symmetry), color_counts(counts), descriptor.n, bucket_size)
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize('name, element_type, counts', CASES)
+def test_unrank_and_rank_match_brute_force(name, element_type, symmetry, counts):
+    index = make_index(name, element_type, symmetry, counts)
+    expected = brute_representatives(name, element_type, symmetry, counts)
+    assert len(index) == len(expected)
+    assert [index.unrank(k) for k in range(len(index))] == expected
+    rep_of = brute_orbits(name, element_type, symmetry, counts)[0]
+    position = {rep: k for k, rep in enumerate(expected)}
+    for x in random.Random(1).sample(sorted(rep_of), min(50, len(rep_of))):
+        assert index.rank(names(x)) == position[names(rep_of[x])]
+
+
+def test_page():
+    index = make_index('cube', 'edge', 'rotation', (4, 4, 4), bucket_size=16)
+    expected = brute_representatives('cube', 'edge', 'rotation', (4, 4, 4))
+    assert index.page(10, 50) == expected[10:50]
+    assert index.page(len(index) - 3, len(index) + 10) == expected[-3:]
+    assert index.page(5, 5) == []
+    with pytest.raises(IndexError):
+        index.unrank(len(index))
+
+
+def test_save_and_load(tmp_path):
+    descriptor = get_descriptor('cube', 'edge')
+    group = descriptor.symmetry_group('rotation')
+    index = make_index('cube', 'edge', 'rotation', (4, 4, 4), bucket_size=16)
+    path = tmp_path / 'index.npz'
+    index.save(path)
+    loaded = OrbitIndex.load(path, COLORS, group, color_counts((4, 4, 4)), 12)
+    assert loaded.page(0, len(loaded)) == index.page(0, len(index))
+    with pytest.raises(ValueError):
+        OrbitIndex.load(path, COLORS, group, color_counts((6, 6, 0)), 12)
+    with pytest.raises(ValueError):
+        OrbitIndex.load(path, COLORS, descriptor.symmetry_group('full'), color_counts((4, 4, 4)), 12)
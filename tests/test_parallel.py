@@ -0,0 +1,32 @@
+import pytest
+
+import polya.parallel as parallel
+from brute_force import COLORS, brute_orbits, brute_representatives, color_counts
+from polya import engine
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), [('cube', 'edge', (4, 4, 4)),
+                                                              ('tetrahedron', 'edge', (2, 2, 2))])
+def test_parallel_matches_brute_force(name, element_type, counts):
+    descriptor = get_descriptor(name, element_type)
+    got = list(engine.iter_representatives(descriptor, COLORS, color_counts(counts), method='parallel'))
+    assert got == brute_representatives(name, element_type, 'rotation', counts)
+
+
+def test_buckets_resume_across_small_chunks(monkeypatch):
+    # 每块只有 7 个代表，桶需要多次续接
+    monkeypatch.setattr(parallel, 'PARALLEL_CHUNK', 7)
+    descriptor = get_descriptor('cube', 'edge')
+    expected = sorted(brute_orbits('cube', 'edge', 'rotation', (4, 4, 4))[1])
+    got = list(parallel.parallel_orderly_indices([4, 4, 4], descriptor.group, descriptor.n, workers=2,
+                                                 prefix_depth=2))
+    assert got == expected
+
+
+def test_close_early():
+    descriptor = get_descriptor('cube', 'edge')
+    source = parallel.parallel_orderly_indices([4, 4, 4], descriptor.group, descriptor.n, workers=2)
+    first = [next(source) for _ in range(5)]
+    source.close()
+    assert first == sorted(brute_orbits('cube', 'edge', 'rotation', (4, 4, 4))[1])[:5]
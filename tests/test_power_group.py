@@ -0,0 +1,24 @@
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_representatives, color_counts
+from polya import engine
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_relabeling_matches_brute_force(name, element_type, counts, symmetry):
+    descriptor = get_descriptor(name, element_type)
+    expected = brute_representatives(name, element_type, symmetry, counts, relabel=True)
+    assert engine.count_colorings_up_to_relabeling(descriptor, COLORS, color_counts(counts),
+                                                   symmetry=symmetry) == len(expected)
+    got = list(engine.iter_representatives_up_to_relabeling(descriptor, COLORS, color_counts(counts),
+                                                            symmetry=symmetry))
+    assert got == expected
+
+
+def test_trivial_color_group_is_plain_count():
+    descriptor = get_descriptor('cube', 'face')
+    counts = color_counts((2, 2, 2))
+    assert engine.count_colorings_up_to_relabeling(descriptor, COLORS, counts, color_group=[]) == \
+        engine.count_colorings(descriptor, COLORS, counts)
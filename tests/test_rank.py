@@ -0,0 +1,28 @@
+import pytest
+
+from brute_force import CASES, COLORS, brute_representatives, color_counts, multiset_permutations
+from polya import engine
+from polya.rank import multiset_count, rank_coloring, rank_many, unrank_coloring, unrank_many
+from polya.registry import get_descriptor
+
+
+def test_rank_is_lexicographic_position():
+    counts = (3, 2, 1)
+    colorings = multiset_permutations(counts)
+    assert multiset_count(counts) == len(colorings)
+    assert [rank_coloring(x, counts) for x in colorings] == list(range(len(colorings)))
+    assert [unrank_coloring(r, counts) for r in range(len(colorings))] == list(colorings)
+    assert rank_many(colorings, counts).tolist() == list(range(len(colorings)))
+    assert [tuple(row) for row in unrank_many(range(len(colorings)), counts).tolist()] == list(colorings)
+
+
+def test_unrank_out_of_range():
+    with pytest.raises(ValueError):
+        unrank_coloring(multiset_count((2, 2)), (2, 2))
+
+
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_sweep_matches_brute_force(name, element_type, counts):
+    descriptor = get_descriptor(name, element_type)
+    got = list(engine.iter_representatives(descriptor, COLORS, color_counts(counts), method='sweep'))
+    assert got == brute_representatives(name, element_type, 'rotation', counts)
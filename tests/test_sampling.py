@@ -0,0 +1,33 @@
+import pytest
+
+from brute_force import CASES, COLORS, brute_representatives, color_counts
+from polya import engine
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_samples_are_representatives(name, element_type, counts):
+    descriptor = get_descriptor(name, element_type)
+    expected = brute_representatives(name, element_type, 'rotation', counts)
+    draws = engine.sample_colorings(descriptor, COLORS, color_counts(counts), size=min(40 * len(expected), 2000),
+                                    rng=7)
+    assert set(draws) <= set(expected)
+    if len(expected) <= 40:
+        # 轨道不多时，抽够次数应覆盖全部轨道
+        assert set(draws) == set(expected)
+
+
+def test_sampling_is_uniform_over_orbits():
+    # 立方体面 2/2/2 共 6 个轨道，大小为 6~24 不等；均匀抽样下各轨道频率应接近 1/6
+    expected = brute_representatives('cube', 'face', 'rotation', (2, 2, 2))
+    draws = engine.sample_colorings(get_descriptor('cube', 'face'), COLORS, color_counts((2, 2, 2)), size=6000,
+                                    rng=11)
+    for rep in expected:
+        assert 800 < draws.count(rep) < 1200
+
+
+def test_seed_is_reproducible():
+    counts = color_counts((4, 4, 4))
+    descriptor = get_descriptor('cube', 'edge')
+    assert engine.sample_colorings(descriptor, COLORS, counts, size=20, rng=3) == \
+        engine.sample_colorings(descriptor, COLORS, counts, size=20, rng=3)
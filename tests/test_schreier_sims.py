@@ -0,0 +1,31 @@
+import pytest
+
+from brute_force import SYMMETRIES, count_cases
+from polya import schreier_sims
+from polya.burnside import count_orbits, cycle_type_classes
+from polya.registry import get_descriptor
+from polya.schreier_sims import PermutationGroup
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize('name, element_type', [('cube', 'edge'), ('dodecahedron', 'vertex'), ('icosahedron', 'vertex')])
+def test_counts_match_burnside(name, element_type, symmetry):
+    descriptor = get_descriptor(name, element_type)
+    perm_group = descriptor.symmetry_group(symmetry)
+    group = PermutationGroup.from_perm_group(perm_group, descriptor.n)
+    assert group.order() == len(perm_group)
+    assert group.cycle_type_counts() == group.cycle_type_classes() == cycle_type_classes(perm_group, descriptor.n)
+    assert sum(size for _, size in group.conjugacy_classes()) == len(perm_group)
+    for counts in count_cases(descriptor.n):
+        assert group.count_orbits(counts) == count_orbits(perm_group, counts, descriptor.n)
+
+
+def test_large_groups_stream(monkeypatch):
+    descriptor = get_descriptor('cube', 'edge')
+    group = PermutationGroup.from_perm_group(descriptor.group, descriptor.n)
+    classes = group.cycle_type_classes()
+    monkeypatch.setattr(schreier_sims, 'CONJUGACY_CLASS_LIMIT', 10)
+    with pytest.raises(ValueError):
+        group.conjugacy_classes()
+    assert sorted(size for _, size in group.class_representatives()) == [1] * 24
+    assert group.cycle_type_classes() == classes
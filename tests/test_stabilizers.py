@@ -0,0 +1,26 @@
+from collections import Counter
+
+import pytest
+
+from brute_force import CASES, COLORS, SYMMETRIES, brute_orbits, color_counts, names
+from polya import engine
+from polya.registry import get_descriptor
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES)
+@pytest.mark.parametrize(('name', 'element_type', 'counts'), CASES)
+def test_orbit_sizes_match_brute_force(name, element_type, counts, symmetry):
+    descriptor = get_descriptor(name, element_type)
+    perm_group = descriptor.symmetry_group(symmetry)
+    sizes = brute_orbits(name, element_type, symmetry, counts)[1]
+    got = list(engine.iter_representatives_with_orbits(descriptor, COLORS, color_counts(counts), symmetry=symmetry))
+    assert [(rep, size) for rep, _, size in got] == [(names(rep), sizes[rep]) for rep in sorted(sizes)]
+    # 稳定子阶 * 轨道大小 = 群阶
+    assert all(len(stabilizer) * size == len(perm_group) for _, stabilizer, size in got)
+    assert engine.orbit_size_histogram(descriptor, COLORS, color_counts(counts), symmetry=symmetry) == \
+        dict(Counter(sizes.values()))
+
+
+def test_histogram_check_rejects_mismatch():
+    with pytest.raises(ValueError):
+        engine.check_orbit_histogram({24: 1}, [4, 4], 2)
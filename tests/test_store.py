@@ -0,0 +1,40 @@
+import pytest
+
+from brute_force import COLORS, brute_representatives, color_counts
+from polya.registry import get_descriptor
+from polya.store import RepresentativeWriter, main, open_store, write_store
+
+
+@pytest.mark.parametrize('encoding', ['rows', 'rank'])
+def test_round_trip(tmp_path, encoding):
+    counts = (4, 4, 4)
+    reps = brute_representatives('cube', 'edge', 'rotation', counts)
+    group = get_descriptor('cube', 'edge').symmetry_group('rotation')
+    path = tmp_path / 'reps.bin'
+    assert write_store(reps, path, COLORS, 12, color_counts(counts), group, encoding) == len(reps)
+    store = open_store(path, group)
+    assert len(store) == len(reps)
+    assert list(store) == reps
+    assert store[0] == reps[0] and store[-1] == reps[-1]
+    assert store[3:10:2] == reps[3:10:2]
+
+
+def test_exception_leaves_incomplete_file(tmp_path):
+    path = tmp_path / 'reps.bin'
+    with pytest.raises(RuntimeError):
+        with RepresentativeWriter(path, COLORS, 3, chunk_rows=2) as writer:
+            for coloring in [('r', 'g', 'b')] * 5:
+                writer.write(coloring)
+            raise RuntimeError
+    assert writer.total == 5
+    with pytest.raises(ValueError, match="没有正常关闭"):
+        open_store(path)
+
+
+def test_show_index(tmp_path, capsys):
+    path = tmp_path / 'reps.bin'
+    write_store([('r', 'r'), ('r', 'g')], path, COLORS, 2)
+    main(['show', str(path), '1'])
+    assert capsys.readouterr().out.strip() == "Class 1: r r"
+    with pytest.raises(SystemExit):
+        main(['show', str(path), '0'])
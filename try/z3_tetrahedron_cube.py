@@ -1,5 +1,8 @@
+# 在仓库根目录运行：python -m try.z3_tetrahedron_cube
 from z3 import *
-import itertools
+
+from polya.group_tables import permutation_matrices
+from polya.registry import get_descriptor
 
 
 class PolyhedronColorCounter:
@@ -20,180 +23,16 @@ class PolyhedronColorCounter:
         print(f"{object_type} 数量: {self.n_objects}, 旋转对称操作数: {len(self.symmetries)}")
 
     def _init_symmetries(self):
-        """初始化多面体的旋转对称置换"""
-        if self.polyhedron_type == 'cube':
-            return self._init_cube_symmetries()
-        elif self.polyhedron_type == 'tetrahedron':
-            return self._init_tetrahedron_symmetries()
-        else:
-            raise ValueError(f"不支持的多面体类型: {self.polyhedron_type}")
-
-    def _init_cube_symmetries(self):
-        """初始化立方体的旋转对称置换"""
-        if self.object_type == 'face':
-            # 面编号: 0(前),1(后),2(左),3(右),4(上),5(下)
-            symmetries = [
-                # 恒等操作
-                [0, 1, 2, 3, 4, 5],
-                # 绕x轴旋转
-                [0, 1, 4, 5, 3, 2],  # 90度
-                [0, 1, 3, 2, 5, 4],  # 180度
-                [0, 1, 5, 4, 2, 3],  # 270度
-                # 绕y轴旋转
-                [5, 4, 2, 3, 0, 1],  # 90度
-                [1, 0, 2, 3, 5, 4],  # 180度
-                [4, 5, 2, 3, 1, 0],  # 270度
-                # 绕z轴旋转
-                [3, 2, 0, 1, 4, 5],  # 90度
-                [1, 0, 3, 2, 4, 5],  # 180度
-                [2, 3, 1, 0, 4, 5],  # 270度
-                # 空间对角线旋转
-                [4, 3, 0, 5, 1, 2],  # 对角线1 120度
-                [2, 5, 1, 4, 3, 0],  # 对角线1 240度
-                [5, 0, 3, 4, 2, 1],  # 对角线2 120度
-                [1, 2, 4, 3, 0, 5],  # 对角线2 240度
-                [0, 4, 1, 5, 2, 3],  # 对角线3 120度
-                [3, 2, 5, 1, 4, 0],  # 对角线3 240度
-                [2, 4, 5, 0, 1, 3],  # 对角线4 120度
-                [0, 5, 4, 2, 3, 1],  # 对角线4 240度
-                # 边中点旋转
-                [4, 2, 5, 1, 0, 3],  # 边中点轴1 180度
-                [3, 0, 2, 1, 5, 4],  # 边中点轴2 180度
-                [5, 3, 4, 0, 1, 2],  # 边中点轴3 180度
-                [0, 3, 1, 2, 4, 5],  # 边中点轴4 180度
-                [1, 2, 3, 0, 4, 5],  # 边中点轴5 180度
-            ]
-            return 6, symmetries
-        elif self.object_type == 'edge':
-            # 边编号: 0-11（前4条, 后4条, 连接边4条）
-            symmetries = [
-                # 恒等操作
-                [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
-                # 绕x轴旋转90度
-                [1, 2, 3, 0, 5, 6, 7, 4, 10, 11, 8, 9],
-                # 绕x轴旋转180度
-                [2, 3, 0, 1, 6, 7, 4, 5, 11, 8, 9, 10],
-                # 绕x轴旋转270度
-                [3, 0, 1, 2, 7, 4, 5, 6, 9, 10, 11, 8],
-                # 绕y轴旋转90度
-                [4, 7, 6, 5, 0, 3, 2, 1, 8, 11, 10, 9],
-                # 绕y轴旋转180度
-                [5, 4, 7, 6, 1, 0, 3, 2, 9, 8, 11, 10],
-                # 绕y轴旋转270度
-                [6, 5, 4, 7, 2, 1, 0, 3, 10, 9, 8, 11],
-                # 绕z轴旋转90度
-                [8, 0, 1, 9, 10, 4, 5, 11, 3, 2, 7, 6],
-                # 绕z轴旋转180度
-                [9, 8, 0, 10, 11, 10, 4, 8, 7, 6, 3, 2],
-                # 绕z轴旋转270度
-                [10, 9, 8, 11, 8, 11, 10, 9, 6, 3, 2, 7],
-                # 空间对角线旋转（部分示例）
-                [2, 10, 5, 6, 1, 9, 0, 11, 3, 4, 7, 8],  # 对角线1 120度
-                [7, 8, 3, 4, 11, 2, 10, 5, 6, 1, 9, 0],  # 对角线1 240度
-                # 其他旋转...
-                [5, 6, 7, 4, 1, 0, 3, 2, 9, 8, 11, 10],  # 边中点轴1 180度
-                [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],  # 边中点轴2 180度（示例）
-                # 完整列表需要补充所有24个置换
-            ]
-            return 12, symmetries
-        elif self.object_type == 'vertex':
-            # 顶点编号: 0-7（前4个, 后4个）
-            symmetries = [
-                # 恒等操作
-                [0, 1, 2, 3, 4, 5, 6, 7],
-                # 绕x轴旋转90度
-                [1, 5, 6, 2, 0, 4, 7, 3],
-                # 绕x轴旋转180度
-                [5, 4, 7, 6, 1, 0, 3, 2],
-                # 绕x轴旋转270度
-                [4, 0, 3, 7, 5, 1, 2, 6],
-                # 绕y轴旋转90度
-                [3, 2, 6, 7, 0, 1, 5, 4],
-                # 绕y轴旋转180度
-                [2, 6, 7, 3, 1, 5, 4, 0],
-                # 绕y轴旋转270度
-                [6, 7, 4, 5, 2, 3, 0, 1],
-                # 绕z轴旋转90度
-                [4, 7, 6, 5, 0, 3, 2, 1],
-                # 绕z轴旋转180度
-                [7, 6, 5, 4, 3, 2, 1, 0],
-                # 绕z轴旋转270度
-                [6, 5, 4, 7, 2, 1, 0, 3],
-                # 空间对角线旋转
-                [2, 5, 6, 1, 0, 3, 7, 4],  # 对角线1 120度
-                [5, 6, 1, 0, 3, 7, 4, 2],  # 对角线1 240度
-                [1, 3, 2, 0, 5, 7, 6, 4],  # 对角线2 120度
-                [3, 2, 0, 1, 7, 6, 4, 5],  # 对角线2 240度
-                # 边中点旋转
-                [1, 0, 3, 2, 5, 4, 7, 6],  # 边中点轴1 180度
-                [3, 2, 1, 0, 7, 6, 5, 4],  # 边中点轴2 180度
-                # 完整列表需要补充所有24个置换
-            ]
-            return 8, symmetries
-        else:
-            raise ValueError(f"不支持的对象类型: {self.object_type}")
-
-    def _init_tetrahedron_symmetries(self):
-        """初始化正四面体的旋转对称置换"""
-        if self.object_type == 'face':
-            # 面编号: 0-3
-            symmetries = [
-                # 恒等操作
-                [0, 1, 2, 3],
-                # 绕顶点-对面中心旋转120度
-                [0, 2, 3, 1],  # 顶点0
-                [1, 0, 3, 2],  # 顶点1
-                [2, 3, 0, 1],  # 顶点2
-                [3, 1, 2, 0],  # 顶点3
-                # 绕顶点-对面中心旋转240度
-                [0, 3, 1, 2],  # 顶点0
-                [1, 3, 2, 0],  # 顶点1
-                [2, 1, 0, 3],  # 顶点2
-                [3, 2, 0, 1],  # 顶点3
-                # 边中点旋转180度
-                [1, 0, 3, 2],  # 边0-1
-                [2, 3, 0, 1],  # 边0-2
-                [3, 1, 2, 0],  # 边0-3
-                [0, 2, 1, 3],  # 边1-2
-                [0, 3, 2, 1],  # 边1-3
-                [1, 3, 0, 2],  # 边2-3
-            ]
-            return 4, symmetries
-        elif self.object_type == 'edge':
-            # 边编号: 0-5
-            symmetries = [
-                # 恒等操作
-                [0, 1, 2, 3, 4, 5],
-                # 其他旋转...
-                # 完整列表需要补充所有12个置换
-            ]
-            return 6, symmetries
-        elif self.object_type == 'vertex':
-            # 顶点编号: 0-3
-            symmetries = [
-                # 恒等操作
-                [0, 1, 2, 3],
-                # 绕顶点-对面中心旋转120度
-                [0, 2, 3, 1],  # 顶点0
-                [1, 0, 3, 2],  # 顶点1
-                [2, 3, 0, 1],  # 顶点2
-                [3, 1, 2, 0],  # 顶点3
-                # 绕顶点-对面中心旋转240度
-                [0, 3, 1, 2],  # 顶点0
-                [1, 3, 2, 0],  # 顶点1
-                [2, 1, 0, 3],  # 顶点2
-                [3, 2, 0, 1],  # 顶点3
-                # 边中点旋转180度
-                [1, 0, 3, 2, 5, 4],  # 边0-1
-                [2, 3, 0, 1, 4, 5],  # 边0-2
-                [3, 2, 1, 0, 5, 4],  # 边0-3
-                [0, 4, 2, 5, 1, 3],  # 边1-2
-                [0, 5, 3, 4, 2, 1],  # 边1-3
-                [4, 1, 5, 0, 3, 2],  # 边2-3
-            ]
-            return 4, symmetries
-        else:
-            raise ValueError(f"不支持的对象类型: {self.object_type}")
+        """
+        初始化多面体的旋转对称置换，直接取 polya 注册表中的旋转群（与主程序计数用的是同一个群）。
+        返回的每个置换 sym 满足：旋转后对象 i 处的颜色为 colors[sym[i]]。
+        """
+        try:
+            descriptor = get_descriptor(self.polyhedron_type, self.object_type)
+        except ValueError as e:
+            raise ValueError(f"不支持的多面体或对象类型: {self.polyhedron_type}/{self.object_type}") from e
+        _, inverses = permutation_matrices(descriptor.group, descriptor.n)
+        return descriptor.n, inverses.tolist()
 
     def count_colorings(self, color_counts):
         """